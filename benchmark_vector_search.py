@@ -0,0 +1,150 @@
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+from tools.vector_store import VectorStore, STORAGE_MODES
+from tools.ann_index import IVFIndex
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark approximate and quantized vector search against the exact path')
+    parser.add_argument('--rows', type=int, default=100000,
+                       help='Number of synthetic embeddings in the store (default: 100000)')
+    parser.add_argument('--dimension', type=int, default=1024,
+                       help='Embedding dimension (default: 1024)')
+    parser.add_argument('--clusters', type=int, default=500,
+                       help='Number of topics the synthetic embeddings are drawn around (default: 500)')
+    parser.add_argument('--spread', type=float, default=1.5,
+                       help='Spread of embeddings around their topic centre; higher is harder for IVF (default: 1.5)')
+    parser.add_argument('--queries', type=int, default=200,
+                       help='Number of benchmark queries (default: 200)')
+    parser.add_argument('--top-k', type=int, default=10,
+                       help='k for recall@k (default: 10)')
+    parser.add_argument('--n-lists', type=int,
+                       help='IVF inverted lists (default: sqrt(rows))')
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[1, 4, 8, 16, 32],
+                       help='IVF n_probe values to sweep (default: 1 4 8 16 32)')
+    parser.add_argument('--storage', type=str, nargs='+', default=list(STORAGE_MODES),
+                       help='Storage modes to compare with exact search (default: float32 float16 int8)')
+    parser.add_argument('--rescore-factor', type=int, default=4,
+                       help='Rows rescored in float32 per result in compact storage modes (default: 4)')
+    parser.add_argument('--from-cache', type=str,
+                       help='Benchmark on an embeddings .npy cache instead of synthetic data')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def synthetic_embeddings(rows: int, dimension: int, clusters: int, spread: float, rng: np.random.Generator) -> np.ndarray:
+    """Unit vectors scattered around random topic centres, roughly like document embeddings."""
+    centres = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, clusters, rows)
+    embeddings = centres[labels] + spread * rng.standard_normal((rows, dimension)).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def make_queries(embeddings: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Noisy copies of stored rows, so every query has genuine near neighbours."""
+    picks = embeddings[rng.integers(0, embeddings.shape[0], count)]
+    queries = picks + 0.5 * rng.standard_normal(picks.shape).astype(np.float32) / np.sqrt(picks.shape[1])
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def run_queries(store: VectorStore, queries: np.ndarray, top_k: int) -> Dict[str, Any]:
+    """Runs every query once, returning the result rows and latency percentiles in milliseconds."""
+    results: List[np.ndarray] = []
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        rows, _ = store.search_rows(query, top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append(rows)
+    return {
+        "results": results,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99))
+    }
+
+
+def recall_at_k(results: List[np.ndarray], truth: List[np.ndarray]) -> float:
+    hits = sum(len(np.intersect1d(found, expected)) for found, expected in zip(results, truth))
+    return hits / sum(len(expected) for expected in truth)
+
+
+def build_store(
+    embeddings: np.ndarray,
+    index: Optional[IVFIndex] = None,
+    storage: str = "float32",
+    rescore_factor: int = 4
+) -> VectorStore:
+    store = VectorStore(
+        embeddings.shape[1],
+        initial_capacity=embeddings.shape[0],
+        index=index,
+        storage=storage,
+        rescore_factor=rescore_factor
+    )
+    store.add_batch([""] * embeddings.shape[0], list(range(embeddings.shape[0])), embeddings)
+    return store
+
+
+def reopen_memory_mapped(store: VectorStore, directory: str) -> VectorStore:
+    """`store` saved to `directory` and reopened memory-mapped, the only case in which compact modes scan their compact copy."""
+    matrix_path = os.path.join(directory, "embeddings.npy")
+    metadata_path = os.path.join(directory, "embeddings.meta.json")
+    store.save(matrix_path, metadata_path)
+    loaded = VectorStore(store.dimension, storage=store.storage, rescore_factor=store.rescore_factor)
+    loaded.load(matrix_path, metadata_path)
+    return loaded
+
+
+def print_row(name: str, recall: float, stats: Dict[str, Any], extra: str = "") -> None:
+    print(f"{name:<24}{recall:>12.4f}{stats['p50_ms']:>12.3f}{stats['p99_ms']:>12.3f}  {extra}")
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    if args.from_cache:
+        embeddings = np.load(args.from_cache).astype(np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    else:
+        embeddings = synthetic_embeddings(args.rows, args.dimension, args.clusters, args.spread, rng)
+    queries = make_queries(embeddings, args.queries, rng)
+    print(f"{embeddings.shape[0]} rows x {embeddings.shape[1]} dims, {len(queries)} queries, recall@{args.top_k}\n")
+
+    exact_store = build_store(embeddings)
+    exact = run_queries(exact_store, queries, args.top_k)
+    truth = exact["results"]
+
+    print(f"{'index':<24}{'recall@k':>12}{'p50 ms':>12}{'p99 ms':>12}")
+    print_row("exact", 1.0, exact, f"(scans {exact_store.scan_bytes / 2**20:.1f} MiB)")
+
+    for storage in args.storage:
+        if storage == "float32":
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            store = reopen_memory_mapped(
+                build_store(embeddings, storage=storage, rescore_factor=args.rescore_factor), directory
+            )
+            stats = run_queries(store, queries, args.top_k)
+            print_row(f"exact {storage}", recall_at_k(stats["results"], truth), stats,
+                      f"(scans {store.scan_bytes / 2**20:.1f} MiB)")
+            del store
+
+    started = time.perf_counter()
+    index = IVFIndex(n_lists=args.n_lists, seed=args.seed)
+    ivf_store = build_store(embeddings, index=index)
+    build_seconds = time.perf_counter() - started
+    for n_probe in args.n_probe:
+        index.n_probe = n_probe
+        stats = run_queries(ivf_store, queries, args.top_k)
+        print_row(f"ivf n_probe={n_probe}", recall_at_k(stats["results"], truth), stats,
+                  f"({len(index.centroids)} lists, built in {build_seconds:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ load_dotenv()
 
 from objects.models.winston import Winston
 from objects.scorers.winston.response_quality_judge import ResponseQualityScorer
+from utils.bedrock import get_bedrock_client
 
 
 def parse_args():
@@ -27,6 +28,12 @@ def parse_args():
                        help='Path to dataset file (default: objects/datasets/eval_public.jsonl)')
     parser.add_argument('--use-finetuned', action='store_true',
                        help='Use finetuned model instead of base model (default: False)')
+    parser.add_argument('--cache-responses', action='store_true',
+                       help='Reuse cached model responses for identical prompts across trials and runs (default: False)')
+    parser.add_argument('--prompt-caching', action='store_true',
+                       help='Send the planner system prompt as Bedrock prompt-cache blocks (default: False)')
+    parser.add_argument('--streaming', action='store_true',
+                       help='Stream planning responses and start executing plan steps as they arrive (default: False)')
     return parser.parse_args()
 
 def load_dataset(file_path: str) -> List[Dict]:
@@ -98,7 +105,10 @@ async def main():
     model_id = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
     winston = Winston(
         model_id=model_id,
-        use_finetuned=args.use_finetuned
+        use_finetuned=args.use_finetuned,
+        cache_responses=args.cache_responses,
+        prompt_caching=args.prompt_caching,
+        streaming=args.streaming
     )
 
     # Initialize the scorers
@@ -107,6 +117,8 @@ async def main():
     # DO NOT MODIFY THIS LINE (Feel free to add more scorers)
     quality_scorer = ResponseQualityScorer(model_id=model_id, column_map={"input": "input", "target": "target"})
     #######################################################
+    # Judge calls share the pooled Bedrock client instead of the scorer's default-pool one
+    quality_scorer.bedrock_client = get_bedrock_client(os.getenv("AWS_DEFAULT_REGION"))
     
     # Extract model ID without version for display name
     model_id_for_display = model_id.split('-v')[0] if '-v' in model_id else model_id
@@ -2,17 +2,37 @@ import weave
 from weave import Model
 import importlib
 import asyncio
+import concurrent.futures
 import json
-from typing import List, Dict, Any, Union, Callable, Optional
+import queue
+import re
+from typing import List, Dict, Any, Union, Callable, Optional, Set, Tuple
 from objects.prompts.tools import ToolsPrompt
 from tools.return_type import ToolResult
+from utils.helpers import run_blocking
+from utils.tool_cache import TOOL_RESULT_CACHE, tool_cache_ttl, tool_cache_bypassed
+
+_PLACEHOLDER = re.compile(r"\{\{(\d+)\}\}")
+
+_TOOL_RESULT_CACHE = TOOL_RESULT_CACHE
 
 class Vincent(Model):
     tools_prompt: ToolsPrompt = ToolsPrompt()
+    max_parallel_steps: int = 8
 
     def __init__(self, tools_prompt: ToolsPrompt = None):
         super().__init__()
         self.tools_prompt = tools_prompt if tools_prompt is not None else ToolsPrompt()
+        self._build_dispatch_table()
+
+    class ToolEntry:
+        """A registered tool resolved to its callable."""
+        def __init__(self, function: Callable, schema: Dict[str, Any]):
+            self.function = function
+            self.is_async = asyncio.iscoroutinefunction(function)
+            self.schema = schema
+            self.parameters = tuple(schema['function'].get('parameters', {}).get('properties', {}).keys())
+            self.cache_ttl = tool_cache_ttl(schema)
     
     class VincentExecuteResult:
         def __init__(
@@ -21,13 +41,18 @@ class Vincent(Model):
             required_outputs: Optional[List[str]],
             tools: List[str],
             completed: bool,
-            failure_step: Optional[int]
+            failure_step: Optional[int],
+            steps: Optional[List[Dict[str, Any]]] = None,
+            results: Optional[Dict[Any, ToolResult]] = None
         ):
             self.outputs = outputs
             self.required_outputs = required_outputs
             self.tools = tools
             self.completed = completed
             self.failure_step = failure_step
+            # The steps received and the result of each one that ran, by step number
+            self.steps = steps or []
+            self.results = results or {}
 
         def __str__(self) -> str:
             """String representation for print() and str()"""
@@ -51,92 +76,336 @@ class Vincent(Model):
             """String representation for direct access"""
             return self.__str__()
 
-    @weave.op(name="vincent-execute")
-    def execute(self, plan: Dict[str, Any]) -> VincentExecuteResult:
-        if not isinstance(plan, dict) or 'steps' not in plan:
-            raise ValueError(f"Expected plan to be a dictionary with a 'steps' key, but got {type(plan)}")
-        
-        steps = plan['steps']
-        last_message_content = ""
-        context = str(last_message_content) if isinstance(last_message_content, (dict, str)) else ""
-        outputs = []
-        tools_used = []
-        step_outputs = {}
-        required_outputs = []
-        execution_failed = False
-        failure_step = None
+    @staticmethod
+    def _referenced_steps(input_data: Any) -> Set[int]:
+        """Step numbers referenced by {{n}} placeholders anywhere in a step input."""
+        if isinstance(input_data, str):
+            return {int(number) for number in _PLACEHOLDER.findall(input_data)}
+        if isinstance(input_data, dict):
+            return set().union(*(Vincent._referenced_steps(v) for v in input_data.values()))
+        if isinstance(input_data, list):
+            return set().union(*(Vincent._referenced_steps(item) for item in input_data))
+        return set()
 
-        # Create event loop for async execution if needed
+    @staticmethod
+    def _step_number(step: Dict[str, Any]) -> Optional[int]:
+        """A step's number as an integer, so "2" and 2 name the same step."""
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            return int(step['step'])
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _step_dependencies(steps: List[Dict[str, Any]]) -> Dict[Any, Set[Any]]:
+        """
+        Maps each step's 'step' value to the earlier steps whose outputs it
+        references. A step that references a later or unknown step, or whose
+        own number is not an integer, depends on every step before it, so it
+        runs as it would with the steps in order.
+        """
+        dependencies = {}
+        earlier: Dict[int, Any] = {}
+        for position, step in enumerate(steps):
+            number = Vincent._step_number(step)
+            referenced = Vincent._referenced_steps(step.get('input'))
+            if number is None or not referenced.issubset(earlier):
+                dependencies[step['step']] = {s['step'] for s in steps[:position]}
+            else:
+                dependencies[step['step']] = {earlier[n] for n in referenced}
+            if number is not None:
+                earlier[number] = step['step']
+        return dependencies
 
+    def _run_step(self, step: Dict[str, Any], step_outputs: Dict[int, Any]) -> ToolResult:
+        """Resolves a step's placeholders from `step_outputs` and executes its tool."""
+        input_data = step.get('input')
+        processed_input = self._process_input(input_data, step_outputs) if input_data is not None else None
+        tool_result = self._execute_tool(step['tool'], processed_input, step_outputs)
+
+        # If tool_result is a coroutine, await it
+        if asyncio.iscoroutine(tool_result):
+            try:
+                tool_result = asyncio.run(tool_result)
+            except Exception as e:
+                tool_result = ToolResult.err(f"Error executing async tool: {str(e)}")
+        return tool_result
+
+    @staticmethod
+    def _build_result(steps: List[Dict[str, Any]], results: Dict[int, ToolResult]) -> "Vincent.VincentExecuteResult":
+        """
+        Reports step results in plan order. Every step after the first failing
+        one is reported as not executed, exactly as when the steps run in order.
+        """
+        failed_steps = [s['step'] for s in steps if s['step'] in results and not results[s['step']].success]
+        failure_step = failed_steps[0] if failed_steps else None
+        outputs = []
+        tools_used = []
+        required_outputs = []
+        reached_failure = False
         for step in steps:
-            if not isinstance(step, dict):
-                raise ValueError(f"Expected step to be a dictionary, but got {type(step)}")
-            
             step_number = step['step']
-            required = step.get('required_for_response', False)
-            
-            # If execution has already failed, mark remaining steps as not executed
-            if execution_failed:
+            tool_result = results.get(step_number)
+            if step_number == failure_step:
+                reached_failure = True
+                step_output = f"Step {step_number}: {tool_result.error}"
+            elif tool_result is None or reached_failure:
                 step_output = f"Step {step_number}: Not executed due to previous failure at step {failure_step}"
-                outputs.append(step_output)
-                if required:
-                    required_outputs.append(step_output)
-                continue
-            
-            # Process the input only if it exists in the step
-            input_data = step.get('input')
-            processed_input = self._process_input(input_data, step_outputs) if input_data is not None else None
-            
-            # Create a copy of step_outputs for this tool execution, excluding the current step
-            current_step_outputs = {k: v for k, v in step_outputs.items() if k < step_number}
-            
-            tool_result = self._execute_tool(step['tool'], processed_input, current_step_outputs)
-            
-            # If tool_result is a coroutine, await it
-            if asyncio.iscoroutine(tool_result):
-                try:
-                    tool_result = loop.run_until_complete(tool_result)
-                except Exception as e:
-                    tool_result = ToolResult.err(f"Error executing async tool: {str(e)}")
-            
-            # Handle the ToolResult
-            if not tool_result.success:
-                execution_failed = True
-                failure_step = step_number
-                error_message = f"Step {step_number}: {tool_result.error}"
-                outputs.append(error_message)
-                
-                context += f"\nExecution failed: {error_message}"
-                if required:
-                    required_outputs.append(error_message)
-                continue
-            
-            # Handle successful execution
-            step_output = f"Step {step_number}: {tool_result.data}"
+            else:
+                step_output = f"Step {step_number}: {tool_result.data}"
+                tools_used.append(step['tool'])
+
             outputs.append(step_output)
-            
-            # If step is required, add to required_outputs
-            if required:
+            if step.get('required_for_response', False):
                 required_outputs.append(step_output)
-            
-            context += f"\nStep {step_number} output: {tool_result.data}"
-            tools_used.append(step['tool'])
-            step_outputs[step_number] = tool_result.data
 
-        final_result = Vincent.VincentExecuteResult(
+        return Vincent.VincentExecuteResult(
             outputs= outputs,
             required_outputs= required_outputs if required_outputs else None,
             tools= tools_used,
-            completed= not execution_failed,
-            failure_step= failure_step if execution_failed else None,
+            completed= failure_step is None,
+            failure_step= failure_step,
+            steps= steps,
+            results= results,
+        )
+
+    @staticmethod
+    def _reusable_results(steps: List[Dict[str, Any]], previous: Optional["Vincent.VincentExecuteResult"]) -> Dict[Any, ToolResult]:
+        """
+        Results from `previous` for the steps it ran exactly as `steps` define
+        them, with the same dependencies, each of which is reused as well. Such
+        steps resolve to the same input, so running them again would only
+        repeat their tool calls.
+        """
+        if previous is None or not previous.results:
+            return {}
+        previous_steps = {step['step']: step for step in previous.steps}
+        previous_dependencies = Vincent._step_dependencies(previous.steps)
+        dependencies = Vincent._step_dependencies(steps)
+        reusable: Dict[Any, ToolResult] = {}
+        for step in steps:
+            number = step['step']
+            if (
+                number in previous.results
+                and previous_steps.get(number) == step
+                and previous_dependencies[number] == dependencies[number]
+                and dependencies[number].issubset(reusable)
+            ):
+                reusable[number] = previous.results[number]
+        return reusable
+
+    @staticmethod
+    def _plan_steps(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if not isinstance(plan, dict) or 'steps' not in plan:
+            raise ValueError(f"Expected plan to be a dictionary with a 'steps' key, but got {type(plan)}")
+        for step in plan['steps']:
+            if not isinstance(step, dict):
+                raise ValueError(f"Expected step to be a dictionary, but got {type(step)}")
+        return plan['steps']
+
+    @staticmethod
+    def _queued(steps: List[Dict[str, Any]]) -> "queue.Queue[Optional[Dict[str, Any]]]":
+        """A step queue holding every step of a complete plan, closed with None."""
+        step_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        for step in steps:
+            step_queue.put(step)
+        step_queue.put(None)
+        return step_queue
+
+    @staticmethod
+    def _receive_step(
+        step: Dict[str, Any],
+        steps: List[Dict[str, Any]],
+        dependencies: Dict[Any, Set[Any]],
+        pending: List[Dict[str, Any]],
+        results: Dict[Any, ToolResult]
+    ) -> None:
+        """
+        Adds an arriving step to the plan, depending on the steps received
+        before it. Steps that already have a result are not run again.
+        """
+        if not isinstance(step, dict):
+            raise ValueError(f"Expected step to be a dictionary, but got {type(step)}")
+        steps.append(step)
+        dependencies[step['step']] = Vincent._step_dependencies(steps)[step['step']]
+        if step['step'] not in results:
+            pending.append(step)
+
+    @staticmethod
+    def _dispatchable(
+        steps: List[Dict[str, Any]],
+        pending: List[Dict[str, Any]],
+        dependencies: Dict[Any, Set[Any]],
+        results: Dict[Any, ToolResult],
+        step_outputs: Dict[Any, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Pending steps, in plan order, whose dependencies have succeeded and
+        that come before the first failed step in the plan. Steps before a
+        failure still run, exactly as when the steps run in order.
+        """
+        failure = next(
+            (position for position, step in enumerate(steps) if step['step'] in results and not results[step['step']].success),
+            len(steps)
         )
+        waiting = {id(step) for step in pending}
+        return [
+            step for step in steps[:failure]
+            if id(step) in waiting and dependencies[step['step']].issubset(step_outputs)
+        ]
 
-        return final_result
+    @weave.op(name="vincent-execute")
+    def execute(self, plan: Dict[str, Any], previous: Optional[VincentExecuteResult] = None) -> VincentExecuteResult:
+        """
+        Executes the plan's steps as a dependency graph: a step starts as soon
+        as every earlier step its input references with {{n}} has succeeded, so
+        independent steps run concurrently on up to `max_parallel_steps`
+        threads. Outputs are reported in plan order (see `_build_result`), and
+        after a failure only the steps before it in the plan are started, as
+        when the steps run in order. Steps that `previous` already ran
+        unchanged keep its results (see `_reusable_results`).
+        """
+        steps = self._plan_steps(plan)
+        return self._schedule(self._queued(steps), self._reusable_results(steps, previous))
+
+    @weave.op(name="vincent-execute_stream")
+    def execute_stream(self, step_queue: "queue.Queue[Optional[Dict[str, Any]]]") -> VincentExecuteResult:
+        """
+        `execute` for a plan that is still being generated: steps are taken
+        from `step_queue` as they arrive, until a None marks the end of the
+        plan, and each starts as soon as its dependencies have succeeded.
+        """
+        return self._schedule(step_queue)
+
+    def _schedule(
+        self,
+        step_queue: "queue.Queue[Optional[Dict[str, Any]]]",
+        reused: Optional[Dict[Any, ToolResult]] = None
+    ) -> VincentExecuteResult:
+        steps: List[Dict[str, Any]] = []
+        dependencies: Dict[Any, Set[Any]] = {}
+        results: Dict[Any, ToolResult] = dict(reused or {})
+        step_outputs: Dict[Any, Any] = {number: result.data for number, result in results.items() if result.success}
+        pending: List[Dict[str, Any]] = []
+        running: Dict[concurrent.futures.Future, Dict[str, Any]] = {}
+        receiving: Optional[concurrent.futures.Future] = None
+        open_plan = True
+
+        # One extra worker waits on the queue while steps are still arriving
+        with weave.ThreadPoolExecutor(max_workers=max(1, self.max_parallel_steps) + 1) as executor:
+            while True:
+                while open_plan and receiving is None:
+                    try:
+                        step = step_queue.get_nowait()
+                    except queue.Empty:
+                        receiving = executor.submit(step_queue.get)
+                        break
+                    if step is None:
+                        open_plan = False
+                    else:
+                        self._receive_step(step, steps, dependencies, pending, results)
+                for step in self._dispatchable(steps, pending, dependencies, results, step_outputs):
+                    inputs = {number: step_outputs[number] for number in dependencies[step['step']]}
+                    running[executor.submit(self._run_step, step, inputs)] = step
+                    pending.remove(step)
+                if not running and not open_plan:
+                    break
+
+                waiting = list(running) + ([receiving] if receiving is not None else [])
+                done, _ = concurrent.futures.wait(waiting, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    if future is receiving:
+                        receiving = None
+                        step = future.result()
+                        if step is None:
+                            open_plan = False
+                        else:
+                            self._receive_step(step, steps, dependencies, pending, results)
+                        continue
+                    step = running.pop(future)
+                    tool_result = future.result()
+                    results[step['step']] = tool_result
+                    if tool_result.success:
+                        step_outputs[step['step']] = tool_result.data
+
+        return self._build_result(steps, results)
+
+    async def _arun_step(self, step: Dict[str, Any], step_outputs: Dict[int, Any], limit: asyncio.Semaphore) -> ToolResult:
+        """Async `_run_step`."""
+        async with limit:
+            input_data = step.get('input')
+            processed_input = self._process_input(input_data, step_outputs) if input_data is not None else None
+            return await self._aexecute_tool(step['tool'], processed_input, step_outputs)
+
+    @weave.op(name="vincent-aexecute")
+    async def aexecute(self, plan: Dict[str, Any], previous: Optional[VincentExecuteResult] = None) -> VincentExecuteResult:
+        """
+        Async `execute`: the same dependency-graph scheduling, with steps as
+        tasks on the running event loop instead of threads. Async tools are
+        awaited directly and sync tools run on the shared blocking executor.
+        """
+        steps = self._plan_steps(plan)
+        return await self._aschedule(self._queued(steps), self._reusable_results(steps, previous))
+
+    @weave.op(name="vincent-aexecute_stream")
+    async def aexecute_stream(self, step_queue: "queue.Queue[Optional[Dict[str, Any]]]") -> VincentExecuteResult:
+        """Async `execute_stream`; the queue is waited on from the shared blocking executor."""
+        return await self._aschedule(step_queue)
+
+    async def _aschedule(
+        self,
+        step_queue: "queue.Queue[Optional[Dict[str, Any]]]",
+        reused: Optional[Dict[Any, ToolResult]] = None
+    ) -> VincentExecuteResult:
+        steps: List[Dict[str, Any]] = []
+        dependencies: Dict[Any, Set[Any]] = {}
+        results: Dict[Any, ToolResult] = dict(reused or {})
+        step_outputs: Dict[Any, Any] = {number: result.data for number, result in results.items() if result.success}
+        pending: List[Dict[str, Any]] = []
+        running: Dict[asyncio.Future, Dict[str, Any]] = {}
+        receiving: Optional[asyncio.Future] = None
+        open_plan = True
+        limit = asyncio.Semaphore(max(1, self.max_parallel_steps))
+
+        try:
+            while True:
+                while open_plan and receiving is None:
+                    try:
+                        step = step_queue.get_nowait()
+                    except queue.Empty:
+                        receiving = asyncio.ensure_future(run_blocking(step_queue.get))
+                        break
+                    if step is None:
+                        open_plan = False
+                    else:
+                        self._receive_step(step, steps, dependencies, pending, results)
+                for step in self._dispatchable(steps, pending, dependencies, results, step_outputs):
+                    inputs = {number: step_outputs[number] for number in dependencies[step['step']]}
+                    running[asyncio.ensure_future(self._arun_step(step, inputs, limit))] = step
+                    pending.remove(step)
+                if not running and not open_plan:
+                    break
+
+                waiting = list(running) + ([receiving] if receiving is not None else [])
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is receiving:
+                        receiving = None
+                        step = task.result()
+                        if step is None:
+                            open_plan = False
+                        else:
+                            self._receive_step(step, steps, dependencies, pending, results)
+                        continue
+                    step = running.pop(task)
+                    tool_result = task.result()
+                    results[step['step']] = tool_result
+                    if tool_result.success:
+                        step_outputs[step['step']] = tool_result.data
+        finally:
+            for task in running:
+                task.cancel()
+
+        return self._build_result(steps, results)
 
     @weave.op(name="vincent-process_input")
     def _process_input(self, input_data: Any, step_outputs: Dict[int, Any]) -> Any:
@@ -154,65 +423,153 @@ class Vincent(Model):
         else:
             return input_data
     
-    @weave.op(name="vincent-execute_tool")
-    def _execute_tool(self, tool_name: str, processed_input: Union[str, Dict[str, Any], None] = None, step_outputs: Dict[int, Any] = {}) -> ToolResult:
-        tool = next((t for t in self.tools_prompt.tools if t['function']['name'] == tool_name), None)
-        if not tool:
-            return ToolResult.err(f"Tool '{tool_name}' not found")
+    def _build_dispatch_table(self) -> None:
+        """
+        Resolves every registered tool to its function once, so dispatching a
+        step is a dict lookup. Tools whose module or function cannot be
+        imported yet are resolved again when first called. Call again after
+        replacing `tools_prompt`.
+        """
+        self._tool_schemas: Dict[str, Dict[str, Any]] = {
+            tool['function']['name']: tool for tool in self.tools_prompt.tools
+        }
+        self._dispatch_table: Dict[str, Vincent.ToolEntry] = {}
+        for tool_name in self._tool_schemas:
+            try:
+                self._resolve_tool(tool_name)
+            except Exception:
+                pass
 
-        # Parse the tool name to get the module and function
+    @staticmethod
+    def _tool_location(tool_name: str) -> Tuple[str, str]:
+        """Module and function name for a 'module-function' tool name."""
         module_name, function_name = tool_name.split('-')
-        
+        # Add '_fn' suffix if the function name is a Python keyword
+        if function_name == 'async':
+            function_name = 'async_fn'
+        return module_name, function_name
+
+    def _resolve_tool(self, tool_name: str) -> Optional["Vincent.ToolEntry"]:
+        """
+        Dispatch entry for a registered tool, or None if it is not registered.
+        Raises ImportError or AttributeError if its function cannot be found.
+        """
+        entry = self._dispatch_table.get(tool_name)
+        if entry is not None:
+            return entry
+        schema = self._tool_schemas.get(tool_name)
+        if schema is None:
+            return None
+
+        module_name, function_name = self._tool_location(tool_name)
+        module = importlib.import_module(f"tools.{module_name}")
+        entry = Vincent.ToolEntry(getattr(module, function_name), schema)
+        self._dispatch_table[tool_name] = entry
+        return entry
+
+    def _tool_error(self, tool_name: str, error: Exception) -> ToolResult:
+        module_name, function_name = self._tool_location(tool_name)
+        if isinstance(error, ImportError):
+            return ToolResult.err(f"Module 'tools.{module_name}' not found")
+        if isinstance(error, AttributeError):
+            return ToolResult.err(f"Function '{function_name}' not found in module 'tools.{module_name}'")
+        return ToolResult.err(f"Executing '{tool_name}' failed with: {str(error)}")
+
+    @staticmethod
+    def _cache_key(tool_name: str, tool: "Vincent.ToolEntry", processed_input: Any) -> Optional[str]:
+        """Result cache key for this call, or None if the call must not be memoized."""
+        if tool.cache_ttl is None or _TOOL_RESULT_CACHE.max_entries <= 0:
+            return None
+        if tool_cache_bypassed(tool.schema, processed_input):
+            return None
+        return _TOOL_RESULT_CACHE.make_key(tool_name, processed_input)
+
+    @staticmethod
+    def _remember_result(cache_key: Optional[str], tool: "Vincent.ToolEntry", tool_result: Any) -> Any:
+        """Caches a successful ToolResult under `cache_key`; errors are always retried."""
+        if cache_key is not None and isinstance(tool_result, ToolResult) and tool_result.success:
+            _TOOL_RESULT_CACHE.put(cache_key, tool_result, tool.cache_ttl)
+        return tool_result
+
+    @staticmethod
+    async def _aremember_result(cache_key: Optional[str], tool: "Vincent.ToolEntry", coro: Any) -> Any:
+        """Awaits a coroutine tool's result and caches it like `_remember_result`."""
+        return Vincent._remember_result(cache_key, tool, await coro)
+
+    @staticmethod
+    def _call_tool(tool_function: Callable, processed_input: Union[str, Dict[str, Any], None]) -> Any:
+        if processed_input is None:
+            return tool_function()
+        elif isinstance(processed_input, dict):
+            return tool_function(**processed_input)
+        else:
+            return tool_function(processed_input)
+
+    @weave.op(name="vincent-execute_tool")
+    def _execute_tool(self, tool_name: str, processed_input: Union[str, Dict[str, Any], None] = None, step_outputs: Dict[int, Any] = {}) -> ToolResult:
         try:
-            # Dynamically import the module
-            module = importlib.import_module(f"tools.{module_name}")
-            
-            # Get the function from the module
-            # Add '_fn' suffix if the function name is a Python keyword
-            if function_name == 'async':
-                function_name = 'async_fn'
-            tool_function = getattr(module, function_name)
-            
+            tool = self._resolve_tool(tool_name)
+            if tool is None:
+                return ToolResult.err(f"Tool '{tool_name}' not found")
+
+            cache_key = self._cache_key(tool_name, tool, processed_input)
+            if cache_key is not None:
+                cached = _TOOL_RESULT_CACHE.get(cache_key)
+                if cached is not None:
+                    return cached
+
             # Execute the function with or without input
-            if asyncio.iscoroutinefunction(tool_function):
-                # Create coroutine based on input type
-                if processed_input is None:
-                    coro = tool_function()
-                elif isinstance(processed_input, dict):
-                    coro = tool_function(**processed_input)
-                else:
-                    coro = tool_function(processed_input)
+            if tool.is_async:
+                coro = self._call_tool(tool.function, processed_input)
                 
                 try:
                     # Try to get the current event loop
                     loop = asyncio.get_event_loop()
                     if loop.is_running():
-                        # If we're in an async context, just return the coroutine
-                        # It will be awaited by the caller
-                        return coro
+                        # If we're in an async context, return a coroutine for the
+                        # caller to await, which caches the result once it is ready
+                        return self._aremember_result(cache_key, tool, coro)
                     else:
                         # If we're not in an async context, run the coroutine
-                        return loop.run_until_complete(coro)
+                        return self._remember_result(cache_key, tool, loop.run_until_complete(coro))
                 except RuntimeError:
                     # If no event loop exists, create one
                     loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(loop)
                     try:
-                        return loop.run_until_complete(coro)
+                        return self._remember_result(cache_key, tool, loop.run_until_complete(coro))
                     finally:
                         loop.close()
             else:
                 # For sync functions, execute normally
-                if processed_input is None:
-                    return tool_function()
-                elif isinstance(processed_input, dict):
-                    return tool_function(**processed_input)
-                else:
-                    return tool_function(processed_input)
+                return self._remember_result(cache_key, tool, self._call_tool(tool.function, processed_input))
             
-        except ImportError:
-            return ToolResult.err(f"Module 'tools.{module_name}' not found")
-        except AttributeError:
-            return ToolResult.err(f"Function '{function_name}' not found in module 'tools.{module_name}'")
         except Exception as e:
-            return ToolResult.err(f"Executing '{tool_name}' failed with: {str(e)}")
+            return self._tool_error(tool_name, e)
+
+    @weave.op(name="vincent-aexecute_tool")
+    async def _aexecute_tool(self, tool_name: str, processed_input: Union[str, Dict[str, Any], None] = None, step_outputs: Dict[int, Any] = {}) -> ToolResult:
+        """
+        Async `_execute_tool`: coroutine tools are awaited on the running loop and
+        sync tools are offloaded to the shared executor, so no nested event loop
+        is ever created.
+        """
+        try:
+            tool = self._resolve_tool(tool_name)
+            if tool is None:
+                return ToolResult.err(f"Tool '{tool_name}' not found")
+
+            cache_key = self._cache_key(tool_name, tool, processed_input)
+            if cache_key is not None:
+                cached = _TOOL_RESULT_CACHE.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            if tool.is_async:
+                tool_result = await self._call_tool(tool.function, processed_input)
+            else:
+                tool_result = await run_blocking(self._call_tool, tool.function, processed_input)
+            return self._remember_result(cache_key, tool, tool_result)
+
+        except Exception as e:
+            return self._tool_error(tool_name, e)
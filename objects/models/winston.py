@@ -1,16 +1,38 @@
+import asyncio
 import json
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import weave
 from weave import Model
-from weave.integrations.bedrock.bedrock_sdk import patch_client
 import boto3
 import os
+import queue
+import threading
 
 from objects.prompts.winston import WinstonPlanAnswerPrompt, WinstonAnswerWithResultsPrompt
 from objects.models.vincent import Vincent
-from utils.helpers import clean_claude_json
+from utils.helpers import clean_claude_json, run_blocking
+from utils.bedrock import get_bedrock_client
+from utils.response_cache import ResponseCache
+from utils.stream_json import PlanStepParser
 from objects.models.finetuned import FinetunedModel
 from tools.vector_search import initialize_or_load_vector_db
+
+# Sampling temperature hard-coded in `_generate_response`; part of the response cache key
+GENERATION_TEMPERATURE = 0.7
+# Bedrock model id fragments of models that accept cache_control markers on system blocks
+PROMPT_CACHING_MODELS = (
+    "anthropic.claude-3-7-sonnet",
+    "anthropic.claude-3-5-haiku",
+    "anthropic.claude-sonnet-4",
+    "anthropic.claude-opus-4",
+)
+_PROMPT_USAGE_LOCK = threading.Lock()
+# Parsed model responses are cached in memory, and on disk when LLM_RESPONSE_CACHE_PATH is set
+_RESPONSE_CACHE: ResponseCache = ResponseCache(
+    max_entries=int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "1024")),
+    disk_path=os.getenv("LLM_RESPONSE_CACHE_PATH")
+)
+
 class Winston(Model):
     prompt_plan_answer: WinstonPlanAnswerPrompt = WinstonPlanAnswerPrompt()
     prompt_answer_with_results: WinstonAnswerWithResultsPrompt = WinstonAnswerWithResultsPrompt()
@@ -19,6 +41,10 @@ class Winston(Model):
     finetuned_model: Optional[FinetunedModel] = None
     use_finetuned: bool = False
     model_id: str = "gpt-4o"
+    cache_responses: bool = False
+    prompt_caching: bool = False
+    streaming: bool = False
+    prompt_cache_usage: Dict[str, int] = {}
     
     def __init__(
         self, 
@@ -27,14 +53,20 @@ class Winston(Model):
         vincent: Vincent = None,
         region_name: str = os.getenv("AWS_DEFAULT_REGION"),
         use_finetuned: bool = False,
+        cache_responses: bool = os.getenv("LLM_RESPONSE_CACHE", "0") == "1",
+        prompt_caching: bool = os.getenv("BEDROCK_PROMPT_CACHING", "0") == "1",
+        streaming: bool = os.getenv("BEDROCK_STREAMING", "0") == "1",
     ):
         super().__init__()
         self.vincent = vincent if vincent is not None else Vincent()
         self.model_id = model_id
+        self.cache_responses = cache_responses
+        self.prompt_caching = prompt_caching
+        self.streaming = streaming
+        self.prompt_cache_usage = {"calls": 0, "cache_read_input_tokens": 0, "cache_write_input_tokens": 0, "uncached_input_tokens": 0}
         self._auto_execute = auto_execute
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name=region_name)
-        
-        patch_client(self.bedrock_client)
+        # Shared, weave-traced client: every Winston reuses one connection pool
+        self.bedrock_client = get_bedrock_client(region_name, traced=True)
         
         initialize_or_load_vector_db('/Users/wylerzahm/Desktop/projects/fc2025-space-agent/objects/datasets/knowledge_base.md')
         
@@ -46,31 +78,44 @@ class Winston(Model):
 
     ##### 1. NEW QUERY ENTRY POINT #####
     @weave.op(name="winston-predict")
-    def predict(self, messages: List[Dict[str, str]], callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def predict(
+        self,
+        messages: List[Dict[str, str]],
+        callback: Optional[Callable] = None,
+        use_cache: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """Alias for process method"""
-        return self.process(messages[0]['content'], callback)
+        return self.process(messages[0]['content'], callback, use_cache)
 
     ##### 2. QUERY PROCESSING ENTRY POINT #####
     @weave.op(name="winston-process")
     def process(
         self, 
         query: str, 
-        callback: Callable[[Dict[str, Any]], None] = None
+        callback: Callable[[Dict[str, Any]], None] = None,
+        use_cache: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Main entry point for processing messages. Handles the high-level flow of:
         1. Getting initial response
         2. Executing plans if needed
         3. Getting final answer
+
+        With `streaming`, plan steps start executing while the plan is still
+        being generated. `use_cache` overrides `cache_responses` for this query's model calls.
         """
-        # Get initial response
-        response = self._plan_or_answer(query)
+        # Get initial response, executing plan steps while they stream in if streaming
+        if self.streaming:
+            response, executed_plan_response = self._stream_plan_or_answer(query, use_cache)
+        else:
+            response, executed_plan_response = self._plan_or_answer(query, use_cache=use_cache), None
         #print("***** Initial response:", response)
         
         # If we got a plan and should execute it
         if response.get('type') == 'plan':
             # Execute the plan and get the updated response with process info
-            executed_plan_response = self._execute_plan(response)
+            if executed_plan_response is None:
+                executed_plan_response = self._execute_plan(response)
             #print("***** Executed plan response:", executed_plan_response)
 
             # If execution occurred (indicated by presence of process key from _execute_plan)
@@ -79,7 +124,7 @@ class Winston(Model):
                 if self.finetuned_model:
                     final_response = self._solve_with_results_finetuned(query, executed_plan_response['process']['execution_summary'])
                 else:
-                    final_response = self._solve_with_results(query, executed_plan_response['process']['execution_summary'])
+                    final_response = self._solve_with_results(query, executed_plan_response['process']['execution_summary'], use_cache)
                 #print("***** Final response after execution:", final_response)
                 
                 # Carry over the detailed process information from the execution
@@ -94,28 +139,88 @@ class Winston(Model):
             # If it wasn't a plan or auto_execute is off, return the initial response
             return response
 
-    ##### 3. PLAN OR ANSWER #####
-    @weave.op(name="winston-solve")
-    def _plan_or_answer(
-        self, 
-        query: str, 
-        execution_results: Vincent.VincentExecuteResult = None
+    ##### 2b. ASYNC QUERY PROCESSING ENTRY POINT #####
+    @weave.op(name="winston-apredict")
+    async def apredict(
+        self,
+        messages: List[Dict[str, str]],
+        callback: Optional[Callable] = None,
+        use_cache: Optional[bool] = None
     ) -> Dict[str, Any]:
+        """Alias for aprocess method"""
+        return await self.aprocess(messages[0]['content'], callback, use_cache)
+
+    @weave.op(name="winston-aprocess")
+    async def aprocess(
+        self,
+        query: str,
+        callback: Callable[[Dict[str, Any]], None] = None,
+        use_cache: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Async `process`. Bedrock calls and sync tools run on the shared blocking
+        executor, so one event loop can serve many queries concurrently.
+        """
+        if self.streaming:
+            response, executed_plan_response = await self._astream_plan_or_answer(query, use_cache)
+        else:
+            response, executed_plan_response = await self._aplan_or_answer(query, use_cache), None
+
+        if response.get('type') == 'plan':
+            if executed_plan_response is None:
+                executed_plan_response = await self._aexecute_plan(response)
+
+            if executed_plan_response and 'process' in executed_plan_response:
+                execution_summary = executed_plan_response['process']['execution_summary']
+                if self.finetuned_model:
+                    final_response = await run_blocking(self._solve_with_results_finetuned, query, execution_summary)
+                else:
+                    final_response = await self._asolve_with_results(query, execution_summary, use_cache)
+
+                final_response['process'] = executed_plan_response['process']
+                return final_response
+            else:
+                 return executed_plan_response or response
 
+        else:
+            return response
+
+    ##### 3. PLAN OR ANSWER #####
+    def _plan_messages(self, query: str) -> List[Dict[str, str]]:
         # Generate tool descriptions
         tool_descriptions = self.vincent.tools_prompt.get_tools_descriptions()
 
         # Generate the dynamic system message, ensure system message is always first
-        system_message = self.prompt_plan_answer.system_prompt(tool_descriptions)   
-        messages_for_run = [
+        if self._uses_prompt_caching():
+            # Static tool catalogue first and marked cacheable, volatile date last
+            static_block, volatile_block = self.prompt_plan_answer.system_blocks(tool_descriptions)
+            system_message = [
+                {"type": "text", "text": static_block, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": volatile_block}
+            ]
+        else:
+            system_message = self.prompt_plan_answer.system_prompt(tool_descriptions)   
+        return [
             {"role": "system", "content": system_message}, 
             {"role": "user", "content": query}
         ]
 
+    @weave.op(name="winston-solve")
+    def _plan_or_answer(
+        self, 
+        query: str, 
+        execution_results: Vincent.VincentExecuteResult = None,
+        use_cache: Optional[bool] = None
+    ) -> Dict[str, Any]:
+
         # Generate response
-        response = self._generate_response(messages_for_run)
+        response = self._cached_generate_response(self._plan_messages(query), use_cache)
         return response
 
+    @weave.op(name="winston-asolve")
+    async def _aplan_or_answer(self, query: str, use_cache: Optional[bool] = None) -> Dict[str, Any]:
+        return await self._agenerate_response(self._plan_messages(query), use_cache)
+
     ##### 4. EXECUTE PLAN #####
     @weave.op(name="winston-execute")
     def _execute_plan(
@@ -123,12 +228,25 @@ class Winston(Model):
         plan_response: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Execute a plan, update its process key, and return it."""
-        # Get the original plan steps
-        original_steps = plan_response.get('content', {}).get('steps', [])
-        
         # Execute the plan using Vincent
         execution_result: Vincent.VincentExecuteResult = self.vincent.execute(plan_response['content'])
-        
+        return self._record_execution(plan_response, execution_result)
+
+    @weave.op(name="winston-aexecute")
+    async def _aexecute_plan(self, plan_response: Dict[str, Any]) -> Dict[str, Any]:
+        """Async `_execute_plan`."""
+        execution_result: Vincent.VincentExecuteResult = await self.vincent.aexecute(plan_response['content'])
+        return self._record_execution(plan_response, execution_result)
+
+    def _record_execution(
+        self,
+        plan_response: Dict[str, Any],
+        execution_result: Vincent.VincentExecuteResult
+    ) -> Dict[str, Any]:
+        """Fills the plan response's process key from Vincent's execution result."""
+        # Get the original plan steps
+        original_steps = plan_response.get('content', {}).get('steps', [])
+
         # Prepare detailed process information
         tools_used = []
         steps_taken = []
@@ -200,29 +318,316 @@ class Winston(Model):
         return plan_response # Return the plan_response with populated process info
 
     ##### 5. SOLVE WITH RESULTS #####
-    @weave.op(name="winston-solve-with-results")
-    def _solve_with_results(
-        self, 
-        query: str,
-        execution_results: List[str],
-    ) -> Dict[str, Any]:
-
+    def _results_messages(self, query: str, execution_results: List[str]) -> List[Dict[str, str]]:
         # Generate the dynamic system message, ensure system message is always first
         system_message = self.prompt_answer_with_results.system_prompt(str(execution_results))
         # Generate the messages for the LLM run
-        messages_for_run = [
+        return [
             {"role": "system", "content": system_message}, 
             {"role": "user", "content": query}
         ]
 
+    @weave.op(name="winston-solve-with-results")
+    def _solve_with_results(
+        self, 
+        query: str,
+        execution_results: List[str],
+        use_cache: Optional[bool] = None
+    ) -> Dict[str, Any]:
+
         # Generate response
-        response = self._generate_response(messages_for_run)
+        response = self._cached_generate_response(self._results_messages(query, execution_results), use_cache)
         return response
-    
 
+    @weave.op(name="winston-asolve-with-results")
+    async def _asolve_with_results(
+        self,
+        query: str,
+        execution_results: List[str],
+        use_cache: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        return await self._agenerate_response(self._results_messages(query, execution_results), use_cache)
+
+    def _cached_generate_response(self, messages: List[Dict[str, str]], use_cache: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        `_generate_response` behind the response cache when `use_cache` (or,
+        if it is None, `cache_responses`) is set. Error responses are not cached.
+        """
+        generate = self._generate_response
+        if any(msg['role'] == 'system' and isinstance(msg['content'], list) for msg in messages):
+            generate = self._generate_block_response
+        key = self._response_cache_key(messages, use_cache)
+        if key is None:
+            return generate(messages)
+
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is not None:
+            return cached
+        return self._remember_response(key, generate(messages))
+
+    def _response_cache_key(self, messages: List[Dict[str, Any]], use_cache: Optional[bool] = None) -> Optional[str]:
+        """Response cache key for these messages, or None if this call must not be cached."""
+        if use_cache is None:
+            use_cache = self.cache_responses
+        if not use_cache or not _RESPONSE_CACHE.enabled:
+            return None
+        return ResponseCache.make_key(self.model_id, GENERATION_TEMPERATURE, messages)
+
+    @staticmethod
+    def _remember_response(key: Optional[str], response: Dict[str, Any]) -> Dict[str, Any]:
+        """Caches `response` under `key`; error responses are always retried."""
+        if key is not None and response.get('content', {}).get('reason') != 'Error during response generation':
+            _RESPONSE_CACHE.put(key, response)
+        return response
+
+    async def _agenerate_response(self, messages: List[Dict[str, str]], use_cache: Optional[bool] = None) -> Dict[str, Any]:
+        """Awaitable `_cached_generate_response`; the blocking boto3 call runs on the shared executor."""
+        return await run_blocking(self._cached_generate_response, messages, use_cache)
+
+    ##### 6. PROMPT CACHING #####
+    def _uses_prompt_caching(self) -> bool:
+        return self.prompt_caching and any(model in self.model_id for model in PROMPT_CACHING_MODELS)
+
+    def _record_prompt_usage(self, usage: Dict[str, Any]) -> None:
+        """Adds one call's Bedrock token usage to `prompt_cache_usage` and logs it."""
+        read = int(usage.get('cache_read_input_tokens') or 0)
+        written = int(usage.get('cache_creation_input_tokens') or 0)
+        uncached = int(usage.get('input_tokens') or 0)
+        with _PROMPT_USAGE_LOCK:
+            for counter, tokens in (("calls", 1), ("cache_read_input_tokens", read),
+                                    ("cache_write_input_tokens", written), ("uncached_input_tokens", uncached)):
+                self.prompt_cache_usage[counter] = self.prompt_cache_usage.get(counter, 0) + tokens
+        print(f"Prompt cache: {read} input tokens read from cache, {written} written to cache, {uncached} uncached")
+
+    @staticmethod
+    def _request_body(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        The Bedrock request `_generate_response` builds, except that system
+        content given as a list of text blocks is sent as-is.
+        """
+        system: List[Dict[str, Any]] = []
+        for msg in messages:
+            if msg['role'] == 'system':
+                content = msg['content']
+                system.extend(content if isinstance(content, list) else [{"type": "text", "text": str(content)}])
+        request_body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 4000,
+            "temperature": GENERATION_TEMPERATURE,
+            "messages": [
+                {"role": msg['role'], "content": str(msg['content']) if isinstance(msg['content'], dict) else msg['content']}
+                for msg in messages if msg['role'] != 'system'
+            ]
+        }
+        if system:
+            request_body["system"] = system
+        return request_body
+
+    @staticmethod
+    def _parse_result(content: str) -> Dict[str, Any]:
+        """Parses the model's text into a result with the same process info as `_generate_response`."""
+        result = json.loads(clean_claude_json(content))['result']
+        if result.get('type') == 'plan' and 'steps' in result.get('content', {}):
+            steps = result['content']['steps']
+            result['process'] = {
+                'tools_used': list(set(step.get('tool') for step in steps if step.get('tool'))),
+                'reasoning': 'Plan created by LLM to answer query',
+                'steps_taken': steps,
+                'execution_summary': []
+            }
+        else:
+            result['process'] = {
+                'tools_used': [],
+                'reasoning': '',
+                'steps_taken': [],
+                'execution_summary': []
+            }
+        return result
+
+    @staticmethod
+    def _error_response(error: Exception, body_unparsed: Any) -> Dict[str, Any]:
+        return {
+            'type': 'answer',
+            'content': {
+                'message': f'Error generating response: {str(error)}, {body_unparsed}',
+                'reason': 'Error during response generation'
+            },
+            'process': {
+                'tools_used': [],
+                'reasoning': f'Error during response generation: {str(error)}',
+                'steps_taken': [],
+                'execution_summary': [f'Error during response generation: {str(error)}']
+            }
+        }
+
+    @weave.op(name="winston-generate_block_response")
+    def _generate_block_response(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        `_generate_response` for messages whose system content is a list of
+        Bedrock text blocks, which are sent as-is so their cache_control
+        markers apply. Records cached and uncached input tokens per call.
+        """
+        body_unparsed = None
+        try:
+            try:
+                response = self.bedrock_client.invoke_model(
+                    modelId=self.model_id,
+                    body=json.dumps(self._request_body(messages))
+                )
+            except Exception as e:
+                print(f"Error invoking model: {e}")
+                raise e
+
+            body_unparsed = response['body'].read()
+            response_body = json.loads(body_unparsed)
+            self._record_prompt_usage(response_body.get('usage', {}))
+            return self._parse_result(response_body['content'][0]['text'])
+
+        except Exception as e:
+            return self._error_response(e, body_unparsed)
+
+    ##### 7. STREAMING #####
+    @weave.op(name="winston-generate_streaming_response")
+    def _generate_streaming_response(
+        self,
+        messages: List[Dict[str, Any]],
+        on_step: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        `_generate_response` over Bedrock's response stream. The text is fed to
+        a `PlanStepParser` as it arrives and `on_step` is called with each plan
+        step as soon as it is complete, before the rest of the plan has been
+        generated. The full text is parsed as usual once the stream ends.
+        """
+        parser = PlanStepParser()
+        try:
+            try:
+                response = self.bedrock_client.invoke_model_with_response_stream(
+                    modelId=self.model_id,
+                    body=json.dumps(self._request_body(messages))
+                )
+            except Exception as e:
+                print(f"Error invoking model: {e}")
+                raise e
 
+            for event in response['body']:
+                chunk = event.get('chunk')
+                if chunk is None:
+                    continue
+                data = json.loads(chunk['bytes'])
+                if data.get('type') == 'message_start' and self._uses_prompt_caching():
+                    self._record_prompt_usage(data.get('message', {}).get('usage', {}))
+                elif data.get('type') == 'content_block_delta' and data.get('delta', {}).get('type') == 'text_delta':
+                    for step in parser.feed(data['delta']['text']):
+                        if on_step is not None:
+                            on_step(step)
 
+            return self._parse_result(parser.text)
 
+        except Exception as e:
+            return self._error_response(e, parser.text or None)
+
+    def _stream_plan_or_answer(
+        self,
+        query: str,
+        use_cache: Optional[bool] = None
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Streams the planning call while Vincent executes each plan step as it
+        arrives. Returns the response and, for a plan, the executed plan
+        response. If the final plan differs from the streamed steps, only the
+        steps that changed are executed again; if no steps were streamed this
+        is None and the plan is executed as usual. Cached responses are not
+        streamed.
+        """
+        messages = self._plan_messages(query)
+        key = self._response_cache_key(messages, use_cache)
+        cached = _RESPONSE_CACHE.get(key) if key is not None else None
+        if cached is not None:
+            return cached, None
+
+        step_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        streamed_steps: List[Dict[str, Any]] = []
+
+        def on_step(step: Dict[str, Any]) -> None:
+            streamed_steps.append(step)
+            step_queue.put(step)
+
+        with weave.ThreadPoolExecutor(max_workers=1) as executor:
+            execution = executor.submit(self.vincent.execute_stream, step_queue)
+            try:
+                response = self._generate_streaming_response(messages, on_step)
+            finally:
+                step_queue.put(None)
+            execution_result = execution.result()
+
+        self._remember_response(key, response)
+        executed_plan_response = self._streamed_execution(response, streamed_steps, execution_result)
+        if executed_plan_response is None and response.get('type') == 'plan' and streamed_steps:
+            execution_result = self.vincent.execute(response['content'], previous=execution_result)
+            executed_plan_response = self._record_execution(response, execution_result)
+        return response, executed_plan_response
+
+    async def _astream_plan_or_answer(
+        self,
+        query: str,
+        use_cache: Optional[bool] = None
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Async `_stream_plan_or_answer`: the stream is read on the shared blocking executor."""
+        messages = self._plan_messages(query)
+        key = self._response_cache_key(messages, use_cache)
+        cached = _RESPONSE_CACHE.get(key) if key is not None else None
+        if cached is not None:
+            return cached, None
+
+        step_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        streamed_steps: List[Dict[str, Any]] = []
+
+        def generate() -> Dict[str, Any]:
+            def on_step(step: Dict[str, Any]) -> None:
+                streamed_steps.append(step)
+                step_queue.put(step)
+            try:
+                return self._generate_streaming_response(messages, on_step)
+            finally:
+                step_queue.put(None)
+
+        response, execution_result = await asyncio.gather(
+            run_blocking(generate),
+            self.vincent.aexecute_stream(step_queue)
+        )
+        self._remember_response(key, response)
+        executed_plan_response = self._streamed_execution(response, streamed_steps, execution_result)
+        if executed_plan_response is None and response.get('type') == 'plan' and streamed_steps:
+            execution_result = await self.vincent.aexecute(response['content'], previous=execution_result)
+            executed_plan_response = self._record_execution(response, execution_result)
+        return response, executed_plan_response
+
+    def _streamed_execution(
+        self,
+        response: Dict[str, Any],
+        streamed_steps: List[Dict[str, Any]],
+        execution_result: Vincent.VincentExecuteResult
+    ) -> Optional[Dict[str, Any]]:
+        """
+        The executed plan response, if the steps run while streaming are
+        exactly the final plan's. If generation failed after some steps ran,
+        their results are recorded in the error response's process instead.
+        """
+        if response.get('type') != 'plan':
+            if streamed_steps:
+                executed = self._record_execution({'content': {'steps': streamed_steps}}, execution_result)['process']
+                process = response.setdefault('process', {})
+                process['tools_used'] = executed['tools_used']
+                process['steps_taken'] = executed['steps_taken']
+                process['execution_summary'] = process.get('execution_summary', []) + executed['execution_summary']
+            return None
+        if streamed_steps != response.get('content', {}).get('steps'):
+            if streamed_steps:
+                print("Streamed plan steps differ from the final plan; executing the steps that changed")
+            return None
+        return self._record_execution(response, execution_result)
+    
 
     ############ DO NOT MODIFY BELOW THIS LINE ############
     # Evaluation results not guaranteed if this is modified.
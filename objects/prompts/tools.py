@@ -1,7 +1,13 @@
+import hashlib
+import json
+import threading
 import weave
 from weave import Prompt
 from utils.helpers import load_tools
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+# Serialises renders; module-level because prompts are deep-copied as model defaults
+_RENDER_LOCK = threading.Lock()
 
 class ToolsPrompt(Prompt):
     tools: List[Dict[str, Any]] = load_tools()
@@ -9,11 +15,50 @@ class ToolsPrompt(Prompt):
     def __init__(self, tools: List[Dict[str, Any]] = None):
         super().__init__()
         self.tools = tools if tools is not None else load_tools()
+        # (tools list, its length, version, rendered descriptions) for the last tool set rendered
+        self._rendered: Optional[Tuple[List[Dict[str, Any]], int, str, str]] = None
+
+    @staticmethod
+    def compute_tools_version(tools: List[Dict[str, Any]]) -> str:
+        """Short hash of the tools' function schemas, the part rendered into the prompt."""
+        canonical = json.dumps([tool['function'] for tool in tools], sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+    def _current_render(self) -> Tuple[str, str]:
+        """
+        (version, descriptions) for the current tool set, rendered only when
+        `tools` has been replaced or resized since the last render. Call
+        `invalidate` after editing a tool schema in place.
+        """
+        rendered = self._rendered
+        if rendered is not None and rendered[0] is self.tools and rendered[1] == len(self.tools):
+            return rendered[2], rendered[3]
+        with _RENDER_LOCK:
+            rendered = self._rendered
+            if rendered is None or rendered[0] is not self.tools or rendered[1] != len(self.tools):
+                tools = self.tools
+                rendered = (tools, len(tools), self.compute_tools_version(tools), self.render_tools_descriptions(tools))
+                self._rendered = rendered
+        return rendered[2], rendered[3]
+
+    def invalidate(self) -> None:
+        """Drops the cached rendering so the next call re-renders the tools."""
+        with _RENDER_LOCK:
+            self._rendered = None
+
+    @property
+    def tools_version(self) -> str:
+        """Version hash of the tool set behind `get_tools_descriptions`, for keying downstream caches."""
+        return self._current_render()[0]
 
-    @weave.op(name="tools-generate_tool_descriptions")
     def get_tools_descriptions(self) -> str:
+        """Markdown description of every tool, rendered once per tool-set version."""
+        return self._current_render()[1]
+
+    @weave.op(name="tools-generate_tool_descriptions")
+    def render_tools_descriptions(self, tools: List[Dict[str, Any]]) -> str:
         tool_descriptions = []
-        for i, tool in enumerate(self.tools):
+        for i, tool in enumerate(tools):
             # Basic tool info
             desc = [
                 f"{i+1}. **{tool['function']['name']}({', '.join(tool['function']['parameters'].get('properties', {}).keys())})**",
@@ -1,11 +1,16 @@
 import weave
 from weave import Prompt
 from datetime import datetime
+from typing import List
 
 class WinstonPlanAnswerPrompt(Prompt):
-    system_template: str = """Your name is Winston. You are an LLM agent specialized in answering questions and performing QA tasks.
-Current date: {current_date}
-
+    # The system prompt is the introduction, the date line, then the static
+    # template; prompt caching moves the date line after the static part
+    introduction: str = """Your name is Winston. You are an LLM agent specialized in answering questions and performing QA tasks.
+"""
+    date_template: str = """Current date: {current_date}
+"""
+    static_template: str = """
 Here are the only tools available to you:
 ```
 {tool_descriptions}
@@ -70,13 +75,29 @@ Example Plan:
 ```
 """
 
+    def _date_line(self) -> str:
+        return self.date_template.format(current_date=datetime.now().strftime("%Y-%m-%d %A"))
+
     @weave.op()
     def system_prompt(self, tool_descriptions: str) -> str:
-        return self.system_template.format(
-            current_date=datetime.now().strftime("%Y-%m-%d %A"),
-            tool_descriptions=tool_descriptions
+        return (
+            self.introduction
+            + self._date_line()
+            + self.static_template.format(tool_descriptions=tool_descriptions)
         )
 
+    @weave.op()
+    def system_blocks(self, tool_descriptions: str) -> List[str]:
+        """
+        The system prompt split for prompt caching: the introduction,
+        instructions and tool catalogue, which only change with the tool set,
+        then the date line, which `system_prompt` puts after the introduction.
+        """
+        return [
+            self.introduction + self.static_template.format(tool_descriptions=tool_descriptions),
+            self._date_line()
+        ]
+
 class WinstonAnswerWithResultsPrompt(Prompt):
     system_template: str = """Your name is Winston. You are an LLM agent specialized in answering questions and performing QA tasks.
 Current date: {current_date}
@@ -0,0 +1,53 @@
+import threading
+import pytest
+from unittest.mock import patch
+
+from utils import bedrock
+from utils.bedrock import get_bedrock_client, clear_bedrock_clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    clear_bedrock_clients()
+    yield
+    clear_bedrock_clients()
+
+
+def test_clients_are_shared_per_region():
+    first = get_bedrock_client("us-east-1")
+    assert get_bedrock_client("us-east-1") is first
+    assert get_bedrock_client("us-west-2") is not first
+
+
+def test_clients_use_the_shared_config():
+    config = get_bedrock_client("us-east-1").meta.config
+    assert config.max_pool_connections == bedrock.BEDROCK_MAX_POOL_CONNECTIONS
+    assert config.retries == {"mode": bedrock.BEDROCK_RETRY_MODE, "total_max_attempts": bedrock.BEDROCK_MAX_ATTEMPTS}
+    assert config.connect_timeout == bedrock.BEDROCK_CONNECT_TIMEOUT
+    assert config.read_timeout == bedrock.BEDROCK_READ_TIMEOUT
+
+
+def test_traced_clients_are_patched_once():
+    with patch.object(bedrock, "patch_client") as patch_client:
+        traced = get_bedrock_client("us-east-1", traced=True)
+        assert get_bedrock_client("us-east-1", traced=True) is traced
+        assert get_bedrock_client("us-east-1") is not traced
+    patch_client.assert_called_once_with(traced)
+
+
+def test_concurrent_callers_get_one_client():
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(get_bedrock_client("us-east-1"))) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_clients_without_retries_get_a_pool_of_their_own():
+    shared = get_bedrock_client("us-east-1")
+    single_attempt = get_bedrock_client("us-east-1", max_attempts=1)
+    assert single_attempt is not shared
+    assert get_bedrock_client("us-east-1", max_attempts=1) is single_attempt
+    assert single_attempt.meta.config.retries["total_max_attempts"] == 1
@@ -0,0 +1,86 @@
+import io
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from objects.models.winston import Winston
+from objects.models.vincent import Vincent
+from objects.prompts.tools import ToolsPrompt
+
+
+TOOLS = [{
+    'function': {
+        'name': 'test-tool',
+        'description': 'A test tool',
+        'parameters': {'properties': {'query': {'type': 'string', 'description': 'Query'}}}
+    }
+}]
+
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+
+def bedrock_reply(usage):
+    body = {
+        'content': [{'text': json.dumps({'result': {'type': 'answer', 'content': {'message': 'Hi', 'reason': 'Greeting'}}})}],
+        'usage': usage
+    }
+    return {'body': io.BytesIO(json.dumps(body).encode('utf-8'))}
+
+
+@pytest.fixture
+def winston():
+    client = MagicMock()
+    return Winston.model_construct(
+        model_id=MODEL_ID,
+        prompt_caching=True,
+        bedrock_client=client,
+        vincent=Vincent(tools_prompt=ToolsPrompt(tools=TOOLS)),
+        prompt_cache_usage={}
+    )
+
+
+def test_plan_messages_put_static_catalogue_first(winston):
+    system = winston._plan_messages("Hello")[0]['content']
+    assert system[0]['cache_control'] == {"type": "ephemeral"}
+    assert "test-tool" in system[0]['text']
+    assert "Current date" not in system[0]['text']
+    assert system[1]['text'].startswith("Current date: ")
+    assert 'cache_control' not in system[1]
+
+
+def test_plan_messages_are_plain_without_prompt_caching(winston):
+    winston.prompt_caching = False
+    assert isinstance(winston._plan_messages("Hello")[0]['content'], str)
+
+    winston.prompt_caching = True
+    winston.model_id = "amazon.titan-text-express-v1"
+    assert isinstance(winston._plan_messages("Hello")[0]['content'], str)
+
+
+def test_block_request_sends_cache_markers_and_records_usage(winston):
+    winston.bedrock_client.invoke_model.side_effect = [
+        bedrock_reply({'input_tokens': 20, 'cache_creation_input_tokens': 1500, 'cache_read_input_tokens': 0}),
+        bedrock_reply({'input_tokens': 20, 'cache_creation_input_tokens': 0, 'cache_read_input_tokens': 1500}),
+    ]
+    messages = winston._plan_messages("Hello")
+    first = winston._cached_generate_response(messages, use_cache=False)
+    winston._cached_generate_response(messages, use_cache=False)
+
+    assert first['type'] == 'answer'
+    assert first['content']['message'] == 'Hi'
+    request = json.loads(winston.bedrock_client.invoke_model.call_args.kwargs['body'])
+    assert request['system'] == messages[0]['content']
+    assert request['messages'] == [{'role': 'user', 'content': 'Hello'}]
+    assert winston.prompt_cache_usage == {
+        "calls": 2,
+        "cache_read_input_tokens": 1500,
+        "cache_write_input_tokens": 1500,
+        "uncached_input_tokens": 40
+    }
+
+
+def test_string_system_prompts_use_generate_response(winston):
+    messages = [{"role": "system", "content": "Plain"}, {"role": "user", "content": "Hello"}]
+    with patch.object(Winston, "_generate_response", return_value={'type': 'answer'}) as generate:
+        winston._cached_generate_response(messages, use_cache=False)
+    generate.assert_called_once_with(messages)
@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import patch
+
+from utils.response_cache import ResponseCache
+from objects.models import winston as winston_module
+from objects.models.winston import Winston
+
+
+MESSAGES = [
+    {"role": "system", "content": "You are Winston."},
+    {"role": "user", "content": "How far is Mars?"}
+]
+
+ANSWER = {
+    'type': 'answer',
+    'content': {'message': 'Far.', 'reason': 'Known distance'},
+    'process': {'tools_used': [], 'reasoning': '', 'steps_taken': [], 'execution_summary': []}
+}
+
+
+def test_make_key_covers_model_temperature_system_and_messages():
+    key = ResponseCache.make_key("model-a", 0.7, MESSAGES)
+    assert key == ResponseCache.make_key("model-a", 0.7, [dict(msg) for msg in MESSAGES])
+    assert key != ResponseCache.make_key("model-b", 0.7, MESSAGES)
+    assert key != ResponseCache.make_key("model-a", 0.0, MESSAGES)
+    assert key != ResponseCache.make_key("model-a", 0.7, [{"role": "system", "content": "Other."}, MESSAGES[1]])
+    assert key != ResponseCache.make_key("model-a", 0.7, [MESSAGES[0], {"role": "user", "content": "How far is Venus?"}])
+
+
+def test_get_returns_independent_copies():
+    cache = ResponseCache(max_entries=4)
+    cache.put("k", ANSWER)
+    first = cache.get("k")
+    first['process']['tools_used'].append("mutated")
+    assert cache.get("k") == ANSWER
+    assert cache.get("missing") is None
+    assert cache.stats() == {"memory_hits": 2, "disk_hits": 0, "misses": 1, "memory_entries": 1}
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "responses" / "cache.sqlite")
+    ResponseCache(max_entries=4, disk_path=path).put("k", ANSWER)
+
+    reopened = ResponseCache(max_entries=4, disk_path=path)
+    assert reopened.get("k") == ANSWER
+    assert reopened.get("k") == ANSWER
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.stats()["memory_hits"] == 1
+
+
+@pytest.fixture
+def response_cache():
+    cache = ResponseCache(max_entries=16)
+    with patch.object(winston_module, "_RESPONSE_CACHE", cache):
+        yield cache
+
+
+def test_winston_reuses_cached_responses(response_cache):
+    winston = Winston.model_construct(model_id="test-model", cache_responses=True)
+    with patch.object(Winston, "_generate_response", return_value=ANSWER) as generate:
+        first = winston._cached_generate_response(MESSAGES)
+        second = winston._cached_generate_response(MESSAGES)
+    assert first == second == ANSWER
+    assert generate.call_count == 1
+
+
+def test_winston_cache_can_be_bypassed_per_call(response_cache):
+    winston = Winston.model_construct(model_id="test-model", cache_responses=True)
+    with patch.object(Winston, "_generate_response", return_value=ANSWER) as generate:
+        winston._cached_generate_response(MESSAGES)
+        winston._cached_generate_response(MESSAGES, use_cache=False)
+    assert generate.call_count == 2
+
+    response_cache.clear()
+    uncached = Winston.model_construct(model_id="test-model", cache_responses=False)
+    with patch.object(Winston, "_generate_response", return_value=ANSWER) as generate:
+        uncached._cached_generate_response(MESSAGES)
+        uncached._cached_generate_response(MESSAGES, use_cache=True)
+        uncached._cached_generate_response(MESSAGES, use_cache=True)
+    assert generate.call_count == 2
+
+
+def test_winston_does_not_cache_errors(response_cache):
+    error = {
+        'type': 'answer',
+        'content': {'message': 'Error generating response: boom, None', 'reason': 'Error during response generation'},
+        'process': {'tools_used': [], 'reasoning': '', 'steps_taken': [], 'execution_summary': []}
+    }
+    winston = Winston.model_construct(model_id="test-model", cache_responses=True)
+    with patch.object(Winston, "_generate_response", return_value=error) as generate:
+        winston._cached_generate_response(MESSAGES)
+        winston._cached_generate_response(MESSAGES)
+    assert generate.call_count == 2
+    assert response_cache.stats()["memory_entries"] == 0
@@ -0,0 +1,271 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from utils.stream_json import PlanStepParser
+from objects.models.winston import Winston
+from objects.models.vincent import Vincent
+from objects.prompts.tools import ToolsPrompt
+from tools.return_type import ToolResult
+
+
+STEPS = [
+    {"step": 1, "tool": "test-tool", "input": {"query": "a } ] \"steps\": [", "nested": [1, {"x": 2}]}, "reason": "r"},
+    {"step": 2, "tool": "test-tool", "input": {"query": "{{1}}", "steps": [{"step": 9}]}, "required_for_response": True},
+]
+
+PLAN_TEXT = "Here is the plan:\n```json\n" + json.dumps(
+    {"result": {"type": "plan", "content": {"steps": STEPS}}}, indent=2
+) + "\n```"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, len(PLAN_TEXT)])
+def test_parser_returns_each_step_once_complete(chunk_size):
+    parser = PlanStepParser()
+    completed = []
+    for start in range(0, len(PLAN_TEXT), chunk_size):
+        completed.extend(parser.feed(PLAN_TEXT[start:start + chunk_size]))
+    assert completed == STEPS
+    assert parser.done
+    assert parser.text == PLAN_TEXT
+
+
+def test_parser_returns_a_step_before_the_plan_ends():
+    parser = PlanStepParser()
+    first_step_end = PLAN_TEXT.index('}', PLAN_TEXT.index('"reason": "r"')) + 1
+    assert parser.feed(PLAN_TEXT[:first_step_end]) == STEPS[:1]
+    assert parser.feed(PLAN_TEXT[first_step_end:]) == STEPS[1:]
+
+
+def test_parser_ignores_answers_and_invalid_steps():
+    answer = json.dumps({"result": {"type": "answer", "content": {"message": "No steps here", "reason": "r"}}})
+    assert PlanStepParser().feed(answer) == []
+    assert PlanStepParser().feed('{"steps": [{"step": 1, "flag": True}, {"step": 2}]}') == [{"step": 2}]
+
+
+@pytest.fixture
+def vincent():
+    return Vincent(tools_prompt=ToolsPrompt([{
+        'function': {
+            'name': 'test-tool',
+            'description': 'A test tool',
+            'parameters': {'properties': {'query': {'type': 'string', 'description': 'Query'}}}
+        }
+    }]))
+
+
+def test_execute_stream_starts_steps_before_the_plan_is_complete(vincent):
+    step_queue = queue.Queue()
+    first_step_ran = threading.Event()
+
+    def tool(tool_name, processed_input, step_outputs):
+        first_step_ran.set()
+        return ToolResult.ok(str(processed_input))
+
+    def produce():
+        step_queue.put({"step": 1, "tool": "test-tool", "input": "a"})
+        # The second step only arrives once the first has run
+        assert first_step_ran.wait(timeout=5)
+        step_queue.put({"step": 2, "tool": "test-tool", "input": "{{1}}b", "required_for_response": True})
+        step_queue.put(None)
+
+    with patch.object(Vincent, '_execute_tool', side_effect=tool):
+        producer = threading.Thread(target=produce)
+        producer.start()
+        result = vincent.execute_stream(step_queue)
+        producer.join()
+
+    assert result.completed
+    assert result.outputs == ["Step 1: a", "Step 2: ab"]
+    assert result.required_outputs == ["Step 2: ab"]
+
+
+def test_execute_stream_reports_steps_after_a_failure(vincent):
+    step_queue = Vincent._queued([
+        {"step": 1, "tool": "test-tool", "input": "a"},
+        {"step": 2, "tool": "test-tool", "input": "{{1}}"},
+    ])
+    with patch.object(Vincent, '_execute_tool', return_value=ToolResult.err("boom")):
+        result = vincent.execute_stream(step_queue)
+    assert not result.completed
+    assert result.failure_step == 1
+    assert result.outputs == ["Step 1: Error: boom", "Step 2: Not executed due to previous failure at step 1"]
+
+
+@pytest.mark.asyncio
+async def test_aexecute_stream_overlaps_arrival_and_execution(vincent):
+    step_queue = queue.Queue()
+
+    async def slow_tool(tool_name, processed_input, step_outputs):
+        await asyncio.sleep(0.2)
+        return ToolResult.ok(processed_input.upper())
+
+    def produce():
+        step_queue.put({"step": 1, "tool": "test-tool", "input": "a"})
+        time.sleep(0.2)
+        step_queue.put({"step": 2, "tool": "test-tool", "input": "b"})
+        step_queue.put(None)
+
+    with patch.object(Vincent, '_aexecute_tool', side_effect=slow_tool):
+        started = time.perf_counter()
+        producer = threading.Thread(target=produce)
+        producer.start()
+        result = await vincent.aexecute_stream(step_queue)
+        elapsed = time.perf_counter() - started
+        producer.join()
+
+    assert result.outputs == ["Step 1: A", "Step 2: B"]
+    # Step 1 runs while step 2 is still being generated
+    assert elapsed < 0.55
+
+
+def bedrock_stream(text, chunk_size=16):
+    events = [{'chunk': {'bytes': json.dumps({'type': 'message_start', 'message': {'usage': {'input_tokens': 5}}}).encode()}}]
+    for start in range(0, len(text), chunk_size):
+        delta = {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': text[start:start + chunk_size]}}
+        events.append({'chunk': {'bytes': json.dumps(delta).encode()}})
+    events.append({'chunk': {'bytes': json.dumps({'type': 'message_stop'}).encode()}})
+    return {'body': iter(events)}
+
+
+@pytest.fixture
+def winston(vincent):
+    return Winston.model_construct(
+        model_id="test-model",
+        streaming=True,
+        bedrock_client=MagicMock(),
+        vincent=vincent,
+        prompt_cache_usage={}
+    )
+
+
+def test_streaming_executes_plan_steps_as_they_arrive(winston):
+    winston.bedrock_client.invoke_model_with_response_stream.return_value = bedrock_stream(PLAN_TEXT)
+    with patch.object(Vincent, '_execute_tool', return_value=ToolResult.ok("done")) as execute_tool, \
+         patch.object(Vincent, 'execute') as execute:
+        response, executed = winston._stream_plan_or_answer("Plan something", use_cache=False)
+
+    assert response['type'] == 'plan'
+    assert response['content']['steps'] == STEPS
+    assert execute_tool.call_count == 2
+    execute.assert_not_called()
+    assert executed['process']['execution_summary'] == [
+        "Plan execution completed successfully.",
+        "Step 1 (test-tool): Step 1: done",
+        "Step 2 (test-tool): Step 2: done",
+    ]
+    request = json.loads(winston.bedrock_client.invoke_model_with_response_stream.call_args.kwargs['body'])
+    assert request['system'][0]['type'] == 'text'
+    assert request['messages'] == [{'role': 'user', 'content': 'Plan something'}]
+
+
+def test_streaming_answers_run_nothing(winston):
+    answer = json.dumps({"result": {"type": "answer", "content": {"message": "Hi", "reason": "Greeting"}}})
+    winston.bedrock_client.invoke_model_with_response_stream.return_value = bedrock_stream(answer)
+    with patch.object(Vincent, '_execute_tool') as execute_tool:
+        response, executed = winston._stream_plan_or_answer("Hello", use_cache=False)
+    assert response['content']['message'] == "Hi"
+    assert executed is None
+    execute_tool.assert_not_called()
+
+
+def test_streaming_errors_are_reported_as_answers(winston):
+    winston.bedrock_client.invoke_model_with_response_stream.side_effect = RuntimeError("throttled")
+    response, executed = winston._stream_plan_or_answer("Hello", use_cache=False)
+    assert response['content']['reason'] == 'Error during response generation'
+    assert "throttled" in response['content']['message']
+    assert executed is None
+
+
+def plan_response(steps):
+    return {"type": "plan", "content": {"steps": steps}, "process": {"execution_summary": []}}
+
+
+def test_streaming_reruns_only_the_steps_that_changed(winston):
+    streamed = [
+        {"step": 1, "tool": "test-tool", "input": "a"},
+        {"step": 2, "tool": "test-tool", "input": "{{1}}b"},
+        {"step": 3, "tool": "test-tool", "input": "{{2}}d"},
+    ]
+    final = [streamed[0], {"step": 2, "tool": "test-tool", "input": "{{1}}c"}, streamed[2]]
+
+    def generate(messages, on_step):
+        for step in streamed:
+            on_step(step)
+        return plan_response(final)
+
+    calls = []
+
+    def tool(tool_name, processed_input, step_outputs):
+        calls.append(processed_input)
+        return ToolResult.ok(processed_input.upper())
+
+    with patch.object(Winston, '_generate_streaming_response', side_effect=generate), \
+         patch.object(Vincent, '_execute_tool', side_effect=tool):
+        response, executed = winston._stream_plan_or_answer("Plan something", use_cache=False)
+
+    # Step 1 is reused; step 2 changed, so it and step 3, which uses its output, run again
+    assert {call: calls.count(call) for call in calls} == {"a": 1, "Ab": 1, "ABd": 1, "Ac": 1, "ACd": 1}
+    assert executed['process']['execution_summary'] == [
+        "Plan execution completed successfully.",
+        "Step 1 (test-tool): Step 1: A",
+        "Step 2 (test-tool): Step 2: AC",
+        "Step 3 (test-tool): Step 3: ACD",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_astreaming_reuses_steps_that_did_not_change(winston):
+    streamed = [
+        {"step": 1, "tool": "test-tool", "input": "a"},
+        {"step": 2, "tool": "test-tool", "input": "b"},
+    ]
+    final = [streamed[0], {"step": 2, "tool": "test-tool", "input": "c"}]
+
+    def generate(messages, on_step):
+        for step in streamed:
+            on_step(step)
+        return plan_response(final)
+
+    calls = []
+
+    async def tool(tool_name, processed_input, step_outputs):
+        calls.append(processed_input)
+        return ToolResult.ok(processed_input.upper())
+
+    with patch.object(Winston, '_generate_streaming_response', side_effect=generate), \
+         patch.object(Vincent, '_aexecute_tool', side_effect=tool):
+        response, executed = await winston._astream_plan_or_answer("Plan something", use_cache=False)
+
+    assert sorted(calls) == ["a", "b", "c"]
+    assert executed['process']['execution_summary'][1:] == [
+        "Step 1 (test-tool): Step 1: A",
+        "Step 2 (test-tool): Step 2: C",
+    ]
+
+
+def test_streaming_records_steps_run_before_generation_failed(winston):
+    def generate(messages, on_step):
+        on_step({"step": 1, "tool": "test-tool", "input": "a"})
+        return Winston._error_response(RuntimeError("stream closed"), "partial")
+
+    with patch.object(Winston, '_generate_streaming_response', side_effect=generate), \
+         patch.object(Vincent, '_execute_tool', return_value=ToolResult.ok("done")) as execute_tool, \
+         patch.object(Vincent, 'execute') as execute:
+        response, executed = winston._stream_plan_or_answer("Plan something", use_cache=False)
+
+    assert executed is None
+    assert execute_tool.call_count == 1
+    execute.assert_not_called()
+    assert response['content']['reason'] == 'Error during response generation'
+    assert response['process']['tools_used'] == ["test-tool"]
+    assert response['process']['steps_taken'][0]['output'] == "Step 1: done"
+    assert response['process']['execution_summary'] == [
+        "Error during response generation: stream closed",
+        "Plan execution completed successfully.",
+        "Step 1 (test-tool): Step 1: done",
+    ]
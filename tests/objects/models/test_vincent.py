@@ -404,4 +404,330 @@ def test_execute_tool_sync_with_dict_input():
         mock_module.sync = sync_tool
         
         result = vincent._execute_tool("test-sync", {"data": "test"})
-        assert result == "sync result with test"
\ No newline at end of file
+        assert result == "sync result with test"
+
+def test_step_dependencies_follow_placeholders():
+    """Test that only placeholders to earlier steps become dependencies"""
+    steps = [
+        {"step": 1, "tool": "test-tool", "input": "a"},
+        {"step": 2, "tool": "test-tool", "input": {"message": "{{1}}", "other": ["{{3}}"]}},
+        {"step": 3, "tool": "test-tool", "input": ["{{1}} and {{2}}"]},
+    ]
+    assert Vincent._step_dependencies(steps) == {1: set(), 2: {1}, 3: {1, 2}}
+
+def test_step_dependencies_accept_string_step_numbers():
+    """Test that string step numbers resolve placeholders and unresolvable ones run in order"""
+    steps = [
+        {"step": "1", "tool": "test-tool", "input": "a"},
+        {"step": "2", "tool": "test-tool", "input": "b"},
+        {"step": "3", "tool": "test-tool", "input": "{{1}}"},
+        {"step": "3b", "tool": "test-tool", "input": "c"},
+        {"step": "4", "tool": "test-tool", "input": "{{9}}"},
+    ]
+    assert Vincent._step_dependencies(steps) == {
+        "1": set(),
+        "2": set(),
+        "3": {"1"},
+        "3b": {"1", "2", "3"},
+        "4": {"1", "2", "3", "3b"},
+    }
+
+def test_execute_resolves_string_step_numbers():
+    """Test that a step waits for a string-numbered step it references"""
+    vincent = Vincent(tools_prompt=ToolsPrompt([{'function': {'name': 'test-tool'}}]))
+    plan = {
+        "steps": [
+            {"step": "1", "tool": "test-tool", "input": "a"},
+            {"step": "2", "tool": "test-tool", "input": "{{1}}b", "required_for_response": True},
+        ]
+    }
+
+    def tool(tool_name, processed_input, step_outputs):
+        return ToolResult.ok(processed_input.upper())
+
+    with patch.object(Vincent, '_execute_tool', side_effect=tool):
+        result = vincent.execute(plan)
+
+    assert result.completed
+    assert result.outputs == ["Step 1: A", "Step 2: AB"]
+    assert result.required_outputs == ["Step 2: AB"]
+
+PLAN_WITH_A_LATER_FAST_FAILURE = {
+    "steps": [
+        {"step": 1, "tool": "test-tool", "input": "slow"},
+        {"step": 2, "tool": "test-tool", "input": "{{1}} next"},
+        {"step": 3, "tool": "test-tool", "input": "fail"},
+    ]
+}
+
+def _slow_or_failing_result(processed_input):
+    if processed_input == "fail":
+        return ToolResult.err("boom")
+    if processed_input == "slow":
+        return ToolResult.ok("S")
+    return ToolResult.ok(processed_input)
+
+def test_execute_runs_steps_before_a_later_failure():
+    """Test that a step before a failed step still runs, even if the failure happens first"""
+    import time
+    vincent = Vincent(tools_prompt=ToolsPrompt([{'function': {'name': 'test-tool'}}]))
+
+    def tool(tool_name, processed_input, step_outputs):
+        if processed_input == "slow":
+            time.sleep(0.2)
+        return _slow_or_failing_result(processed_input)
+
+    with patch.object(Vincent, '_execute_tool', side_effect=tool):
+        result = vincent.execute(PLAN_WITH_A_LATER_FAST_FAILURE)
+
+    assert result.outputs == ["Step 1: S", "Step 2: S next", "Step 3: Error: boom"]
+    assert result.failure_step == 3
+
+@pytest.mark.asyncio
+async def test_aexecute_runs_steps_before_a_later_failure():
+    """Test that aexecute also runs steps that come before a failed step"""
+    vincent = Vincent(tools_prompt=ToolsPrompt([{'function': {'name': 'test-tool'}}]))
+
+    async def tool(tool_name, processed_input, step_outputs):
+        if processed_input == "slow":
+            await asyncio.sleep(0.2)
+        return _slow_or_failing_result(processed_input)
+
+    with patch.object(Vincent, '_aexecute_tool', side_effect=tool):
+        result = await vincent.aexecute(PLAN_WITH_A_LATER_FAST_FAILURE)
+
+    assert result.outputs == ["Step 1: S", "Step 2: S next", "Step 3: Error: boom"]
+    assert result.failure_step == 3
+
+def test_execute_runs_independent_steps_concurrently():
+    """Test that independent steps overlap while dependent steps wait for their inputs"""
+    import threading
+    import time
+    vincent = Vincent(tools_prompt=ToolsPrompt([{'function': {'name': 'test-tool'}}]))
+    plan = {
+        "steps": [
+            {"step": 1, "tool": "test-tool", "input": "a"},
+            {"step": 2, "tool": "test-tool", "input": "b"},
+            {"step": 3, "tool": "test-tool", "input": "c"},
+            {"step": 4, "tool": "test-tool", "input": "{{1}}+{{3}}"},
+        ]
+    }
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_tool(tool_name, processed_input, step_outputs):
+        with lock:
+            active.append(processed_input)
+            peak.append(len(active))
+        time.sleep(0.2)
+        with lock:
+            active.remove(processed_input)
+        return ToolResult.ok(processed_input.upper())
+
+    with patch.object(Vincent, '_execute_tool', side_effect=slow_tool):
+        started = time.perf_counter()
+        result = vincent.execute(plan)
+        elapsed = time.perf_counter() - started
+
+    assert result.completed
+    assert result.outputs == ["Step 1: A", "Step 2: B", "Step 3: C", "Step 4: A+C"]
+    assert max(peak) == 3
+    assert elapsed < 0.6
+
+def test_execute_failure_stops_later_steps():
+    """Test that steps after a failure are reported as not executed"""
+    vincent = Vincent(tools_prompt=ToolsPrompt([{'function': {'name': 'test-tool'}}]))
+    plan = {
+        "steps": [
+            {"step": 1, "tool": "test-tool", "input": "ok"},
+            {"step": 2, "tool": "test-tool", "input": "fail"},
+            {"step": 3, "tool": "test-tool", "input": "{{2}}", "required_for_response": True},
+        ]
+    }
+
+    def tool(tool_name, processed_input, step_outputs):
+        return ToolResult.err("boom") if processed_input == "fail" else ToolResult.ok(processed_input)
+
+    with patch.object(Vincent, '_execute_tool', side_effect=tool):
+        result = vincent.execute(plan)
+
+    assert not result.completed
+    assert result.failure_step == 2
+    assert result.outputs == [
+        "Step 1: ok",
+        "Step 2: Error: boom",
+        "Step 3: Not executed due to previous failure at step 2",
+    ]
+    assert result.required_outputs == ["Step 3: Not executed due to previous failure at step 2"]
+    assert result.tools == ["test-tool"]
+
+@pytest.mark.asyncio
+async def test_aexecute_runs_independent_steps_concurrently():
+    """Test that aexecute overlaps independent steps on the running loop"""
+    import time
+    vincent = Vincent(tools_prompt=ToolsPrompt([{'function': {'name': 'test-tool'}}]))
+    plan = {
+        "steps": [
+            {"step": 1, "tool": "test-tool", "input": "a"},
+            {"step": 2, "tool": "test-tool", "input": "b"},
+            {"step": 3, "tool": "test-tool", "input": "{{1}}{{2}}", "required_for_response": True},
+        ]
+    }
+
+    async def slow_tool(tool_name, processed_input, step_outputs):
+        await asyncio.sleep(0.2)
+        return ToolResult.ok(processed_input.upper())
+
+    with patch.object(Vincent, '_aexecute_tool', side_effect=slow_tool):
+        started = time.perf_counter()
+        result = await vincent.aexecute(plan)
+        elapsed = time.perf_counter() - started
+
+    assert result.completed
+    assert result.outputs == ["Step 1: A", "Step 2: B", "Step 3: AB"]
+    assert result.required_outputs == ["Step 3: AB"]
+    assert elapsed < 0.55
+
+@pytest.mark.asyncio
+async def test_aexecute_tool_awaits_async_and_offloads_sync_tools():
+    """Test that _aexecute_tool awaits coroutine tools and runs sync tools off the loop"""
+    import threading
+    vincent = Vincent(tools_prompt=ToolsPrompt([
+        {'function': {'name': 'test-async'}},
+        {'function': {'name': 'test-sync'}},
+    ]))
+    loop_thread = threading.get_ident()
+
+    async def async_tool(**kwargs):
+        return ToolResult.ok(threading.get_ident())
+
+    def sync_tool(**kwargs):
+        return ToolResult.ok(threading.get_ident())
+
+    with patch('importlib.import_module') as mock_import:
+        mock_module = Mock()
+        mock_import.return_value = mock_module
+        mock_module.async_fn = async_tool
+        mock_module.sync = sync_tool
+
+        async_result = await vincent._aexecute_tool("test-async", {"data": "x"})
+        sync_result = await vincent._aexecute_tool("test-sync", {"data": "x"})
+
+    assert async_result.data == loop_thread
+    assert sync_result.data != loop_thread
+
+@pytest.mark.asyncio
+async def test_aexecute_tool_not_found():
+    vincent = Vincent()
+    result = await vincent._aexecute_tool("nonexistent-tool")
+    assert result.error == "Error: Tool 'nonexistent-tool' not found"
+
+def test_dispatch_table_resolves_tools_once():
+    """Test that registered tools are resolved at construction, not per call"""
+    def sync_tool(**kwargs):
+        return ToolResult.ok(kwargs['data'])
+
+    with patch('importlib.import_module') as mock_import:
+        mock_module = Mock()
+        mock_import.return_value = mock_module
+        mock_module.sync = sync_tool
+        vincent = Vincent(tools_prompt=ToolsPrompt([{'function': {'name': 'test-sync'}}]))
+
+    assert vincent._dispatch_table['test-sync'].function is sync_tool
+    assert not vincent._dispatch_table['test-sync'].is_async
+    with patch('importlib.import_module') as mock_import:
+        result = vincent._execute_tool("test-sync", {"data": "x"})
+        mock_import.assert_not_called()
+    assert result.data == "x"
+
+def test_execute_tool_memoizes_cacheable_tools():
+    """Test that tools declaring a cache TTL run once per distinct arguments"""
+    from objects.models.vincent import _TOOL_RESULT_CACHE
+    _TOOL_RESULT_CACHE.clear()
+    calls = []
+
+    def sync_tool(**kwargs):
+        calls.append(kwargs)
+        return ToolResult.ok(kwargs['a'] + kwargs['b'])
+
+    with patch('importlib.import_module') as mock_import:
+        mock_module = Mock()
+        mock_import.return_value = mock_module
+        mock_module.sync = sync_tool
+        vincent = Vincent(tools_prompt=ToolsPrompt([{'cache': {'ttl': 60}, 'function': {'name': 'test-sync'}}]))
+
+    assert vincent._execute_tool("test-sync", {"a": 1, "b": 2}).data == 3
+    assert vincent._execute_tool("test-sync", {"b": 2, "a": 1}).data == 3
+    assert vincent._execute_tool("test-sync", {"a": 2, "b": 2}).data == 4
+    assert len(calls) == 2
+    _TOOL_RESULT_CACHE.clear()
+
+def test_execute_tool_cache_bypass_and_errors():
+    """Test that bypassed arguments and failed results are never served from the cache"""
+    from objects.models.vincent import _TOOL_RESULT_CACHE
+    _TOOL_RESULT_CACHE.clear()
+    calls = []
+
+    def sync_tool(**kwargs):
+        calls.append(kwargs)
+        if kwargs['depth'] == "bad":
+            return ToolResult.err("bad depth")
+        return ToolResult.ok(len(calls))
+
+    tool = {'cache': {'ttl': 60, 'bypass': {'depth': ['deep']}}, 'function': {'name': 'test-sync'}}
+    with patch('importlib.import_module') as mock_import:
+        mock_module = Mock()
+        mock_import.return_value = mock_module
+        mock_module.sync = sync_tool
+        vincent = Vincent(tools_prompt=ToolsPrompt([tool]))
+
+    for depth in ["deep", "deep", "bad", "bad", "standard", "standard"]:
+        vincent._execute_tool("test-sync", {"depth": depth})
+    assert [call['depth'] for call in calls] == ["deep", "deep", "bad", "bad", "standard"]
+    _TOOL_RESULT_CACHE.clear()
+
+def test_execute_tool_memoizes_coroutine_results_and_returns_copies():
+    """Test that coroutines returned inside a running loop are cached once awaited, and hits are copies"""
+    from objects.models.vincent import _TOOL_RESULT_CACHE
+    _TOOL_RESULT_CACHE.clear()
+    calls = []
+
+    async def async_tool(**kwargs):
+        calls.append(kwargs)
+        return ToolResult.ok({"items": [kwargs['a']]})
+
+    with patch('importlib.import_module') as mock_import:
+        mock_module = Mock()
+        mock_import.return_value = mock_module
+        mock_module.async_tool = async_tool
+        vincent = Vincent(tools_prompt=ToolsPrompt([{'cache': {'ttl': 60}, 'function': {'name': 'test-async_tool'}}]))
+
+    async def run():
+        first = await vincent._execute_tool("test-async_tool", {"a": 1})
+        first.data["items"].append("mutated")
+        second = vincent._execute_tool("test-async_tool", {"a": 1})
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert isinstance(second, ToolResult)
+    assert second.data == {"items": [1]}
+    assert second is not first
+    assert len(calls) == 1
+    _TOOL_RESULT_CACHE.clear()
+
+def test_tool_result_cache_lru_and_ttl():
+    """Test that the result cache evicts least recently used entries and expires stale ones"""
+    from utils.tool_cache import ToolResultCache
+    cache = ToolResultCache(max_entries=2)
+    keys = [cache.make_key("test-tool", {"n": n}) for n in range(3)]
+    cache.put(keys[0], "zero", ttl=60)
+    cache.put(keys[1], "one", ttl=60)
+    assert cache.get(keys[0]) == "zero"
+    cache.put(keys[2], "two", ttl=60)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "zero"
+
+    with patch('utils.tool_cache.time.monotonic', return_value=float('inf')):
+        assert cache.get(keys[2]) is None
+    assert cache.stats()["entries"] == 1
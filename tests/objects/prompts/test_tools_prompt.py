@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import patch
+
+from objects.prompts.tools import ToolsPrompt
+
+
+def make_tool(name: str, description: str = "A test tool"):
+    return {
+        'function': {
+            'name': name,
+            'description': description,
+            'parameters': {
+                'properties': {
+                    'mode': {'type': 'string', 'description': 'Mode', 'enum': ['fast', 'slow'], 'default': 'fast'}
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def prompt():
+    return ToolsPrompt(tools=[make_tool("test-one"), make_tool("test-two")])
+
+
+def test_descriptions_render_every_tool(prompt):
+    descriptions = prompt.get_tools_descriptions()
+    assert descriptions.startswith("1. **test-one(mode)**")
+    assert "2. **test-two(mode)**" in descriptions
+    assert "Options: ['fast', 'slow']" in descriptions
+    assert 'Default: "fast"' in descriptions
+
+
+def test_descriptions_render_once_per_tool_set(prompt):
+    with patch.object(ToolsPrompt, "render_tools_descriptions", wraps=prompt.render_tools_descriptions) as render:
+        first = prompt.get_tools_descriptions()
+        version = prompt.tools_version
+        assert prompt.get_tools_descriptions() is first
+        assert render.call_count == 1
+
+        prompt.tools = [make_tool("test-one")]
+        assert "test-two" not in prompt.get_tools_descriptions()
+        assert prompt.tools_version != version
+        assert render.call_count == 2
+
+
+def test_version_tracks_schemas(prompt):
+    same = ToolsPrompt(tools=[make_tool("test-one"), make_tool("test-two")])
+    assert same.tools_version == prompt.tools_version
+
+    version = prompt.tools_version
+    prompt.tools[0]['function']['description'] = "Edited in place"
+    assert prompt.tools_version == version
+    prompt.invalidate()
+    assert prompt.tools_version != version
+    assert "Edited in place" in prompt.get_tools_descriptions()
+
+
+def test_appending_a_tool_re_renders(prompt):
+    prompt.get_tools_descriptions()
+    prompt.tools.append(make_tool("test-three"))
+    assert "3. **test-three(mode)**" in prompt.get_tools_descriptions()
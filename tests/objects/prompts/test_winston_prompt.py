@@ -0,0 +1,23 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from objects.prompts.winston import WinstonPlanAnswerPrompt
+
+
+FIXED_NOW = datetime(2026, 1, 2)
+
+
+def test_system_blocks_hold_the_system_prompt_with_the_date_last():
+    prompt = WinstonPlanAnswerPrompt()
+    with patch('objects.prompts.winston.datetime') as mock_datetime:
+        mock_datetime.now.return_value = FIXED_NOW
+        full = prompt.system_prompt("TOOLS")
+        static_block, date_block = prompt.system_blocks("TOOLS")
+
+    assert date_block == "Current date: 2026-01-02 Friday\n"
+    assert full.splitlines()[1] == date_block.strip()
+    assert "Current date" not in static_block
+    assert "TOOLS" in static_block
+    # The same text, with the date line moved from after the introduction to the end
+    assert full == prompt.introduction + date_block + static_block[len(prompt.introduction):]
+    assert "".join([static_block, date_block]) == full.replace(date_block, "", 1) + date_block
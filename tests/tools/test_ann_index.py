@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from tools.ann_index import IVFIndex, make_index
+from tools.vector_store import VectorStore
+
+
+def _clustered(rows, dimension=16, clusters=8, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dimension))
+    embeddings = centres[rng.integers(0, clusters, rows)] + 0.1 * rng.standard_normal((rows, dimension))
+    return (embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _store(embeddings, index=None):
+    store = VectorStore(embeddings.shape[1], index=index)
+    store.add_batch([str(i) for i in range(len(embeddings))], list(range(len(embeddings))), embeddings)
+    return store
+
+
+def test_ivf_with_all_lists_probed_matches_exact():
+    """Test that probing every list reproduces the exact results."""
+    embeddings = _clustered(500)
+    exact = _store(embeddings)
+    ivf = _store(embeddings, IVFIndex(n_lists=10, n_probe=10))
+
+    for query in embeddings[:20]:
+        assert [r["chunk_id"] for r in ivf.search(query, 5)] == [r["chunk_id"] for r in exact.search(query, 5)]
+
+
+def test_ivf_recall_on_clustered_data():
+    """Test that a few probes already recover the nearest neighbour."""
+    embeddings = _clustered(2000)
+    ivf = _store(embeddings, IVFIndex(n_lists=16, n_probe=2))
+
+    hits = sum(ivf.search(query, 1)[0]["chunk_id"] == i for i, query in enumerate(embeddings[:100]))
+    assert hits >= 95
+
+
+def test_ivf_tracks_appends_and_tombstones():
+    """Test that rows added after the build are searchable and tombstoned rows are not."""
+    embeddings = _clustered(300)
+    store = _store(embeddings[:200], IVFIndex(n_lists=8, n_probe=8))
+    store.add_batch(["new"], [999], embeddings[250:251])
+    assert store.search(embeddings[250], 1)[0]["chunk_id"] == 999
+
+    store.tombstone([200])
+    assert store.search(embeddings[250], 1)[0]["chunk_id"] != 999
+
+
+def test_ivf_trains_once_incremental_adds_fill_its_lists():
+    """Test that rows added one at a time train the index with every list, not on the first row."""
+    embeddings = _clustered(500)
+    store = VectorStore(embeddings.shape[1], index=IVFIndex(n_lists=16, n_probe=2))
+    for i, embedding in enumerate(embeddings):
+        store.add(str(i), i, embedding)
+        if i == 0:
+            # Too few rows to train: search is exhaustive instead of empty
+            assert not store.index.is_trained
+            assert store.search(embedding, 1)[0]["chunk_id"] == 0
+
+    assert len(store.index._lists) == 16
+    hits = sum(store.search(query, 1)[0]["chunk_id"] == i for i, query in enumerate(embeddings[:100]))
+    assert hits >= 95
+
+
+def test_ivf_with_default_lists_retrains_as_rows_grow():
+    """Test that an auto-sized index keeps about sqrt(N) lists while rows are appended."""
+    embeddings = _clustered(2000)
+    store = VectorStore(embeddings.shape[1], index=IVFIndex(n_probe=4))
+    for i, embedding in enumerate(embeddings):
+        store.add(str(i), i, embedding)
+
+    assert len(store.index._lists) >= int(np.sqrt(2000 / store.index.retrain_growth))
+    hits = sum(store.search(query, 1)[0]["chunk_id"] == i for i, query in enumerate(embeddings[:100]))
+    assert hits >= 95
+
+
+def test_make_index():
+    """Test index construction by name."""
+    assert make_index("exact") is None
+    assert isinstance(make_index("ivf", n_probe=4), IVFIndex)
+    with pytest.raises(ValueError):
+        make_index("hnsw")
@@ -0,0 +1,114 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from tools.catalogue import CelestialCatalogue, load_catalogue, TEXT_COLUMNS
+from tools import stellar_locator
+from tools.stellar_locator import CELESTIAL_OBJECTS
+
+
+class TestCelestialCatalogue(unittest.TestCase):
+    def setUp(self):
+        self.catalogue = CelestialCatalogue.from_records(CELESTIAL_OBJECTS)
+
+    def test_columns_mirror_records(self):
+        self.assertEqual(len(self.catalogue), len(CELESTIAL_OBJECTS))
+        for row, obj in enumerate(CELESTIAL_OBJECTS):
+            self.assertEqual(self.catalogue.x[row], obj["coordinates"]["x"])
+            self.assertEqual(self.catalogue.sectors[self.catalogue.sector_codes[row]], obj["coordinates"]["sector"])
+            self.assertEqual(self.catalogue.types[self.catalogue.type_codes[row]], obj["type"])
+            self.assertEqual(bool(self.catalogue.hidden[row]), obj["hidden"])
+            self.assertIs(self.catalogue.record(row), obj)
+
+    def test_mask_matches_dict_filter(self):
+        mask = self.catalogue.mask(sector="A7", quadrant="NE", hidden=False)
+        expected = [
+            row for row, obj in enumerate(CELESTIAL_OBJECTS)
+            if obj["coordinates"]["sector"] == "A7" and obj["coordinates"]["quadrant"] == "NE" and not obj["hidden"]
+        ]
+        self.assertEqual(np.flatnonzero(mask).tolist(), expected)
+        self.assertFalse(self.catalogue.mask(sector="no such sector").any())
+        self.assertTrue(self.catalogue.mask().all())
+
+
+    def test_find_by_id_or_name(self):
+        self.assertEqual(self.catalogue.find("p002"), 1)
+        self.assertEqual(self.catalogue.find("NEW TERRA"), 0)
+        self.assertIsNone(self.catalogue.find("Nowhere"))
+        hidden_row = int(np.flatnonzero(self.catalogue.hidden)[0])
+        self.assertIsNone(self.catalogue.find(CELESTIAL_OBJECTS[hidden_row]["id"]))
+
+    def assert_matches_records(self, catalogue):
+        self.assertEqual(len(catalogue), len(CELESTIAL_OBJECTS))
+        self.assertEqual([catalogue.record(row) for row in range(len(catalogue))], CELESTIAL_OBJECTS)
+
+    def test_binary_round_trip_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.catalogue.save(directory)
+            loaded = load_catalogue(directory)
+            self.assertIsInstance(loaded.x, np.memmap)
+            self.assert_matches_records(loaded)
+            np.testing.assert_array_equal(loaded.mask(sector="A7"), self.catalogue.mask(sector="A7"))
+
+    def test_jsonl_and_csv_loaders(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jsonl_path = os.path.join(directory, "catalogue.jsonl")
+            with open(jsonl_path, 'w', encoding='utf-8') as f:
+                for obj in CELESTIAL_OBJECTS:
+                    f.write(json.dumps(obj) + "\n")
+            self.assert_matches_records(load_catalogue(jsonl_path))
+
+            csv_path = os.path.join(directory, "catalogue.csv")
+            fields = TEXT_COLUMNS + ("type", "sector", "quadrant", "x", "y", "z", "hidden")
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for obj in CELESTIAL_OBJECTS:
+                    writer.writerow({**{name: obj[name] for name in TEXT_COLUMNS + ("type", "hidden")}, **obj["coordinates"]})
+            self.assert_matches_records(load_catalogue(csv_path))
+
+            with self.assertRaises(ValueError):
+                load_catalogue(os.path.join(directory, "catalogue.xml"))
+
+    def test_tools_run_on_a_loaded_catalogue(self):
+        expected = (
+            stellar_locator.search_by_name(name="terra").data,
+            stellar_locator.locate_celestial_object(coordinates={"sector": "A7", "quadrant": "NE", "x": 453, "y": 127, "z": 89}).data,
+            stellar_locator.scan_region(sector="A7", quadrant="all", scan_depth="ultra").data
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            self.catalogue.save(directory)
+            stellar_locator.use_catalogue(load_catalogue(directory))
+            try:
+                found = (
+                    stellar_locator.search_by_name(name="terra").data,
+                    stellar_locator.locate_celestial_object(coordinates={"sector": "A7", "quadrant": "NE", "x": 453, "y": 127, "z": 89}).data,
+                    stellar_locator.scan_region(sector="A7", quadrant="all", scan_depth="ultra").data
+                )
+            finally:
+                stellar_locator.use_catalogue(CelestialCatalogue.from_records(CELESTIAL_OBJECTS))
+        self.assertEqual(found, expected)
+
+
+    def test_swapping_catalogues_clears_memoized_tool_results(self):
+        from objects.models.vincent import Vincent
+        from objects.prompts.tools import ToolsPrompt
+        from utils.tool_cache import TOOL_RESULT_CACHE
+        schema = stellar_locator.STELLAR_LOCATOR_TOOLS["search_by_name"]
+        vincent = Vincent(tools_prompt=ToolsPrompt([schema]))
+        TOOL_RESULT_CACHE.clear()
+        smaller = CelestialCatalogue.from_records([obj for obj in CELESTIAL_OBJECTS if obj["name"] != "New Terra"])
+        try:
+            before = vincent._execute_tool("stellar_locator-search_by_name", {"name": "New Terra"})
+            stellar_locator.use_catalogue(smaller)
+            after = vincent._execute_tool("stellar_locator-search_by_name", {"name": "New Terra"})
+        finally:
+            stellar_locator.use_catalogue(CelestialCatalogue.from_records(CELESTIAL_OBJECTS))
+            TOOL_RESULT_CACHE.clear()
+        self.assertIn("New Terra", [result["name"] for result in before.data["results"]])
+        self.assertNotIn("New Terra", [result["name"] for result in after.data["results"]])
+
+if __name__ == '__main__':
+    unittest.main()
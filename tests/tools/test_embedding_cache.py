@@ -0,0 +1,49 @@
+import numpy as np
+from tools.embedding_cache import QueryEmbeddingCache, normalize_query
+
+
+def test_normalize_query():
+    """Test that case, whitespace and trailing punctuation are normalised away."""
+    assert normalize_query("  Where is  New Terra?? ") == "where is new terra"
+
+
+def test_lru_eviction_and_counters():
+    """Test the bounded memory tier and hit/miss counters."""
+    cache = QueryEmbeddingCache(max_entries=2)
+    cache.put("a", "model", 2, np.array([1, 0]))
+    cache.put("b", "model", 2, np.array([0, 1]))
+    assert cache.get("a", "model", 2) is not None  # "a" becomes most recent
+    cache.put("c", "model", 2, np.array([1, 1]))  # evicts "b"
+
+    assert cache.get("b", "model", 2) is None
+    assert cache.get("a", "other-model", 2) is None
+    assert cache.stats() == {"memory_hits": 1, "disk_hits": 0, "misses": 2, "memory_entries": 2}
+
+
+def test_get_or_compute_only_computes_on_miss():
+    """Test that the compute function is skipped on hits."""
+    cache = QueryEmbeddingCache()
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return np.array([0.5, 0.5])
+
+    first = cache.get_or_compute("Query", "model", 2, compute)
+    second = cache.get_or_compute("query", "model", 2, compute)
+
+    assert calls == ["Query"]
+    np.testing.assert_array_equal(first, second)
+    assert not second.flags.writeable
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test that a new cache instance reads embeddings persisted by an earlier one."""
+    path = str(tmp_path / "queries.sqlite")
+    QueryEmbeddingCache(disk_path=path).put("query", "model", 3, np.array([1, 2, 3]))
+
+    restarted = QueryEmbeddingCache(disk_path=path)
+    np.testing.assert_array_equal(restarted.get("query", "model", 3), [1, 2, 3])
+    assert restarted.stats()["disk_hits"] == 1
+    assert restarted.get("query", "model", 3) is not None
+    assert restarted.stats()["memory_hits"] == 1
@@ -0,0 +1,78 @@
+import threading
+import pytest
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+from tools.embedding_pipeline import AdaptiveConcurrencyLimiter, EmbeddingPipeline
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "InvokeModel")
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    """Skip backoff sleeps so retries are instant."""
+    with patch('tools.embedding_pipeline.time.sleep'):
+        yield
+
+
+def test_limiter_grows_on_fast_successes_and_halves_on_throttle():
+    """Test the AIMD behaviour of the concurrency limiter."""
+    limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=8, target_latency=1.0)
+    for _ in range(2):
+        limiter.on_success(0.1)
+    assert limiter.limit == 3
+
+    limiter.on_throttle()
+    assert limiter.limit == 1
+    assert limiter.peak_limit == 3
+    assert limiter.throttle_count == 1
+
+
+def test_limiter_shrinks_on_slow_latency():
+    """Test that latency above the target lowers the limit."""
+    limiter = AdaptiveConcurrencyLimiter(initial=4, target_latency=0.5)
+    limiter.on_success(2.0)
+    assert limiter.limit == 3
+
+
+def test_pipeline_retries_throttled_requests():
+    """Test that throttled requests are retried until they succeed."""
+    attempts = {}
+    lock = threading.Lock()
+
+    def embed(text):
+        with lock:
+            attempts[text] = attempts.get(text, 0) + 1
+            if attempts[text] < 3:
+                raise _client_error("ThrottlingException")
+        return len(text)
+
+    pipeline = EmbeddingPipeline(embed, initial_concurrency=2, max_retries=5)
+    embeddings, failures = pipeline.run([(0, "a"), (1, "bb")])
+
+    assert embeddings == {0: 1, 1: 2}
+    assert failures == []
+    assert pipeline.stats()["throttled_requests"] == 4
+
+
+def test_pipeline_reports_failed_chunks():
+    """Test that chunks failing permanently are reported rather than dropped."""
+    def embed(text):
+        if text == "bad":
+            raise ValueError("No embedding found in Bedrock response")
+        if text == "throttled":
+            raise _client_error("ThrottlingException")
+        return text
+
+    pipeline = EmbeddingPipeline(embed, max_retries=2)
+    completed = []
+    embeddings, failures = pipeline.run(
+        [(0, "good"), (1, "bad"), (2, "throttled")],
+        on_result=lambda chunk_id, text, embedding: completed.append(chunk_id)
+    )
+
+    assert embeddings == {0: "good"}
+    assert completed == [0]
+    assert [failure["chunk_id"] for failure in failures] == [1, 2]
+    assert "No embedding found" in failures[0]["error"]
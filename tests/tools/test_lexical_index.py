@@ -0,0 +1,41 @@
+import numpy as np
+
+from tools.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+def test_tokenize_keeps_entity_names():
+    assert tokenize("Sector B3 hosts CHRONOS.") == ["sector", "b3", "hosts", "chronos"]
+
+
+def test_bm25_ranks_rare_terms_higher():
+    """Test that documents matching a rare query term outrank ones matching only a common term."""
+    index = BM25Index()
+    index.add([
+        "the planet is in the sector",
+        "Chronos is a planet in sector B3",
+        "the sector is large",
+    ])
+
+    scores = index.scores("Chronos sector")
+
+    assert int(np.argmax(scores)) == 1
+    assert scores[1] > scores[0] > 0
+    assert np.all(index.scores("unknown") == 0)
+
+
+def test_bm25_add_appends_rows():
+    index = BM25Index()
+    index.add(["alpha"])
+    index.scores("alpha")
+    index.add(["beta alpha"])
+
+    assert len(index) == 2
+    assert np.all(index.scores("alpha") > 0)
+
+
+def test_reciprocal_rank_fusion():
+    """Test that rows ranked well by both lists win."""
+    fused = reciprocal_rank_fusion([np.array([1, 2, 3]), np.array([3, 1])], k=60)
+
+    assert max(fused, key=fused.get) == 1
+    assert fused[3] > fused[2]
@@ -0,0 +1,63 @@
+import pytest
+
+from tools.markdown_chunker import chunk_markdown, embedding_text
+
+
+def test_chunks_carry_their_section_path():
+    """Test that ATX and bold-line headings build a nested section path."""
+    content = (
+        "Preamble paragraph.\n\n"
+        "# Galaxy\n"
+        "- **Chapter 1: Sectors**\n"
+        "    Sector A7 is New Terra.\n\n"
+        "    - **Chronos (B3)**\n"
+        "        Chronos is time-warped.\n\n"
+        "- **Chapter 2: Signals**\n"
+        "    Signals are strange.\n"
+    )
+
+    chunks = chunk_markdown(content)
+
+    assert [(chunk["section_path"], chunk["text"]) for chunk in chunks] == [
+        ([], "Preamble paragraph."),
+        (["Galaxy", "Chapter 1: Sectors"], "Sector A7 is New Terra."),
+        (["Galaxy", "Chapter 1: Sectors", "Chronos (B3)"], "Chronos is time-warped."),
+        (["Galaxy", "Chapter 2: Signals"], "Signals are strange."),
+    ]
+
+
+def test_paragraphs_of_a_section_are_packed_together():
+    content = "# A\nfirst paragraph\n\nsecond paragraph\n\n- a list item\n"
+
+    chunks = chunk_markdown(content)
+
+    assert len(chunks) == 1
+    assert chunks[0]["text"] == "first paragraph second paragraph - a list item"
+
+
+def test_long_sections_are_windowed_with_overlap():
+    """Test that chunks respect max_tokens and repeat the previous chunk's tail."""
+    words = [f"w{i}" for i in range(25)]
+    content = "# Long\n" + " ".join(words[:10]) + "\n\n" + " ".join(words[10:]) + "\n"
+
+    chunks = chunk_markdown(content, max_tokens=10, overlap_tokens=3)
+    chunk_words = [chunk["text"].split() for chunk in chunks]
+
+    assert all(len(window) <= 10 for window in chunk_words)
+    for previous, current in zip(chunk_words, chunk_words[1:]):
+        assert current[:3] == previous[-3:]
+    covered = [word for window in chunk_words for word in window]
+    assert set(covered) == set(words)
+    assert chunk_words[-1][-1] == "w24"
+
+
+def test_invalid_window_sizes():
+    with pytest.raises(ValueError):
+        chunk_markdown("text", max_tokens=0)
+    with pytest.raises(ValueError):
+        chunk_markdown("text", max_tokens=10, overlap_tokens=10)
+
+
+def test_embedding_text_prefixes_section_path():
+    assert embedding_text({"text": "body", "section_path": ["A", "B"]}) == "A > B\nbody"
+    assert embedding_text({"text": "body", "section_path": []}) == "body"
@@ -0,0 +1,57 @@
+import random
+import unittest
+from tools.catalogue import CelestialCatalogue
+from tools.name_index import NameIndex
+from tools.stellar_locator import CELESTIAL_OBJECTS
+
+
+def brute_force_search(objects, query, object_type="any"):
+    return [
+        obj for obj in objects
+        if not obj["hidden"]
+        and (object_type == "any" or obj["type"] == object_type)
+        and query in obj["name"].lower()
+    ]
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex(CelestialCatalogue.from_records(CELESTIAL_OBJECTS))
+
+    def test_search_matches_catalogue_scan(self):
+        names = [obj["name"].lower() for obj in CELESTIAL_OBJECTS]
+        rng = random.Random(0)
+        queries = ["a", "ne", "terra", "new terra", "station", "x", "zz", "-"]
+        for _ in range(200):
+            name = rng.choice(names)
+            start = rng.randrange(len(name))
+            queries.append(name[start:start + rng.randint(1, 8)])
+        for query in queries:
+            for object_type in ["any", "moon", "planet", "unknown"]:
+                self.assertEqual(
+                    [CELESTIAL_OBJECTS[row] for row in self.index.search(query, object_type)],
+                    brute_force_search(CELESTIAL_OBJECTS, query, object_type),
+                    (query, object_type)
+                )
+
+    def test_exact_lookup_and_type_postings(self):
+        self.assertEqual([CELESTIAL_OBJECTS[row]["name"] for row in self.index.exact("new terra")], ["New Terra"])
+        self.assertEqual(self.index.exact("new terra", "moon"), [])
+        self.assertEqual(self.index.exact("no such object"), [])
+
+    def test_short_names_and_hidden_objects(self):
+        objects = [
+            {"name": "Io", "type": "moon", "hidden": False},
+            {"name": "Ion Gate", "type": "station", "hidden": False},
+            {"name": "Iota", "type": "star", "hidden": True},
+        ]
+        for obj in objects:
+            obj["coordinates"] = {"sector": "A1", "quadrant": "NE", "x": 0, "y": 0, "z": 0}
+        index = NameIndex(CelestialCatalogue.from_records(objects))
+        self.assertEqual(index.search("io"), [0, 1])
+        self.assertEqual(index.search("o", "moon"), [0])
+        self.assertEqual(index.search("iota"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import itertools
+import unittest
+import numpy as np
+from tools.route_solver import solve_route, route_length, _nearest_neighbour, EXACT_ROUTE_MAX_STOPS
+from tools.space_calculator import pairwise_distances
+
+
+def brute_force_length(distances, closed):
+    n = len(distances)
+    return min(
+        route_length(distances, [0] + list(rest), closed)
+        for rest in itertools.permutations(range(1, n))
+    )
+
+
+class TestRouteSolver(unittest.TestCase):
+    def test_exact_routes_are_optimal(self):
+        rng = np.random.default_rng(0)
+        for n in range(3, 8):
+            distances = pairwise_distances(rng.uniform(0, 1000, (n, 3)))
+            for closed in (False, True):
+                route, method = solve_route(distances, closed=closed)
+                self.assertEqual(method, "exact")
+                self.assertEqual(route[0], 0)
+                self.assertEqual(sorted(route), list(range(n)))
+                self.assertAlmostEqual(route_length(distances, route, closed), brute_force_length(distances, closed))
+
+    def test_heuristic_route_improves_on_nearest_neighbour(self):
+        rng = np.random.default_rng(1)
+        n = EXACT_ROUTE_MAX_STOPS + 30
+        distances = pairwise_distances(rng.uniform(0, 1000, (n, 3)))
+        for closed in (False, True):
+            route, method = solve_route(distances, closed=closed)
+            self.assertEqual(method, "nearest_neighbour_2opt")
+            self.assertEqual(route[0], 0)
+            self.assertEqual(sorted(route), list(range(n)))
+            self.assertLessEqual(
+                route_length(distances, route, closed),
+                route_length(distances, _nearest_neighbour(distances), closed) + 1e-9
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
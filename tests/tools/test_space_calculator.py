@@ -3,7 +3,12 @@ from unittest.mock import patch, MagicMock
 from tools.space_calculator import (
     calculate_distance,
     calculate_gravity,
-    calculate_travel_time
+    calculate_travel_time,
+    calculate_distance_batch,
+    calculate_distance_matrix,
+    calculate_gravity_batch,
+    calculate_travel_time_batch,
+    plan_route
 )
 from tools.return_type import ToolResult
 
@@ -97,6 +102,73 @@ class TestSpaceCalculator(unittest.TestCase):
         self.assertFalse(result.success)
         self.assertEqual(result.error, "Error: Speed must be greater than zero")
 
+    def test_calculate_distance_batch_matches_scalar(self):
+        # A single current coordinate is paired with every object coordinate
+        origin = {"x": 1, "y": 2, "z": 3}
+        objects = [{"x": 4, "y": 6, "z": 3}, {"x": -5, "y": 0, "z": 10}, {"x": 1, "y": 2, "z": 3}]
+        result = calculate_distance_batch(current_coordinates=[origin], object_coordinates=objects, unit="km")
+        self.assertTrue(result.success)
+        for i, obj in enumerate(objects):
+            expected = calculate_distance(current_coordinates=origin, object_coordinates=obj, unit="km").data
+            self.assertEqual(result.data["distances"][i], expected["distance"])
+            self.assertEqual(result.data["vectors"][i], expected["vector"])
+
+    def test_calculate_distance_batch_invalid_input(self):
+        points = [{"x": 0, "y": 0, "z": 0}] * 2
+        self.assertIn("Unsupported unit", calculate_distance_batch(current_coordinates=points, object_coordinates=points, unit="pc").error)
+        result = calculate_distance_batch(current_coordinates=points, object_coordinates=points * 2, unit="km")
+        self.assertFalse(result.success)
+
+    def test_calculate_distance_matrix(self):
+        result = calculate_distance_matrix(
+            coordinates=[{"x": 0, "y": 0, "z": 0}, {"x": 3, "y": 4, "z": 0}, {"x": 0, "y": 0, "z": 149597870.7}],
+            unit="au"
+        )
+        self.assertTrue(result.success)
+        matrix = result.data["distances"]
+        self.assertEqual(matrix[0][2], 1.0)
+        self.assertEqual(matrix[2][0], 1.0)
+        self.assertEqual([matrix[i][i] for i in range(3)], [0.0, 0.0, 0.0])
+
+    def test_calculate_gravity_batch_matches_scalar(self):
+        result = calculate_gravity_batch(spacecraft_mass=420000, object_masses=[5.97e24, 7.35e22], distances=[6771000, 384400000])
+        self.assertTrue(result.success)
+        expected = calculate_gravity(spacecraft_mass=420000, object_mass=7.35e22, distance=384400000).data
+        self.assertEqual(result.data["forces_newtons"][1], expected["force_newtons"])
+        self.assertFalse(calculate_gravity_batch(spacecraft_mass=1, object_masses=[1, 2], distances=[1]).success)
+
+    def test_calculate_travel_time_batch_matches_scalar(self):
+        result = calculate_travel_time_batch(distances=[300000, 1000], speed=100)
+        self.assertTrue(result.success)
+        self.assertEqual(result.data["times"][0], calculate_travel_time(distance=300000, speed=100).data)
+        self.assertEqual(result.data["total"]["seconds"], 3010)
+        self.assertEqual(calculate_travel_time_batch(distances=[1], speed=0).error, "Error: Speed must be greater than zero")
+
+    def test_plan_route(self):
+        result = plan_route(stops=["Silent Orbiter", "New Terra", "m002", "Nexus Station"], speed=100, return_to_start=True)
+        self.assertTrue(result.success)
+        self.assertEqual(result.data["order"][0], "Silent Orbiter")
+        self.assertEqual(result.data["order"][-1], "Silent Orbiter")
+        self.assertEqual(len(result.data["legs"]), 4)
+        total = sum(leg["distance_km"] for leg in result.data["legs"])
+        self.assertAlmostEqual(result.data["total_distance_km"], total, places=2)
+        self.assertEqual(
+            result.data["total_travel_time"],
+            calculate_travel_time(distance=result.data["total_distance_km"], speed=100).data
+        )
+
+    def test_plan_route_invalid_input(self):
+        self.assertEqual(plan_route(stops=["New Terra", "Nowhere"], speed=100).error, "Error: Unknown celestial object: Nowhere")
+        self.assertFalse(plan_route(stops=["New Terra"], speed=100).success)
+        self.assertFalse(plan_route(stops=["New Terra", "Nexus Station"], speed=0).success)
+
+    def test_plan_route_rejects_stops_in_different_quadrants(self):
+        result = plan_route(stops=["New Terra", "Chronos"], speed=100)
+        self.assertFalse(result.success)
+        self.assertEqual(
+            result.error,
+            "Error: Stops span several sectors or quadrants (A7 NE, B3 SW); routes can only be planned within one"
+        )
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+import math
+import random
+import unittest
+import numpy as np
+from tools.catalogue import CelestialCatalogue
+from tools.spatial_index import GridIndex, CatalogueSpatialIndex
+from tools.stellar_locator import CELESTIAL_OBJECTS, locate_celestial_object
+
+
+def brute_force_nearest(objects, sector, x, y, z, k):
+    distances = []
+    for obj in objects:
+        c = obj["coordinates"]
+        if obj["hidden"] or c["sector"] != sector:
+            continue
+        distances.append((math.sqrt((c["x"] - x)**2 + (c["y"] - y)**2 + (c["z"] - z)**2), obj))
+    distances.sort(key=lambda pair: pair[0])
+    return distances[:k]
+
+
+def random_objects(count, rng):
+    return [
+        {
+            "name": f"obj{i}",
+            "type": "star",
+            "hidden": rng.random() < 0.1,
+            "coordinates": {
+                "sector": rng.choice(["A1", "B2"]),
+                "quadrant": rng.choice(["NE", "NW", "SE", "SW"]),
+                "x": rng.randint(0, 999), "y": rng.randint(0, 999), "z": rng.randint(0, 999)
+            }
+        }
+        for i in range(count)
+    ]
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(0)
+        objects = random_objects(3000, rng)
+        index = CatalogueSpatialIndex(CelestialCatalogue.from_records(objects), cell_size=16)
+        for _ in range(100):
+            x, y, z = rng.randint(0, 999), rng.randint(0, 999), rng.randint(0, 999)
+            expected = brute_force_nearest(objects, "A1", x, y, z, 3)
+            found = index.nearest("A1", x, y, z, 3)
+            self.assertEqual([objects[row]["name"] for _, row in found], [obj["name"] for _, obj in expected])
+            self.assertEqual([d for d, _ in found], [d for d, _ in expected])
+
+    def test_find_at_returns_first_visible_match_in_catalogue_order(self):
+        objects = [
+            {"name": "hidden", "type": "star", "hidden": True, "coordinates": {"sector": "A1", "quadrant": "NE", "x": 10, "y": 10, "z": 10}},
+            {"name": "first", "type": "star", "hidden": False, "coordinates": {"sector": "A1", "quadrant": "NE", "x": 31, "y": 10, "z": 10}},
+            {"name": "second", "type": "star", "hidden": False, "coordinates": {"sector": "A1", "quadrant": "NE", "x": 12, "y": 10, "z": 10}},
+        ]
+        index = CatalogueSpatialIndex(CelestialCatalogue.from_records(objects), cell_size=32)
+        self.assertEqual(index.find_at("A1", "NE", 10, 10, 10, tolerance=2), 2)
+        # The tolerance box straddles the cell boundary at x=32
+        self.assertEqual(index.find_at("A1", "NE", 33, 10, 10, tolerance=2), 1)
+        self.assertIsNone(index.find_at("A1", "SW", 10, 10, 10, tolerance=2))
+        self.assertIsNone(index.find_at("Z9", "NE", 10, 10, 10, tolerance=2))
+
+    def test_grid_nearest_handles_empty_and_small_k(self):
+        catalogue = CelestialCatalogue.from_records([
+            {"name": "far", "type": "star", "hidden": False, "coordinates": {"sector": "A1", "quadrant": "NE", "x": 500, "y": 500, "z": 500}}
+        ])
+        self.assertEqual(len(GridIndex(catalogue, np.empty(0, dtype=np.int64)).nearest(0, 0, 0, 3)[1]), 0)
+        distances, rows = GridIndex(catalogue, np.arange(1)).nearest(0, 0, 0, 3)
+        self.assertEqual(rows.tolist(), [0])
+
+    def test_locate_nearest_matches_catalogue_scan(self):
+        result = locate_celestial_object(coordinates={"sector": "A7", "quadrant": "NE", "x": 10, "y": 900, "z": 500})
+        expected = brute_force_nearest(CELESTIAL_OBJECTS, "A7", 10, 900, 500, 3)
+        self.assertFalse(result.data["found"])
+        self.assertEqual([o["name"] for o in result.data["nearest_objects"]], [obj["name"] for _, obj in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,369 @@
+import json
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+import tools.vector_search as vector_search
+from tools.vector_search import encyclopedia_search, _cosine_similarity
+from tools.vector_store import VectorStore
+
+
+def _unit(dimension, index):
+    vector = np.zeros(dimension, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+
+@pytest.fixture
+def populated_store():
+    """Fill the module-level store with one-hot embeddings and restore it afterwards."""
+    store = vector_search._VECTOR_DATABASE_STORE
+    store.clear()
+    vector_search._QUERY_EMBEDDING_CACHE.clear()
+    dimension = vector_search.EMBEDDING_DIMENSION
+    for i, text in enumerate(["Chronos is time-warped", "New Terra is habitable", "Sector B3 hosts Chronos"]):
+        store.add(text, i, _unit(dimension, i))
+    yield store
+    store.clear()
+    vector_search._QUERY_EMBEDDING_CACHE.clear()
+
+
+def test_vector_store_search_orders_by_score():
+    """Test that search returns the best matches first."""
+    store = VectorStore(dimension=4, initial_capacity=1)
+    store.add("a", 0, np.array([1, 0, 0, 0]))
+    store.add("b", 1, np.array([0, 1, 0, 0]))
+    store.add("c", 2, np.array([0.9, 0.1, 0, 0]))
+
+    results = store.search(np.array([1, 0, 0, 0]), top_k=2)
+
+    assert [r["chunk_id"] for r in results] == [0, 2]
+    assert results[0]["score"] == pytest.approx(1.0)
+    assert len(store) == 3
+    assert store.embeddings.shape == (3, 4)
+
+
+def test_vector_store_top_k_larger_than_store():
+    """Test that top_k is clamped to the store size."""
+    store = VectorStore(dimension=2)
+    store.add("a", 0, np.array([1, 0]))
+
+    assert len(store.search(np.array([1, 0]), top_k=10)) == 1
+    assert VectorStore(dimension=2).search(np.array([1, 0])) == []
+
+
+def test_vector_store_rejects_wrong_dimension():
+    """Test that mismatched embedding dimensions are rejected."""
+    store = VectorStore(dimension=3)
+    with pytest.raises(ValueError):
+        store.add("a", 0, np.array([1, 0]))
+
+
+def _memory_mapped(store, tmp_path):
+    """`store` saved and reopened with its float32 matrix memory-mapped, as vector_search serves compact modes."""
+    store.save(str(tmp_path / "e.npy"), str(tmp_path / "e.meta.json"))
+    loaded = VectorStore(dimension=store.dimension, storage=store.storage, rescore_factor=store.rescore_factor)
+    loaded.load(str(tmp_path / "e.npy"), str(tmp_path / "e.meta.json"))
+    assert loaded.is_memory_mapped
+    return loaded
+
+
+@pytest.mark.parametrize("storage", ["float16", "int8"])
+def test_quantized_storage_matches_exact_search(storage, tmp_path):
+    """Test that compact storage modes return the exact top-k after rescoring."""
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((500, 32)).astype(np.float32)
+    exact = VectorStore(dimension=32)
+    quantized = VectorStore(dimension=32, initial_capacity=1, storage=storage)
+    for store in (exact, quantized):
+        store.add_batch([""] * 500, list(range(500)), embeddings)
+    quantized.tombstone([3, 7])
+    exact.tombstone([3, 7])
+    quantized = _memory_mapped(quantized, tmp_path)
+
+    for query in rng.standard_normal((10, 32)):
+        expected_rows, expected_scores = exact.search_rows(query, top_k=5)
+        rows, scores = quantized.search_rows(query, top_k=5)
+        assert list(rows) == list(expected_rows)
+        assert np.allclose(scores, expected_scores)
+    assert quantized.scan_bytes < exact.scan_bytes
+
+
+@pytest.mark.parametrize("storage", ["float16", "int8"])
+def test_resident_compact_storage_scans_the_float32_matrix(storage):
+    """Test that a store whose float32 matrix is in memory searches it directly instead of widening the compact copy."""
+    rng = np.random.default_rng(2)
+    embeddings = rng.standard_normal((100, 16)).astype(np.float32)
+    exact = VectorStore(dimension=16)
+    compact = VectorStore(dimension=16, storage=storage)
+    for store in (exact, compact):
+        store.add_batch([""] * 100, list(range(100)), embeddings)
+
+    assert compact.scan_bytes == exact.scan_bytes
+    query = rng.standard_normal(16)
+    with patch.object(VectorStore, '_approximate_scores') as approximate:
+        rows, scores = compact.search_rows(query, top_k=5)
+    approximate.assert_not_called()
+    expected_rows, expected_scores = exact.search_rows(query, top_k=5)
+    assert list(rows) == list(expected_rows)
+    assert np.allclose(scores, expected_scores)
+
+
+def test_vector_store_rejects_unknown_storage():
+    with pytest.raises(ValueError):
+        VectorStore(dimension=4, storage="int4")
+
+
+def test_cosine_similarity():
+    """Test cosine similarity including the zero vector edge case."""
+    assert _cosine_similarity(np.array([1.0, 0.0]), np.array([2.0, 0.0])) == pytest.approx(1.0)
+    assert _cosine_similarity(np.array([0.0, 0.0]), np.array([1.0, 0.0])) == 0.0
+
+
+def test_encyclopedia_search(populated_store):
+    """Test encyclopedia_search scores the store with the query embedding."""
+    query = _unit(vector_search.EMBEDDING_DIMENSION, 1)
+    with patch.object(vector_search, '_get_embedding', return_value=query):
+        result = encyclopedia_search(message="Where is New Terra?", top_k=1)
+
+    assert result.success
+    assert result.data[0]["text"] == "New Terra is habitable"
+    assert result.data[0]["chunk_id"] == 1
+
+
+def test_encyclopedia_search_invalid_input():
+    """Test encyclopedia_search input validation."""
+    assert not encyclopedia_search(message="").success
+    assert not encyclopedia_search(message="query", top_k=26).success
+
+
+def test_vector_store_save_and_mmap_load(tmp_path):
+    """Test the binary cache round trip and that loading memory-maps the matrix."""
+    store = VectorStore(dimension=3)
+    store.add_batch(["a", "b"], [7, 8], np.array([[1, 0, 0], [0, 2, 0]]))
+    store.save(str(tmp_path / "e.npy"), str(tmp_path / "e.meta.json"), metadata={"model": "m"})
+
+    loaded = VectorStore(dimension=3)
+    metadata = loaded.load(str(tmp_path / "e.npy"), str(tmp_path / "e.meta.json"))
+
+    assert metadata["model"] == "m"
+    assert loaded.is_memory_mapped
+    assert loaded.texts == ["a", "b"] and loaded.chunk_ids == [7, 8]
+    assert loaded.search(np.array([0, 1, 0]), top_k=1)[0]["chunk_id"] == 8
+
+    # Appending to a read-only mapped store copies it into private memory
+    loaded.add("c", 9, np.array([0, 0, 1]))
+    assert not loaded.is_memory_mapped
+    assert len(loaded) == 3
+
+    assert VectorStore(dimension=4).load(str(tmp_path / "e.npy"), str(tmp_path / "e.meta.json")) is None
+
+
+def test_load_embeddings_migrates_legacy_json(tmp_path, monkeypatch):
+    """Test that a legacy JSON cache is loaded and rewritten in the binary format."""
+    dimension = vector_search.EMBEDDING_DIMENSION
+    legacy = tmp_path / "embeddings.json"
+    legacy.write_text(json.dumps([{"text": "t", "chunk_id": 0, "embedding": _unit(dimension, 0).tolist()}]))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_CACHE_FILE", str(legacy))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_MATRIX_FILE", str(tmp_path / "embeddings.npy"))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_METADATA_FILE", str(tmp_path / "embeddings.meta.json"))
+
+    try:
+        assert vector_search._load_embeddings()
+        assert (tmp_path / "embeddings.npy").exists()
+        legacy.unlink()
+        assert vector_search._load_embeddings()
+        assert vector_search._VECTOR_DATABASE_STORE.texts == ["t"]
+    finally:
+        vector_search._VECTOR_DATABASE_STORE.clear()
+
+
+def test_load_embeddings_ignores_legacy_json_of_another_dimension(tmp_path, monkeypatch):
+    """Test that a legacy JSON cache with the wrong vector length is skipped so the chunks are re-embedded."""
+    dimension = vector_search.EMBEDDING_DIMENSION + 1
+    legacy = tmp_path / "embeddings.json"
+    legacy.write_text(json.dumps([{"text": "t", "chunk_id": 0, "embedding": _unit(dimension, 0).tolist()}]))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_CACHE_FILE", str(legacy))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_MATRIX_FILE", str(tmp_path / "embeddings.npy"))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_METADATA_FILE", str(tmp_path / "embeddings.meta.json"))
+
+    try:
+        assert not vector_search._load_embeddings()
+        assert len(vector_search._VECTOR_DATABASE_STORE) == 0
+        assert not (tmp_path / "embeddings.npy").exists()
+    finally:
+        vector_search._VECTOR_DATABASE_STORE.clear()
+
+
+def test_initialize_or_load_only_embeds_changed_chunks(tmp_path, monkeypatch):
+    """Test that re-initializing embeds new chunks only and tombstones deleted ones."""
+    monkeypatch.setattr(vector_search, "VECTOR_DB_CACHE_FILE", str(tmp_path / "embeddings.json"))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_MATRIX_FILE", str(tmp_path / "embeddings.npy"))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_METADATA_FILE", str(tmp_path / "embeddings.meta.json"))
+    markdown = tmp_path / "kb.md"
+    embedded = []
+
+    def fake_embedding(text, client=None):
+        embedded.append(text)
+        return np.random.default_rng(len(text)).random(vector_search.EMBEDDING_DIMENSION).astype(np.float32)
+
+    monkeypatch.setattr(vector_search, "_get_embedding", fake_embedding)
+    store = vector_search._VECTOR_DATABASE_STORE
+    try:
+        markdown.write_text("# Chronos\nChronos is time-warped\n\n# New Terra\nNew Terra is habitable\n\n# Vortex\nIt whispers\n")
+        result = vector_search.initialize_or_load_vector_db(str(markdown))
+        assert result["chunks_added"] == 3
+        assert len(embedded) == 3
+
+        # Unchanged file: nothing is embedded
+        embedded.clear()
+        result = vector_search.initialize_or_load_vector_db(str(markdown))
+        assert result["status"] == "loaded_from_cache"
+        assert embedded == []
+
+        # One section edited, one section removed
+        markdown.write_text("# Chronos\nChronos is strongly time-warped\n\n# New Terra\nNew Terra is habitable\n")
+        result = vector_search.initialize_or_load_vector_db(str(markdown))
+        assert embedded == ["Chronos\nChronos is strongly time-warped"]
+        assert result["chunks_reused"] == 1
+        assert result["chunks_tombstoned"] == 2
+        assert sorted(entry["text"] for entry in store.entries()) == [
+            "Chronos is strongly time-warped",
+            "New Terra is habitable"
+        ]
+        assert store.entries()[0]["section_path"] == ["New Terra"]
+    finally:
+        store.clear()
+
+
+@pytest.fixture
+def cache_files(tmp_path, monkeypatch):
+    """Point the embedding cache at a temporary directory and empty the store afterwards."""
+    monkeypatch.setattr(vector_search, "VECTOR_DB_CACHE_FILE", str(tmp_path / "embeddings.json"))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_MATRIX_FILE", str(tmp_path / "embeddings.npy"))
+    monkeypatch.setattr(vector_search, "VECTOR_DB_METADATA_FILE", str(tmp_path / "embeddings.meta.json"))
+    embedded = []
+
+    def fake_embedding(text, client=None):
+        embedded.append(text)
+        return np.random.default_rng(len(text)).random(vector_search.EMBEDDING_DIMENSION).astype(np.float32)
+
+    monkeypatch.setattr(vector_search, "_get_embedding", fake_embedding)
+    yield embedded
+    vector_search._VECTOR_DATABASE_STORE.clear()
+
+
+def test_initialize_keeps_identical_chunks(tmp_path, cache_files):
+    """Test that chunks with identical text each get a row but are embedded once."""
+    markdown = tmp_path / "kb.md"
+    markdown.write_text("# Notes\nSee appendix\n\n# Chronos\nChronos is time-warped\n\n# Notes\nSee appendix\n")
+    result = vector_search.initialize_or_load_vector_db(str(markdown))
+    assert result["chunks_added"] == 3
+    assert cache_files.count("Notes\nSee appendix") == 1
+    assert sorted(entry["chunk_id"] for entry in vector_search._VECTOR_DATABASE_STORE.entries()) == [0, 1, 2]
+
+    cache_files.clear()
+    result = vector_search.initialize_or_load_vector_db(str(markdown))
+    assert result["status"] == "loaded_from_cache"
+    assert cache_files == []
+
+
+def test_initialize_saves_renumbered_chunk_ids(tmp_path, cache_files):
+    """Test that a run which only shifts chunk ids is saved, so a reload sees the new ids."""
+    markdown = tmp_path / "kb.md"
+    markdown.write_text("# Chronos\nChronos is time-warped\n\n# New Terra\nNew Terra is habitable\n")
+    vector_search.initialize_or_load_vector_db(str(markdown))
+
+    # Same chunks in the opposite order: nothing to embed or tombstone, only ids change
+    markdown.write_text("# New Terra\nNew Terra is habitable\n\n# Chronos\nChronos is time-warped\n")
+    result = vector_search.initialize_or_load_vector_db(str(markdown))
+    assert result["chunks_added"] == 0
+    assert result["chunks_renumbered"] == 2
+
+    assert vector_search._load_embeddings()
+    ids = {entry["text"]: entry["chunk_id"] for entry in vector_search._VECTOR_DATABASE_STORE.entries()}
+    assert ids == {"New Terra is habitable": 0, "Chronos is time-warped": 1}
+
+
+def test_encyclopedia_search_caches_query_embeddings(populated_store):
+    """Test that repeated and near-identical queries reuse the cached embedding."""
+    query = _unit(vector_search.EMBEDDING_DIMENSION, 0)
+    with patch.object(vector_search, '_get_embedding', return_value=query) as mock_embedding:
+        encyclopedia_search(message="What is Chronos?")
+        encyclopedia_search(message="  what is   chronos ")
+
+    mock_embedding.assert_called_once()
+    assert vector_search._QUERY_EMBEDDING_CACHE.stats()["memory_hits"] == 1
+
+
+def test_encyclopedia_search_lexical_mode_skips_embedding(populated_store):
+    """Test that lexical mode finds exact names without calling Bedrock."""
+    with patch.object(vector_search, '_get_embedding') as mock_embedding:
+        result = encyclopedia_search(message="Sector B3", mode="lexical")
+
+    mock_embedding.assert_not_called()
+    assert result.success
+    assert [entry["chunk_id"] for entry in result.data] == [2]
+
+
+def test_encyclopedia_search_hybrid_promotes_keyword_matches(populated_store):
+    """Test that hybrid ranking lifts an exact-name match the embedding ranks low."""
+    query = _unit(vector_search.EMBEDDING_DIMENSION, 1)
+    with patch.object(vector_search, '_get_embedding', return_value=query):
+        vector = encyclopedia_search(message="Chronos", top_k=3, mode="vector")
+        hybrid = encyclopedia_search(message="Chronos", top_k=3, mode="hybrid")
+
+    assert vector.data[0]["chunk_id"] == 1
+    assert hybrid.data[0]["chunk_id"] in (0, 2)
+
+
+def test_encyclopedia_search_defaults_to_cosine_scores(populated_store):
+    """Test that the default mode is vector search, whose scores are cosine similarities."""
+    query = _unit(vector_search.EMBEDDING_DIMENSION, 1)
+    with patch.object(vector_search, '_get_embedding', return_value=query):
+        result = encyclopedia_search(message="New Terra", top_k=1)
+    assert vector_search.ENCYCLOPEDIA_SEARCH_MODE == "vector"
+    assert result.data[0]["chunk_id"] == 1
+    assert result.data[0]["score"] == pytest.approx(1.0)
+
+
+def test_encyclopedia_search_rejects_unknown_mode():
+    result = encyclopedia_search(message="Chronos", mode="fuzzy")
+    assert not result.success
+
+
+@pytest.mark.parametrize("storage", ["float32", "int8"])
+def test_vector_store_search_batch_matches_single_queries(storage, tmp_path):
+    """Test that one batched scan returns the same top-k as per-query search."""
+    rng = np.random.default_rng(1)
+    store = VectorStore(dimension=16, storage=storage)
+    store.add_batch([""] * 200, list(range(200)), rng.standard_normal((200, 16)))
+    store.tombstone([0, 5])
+    store = _memory_mapped(store, tmp_path)
+    queries = rng.standard_normal((6, 16))
+
+    batched = store.search_rows_batch(queries, top_k=4)
+
+    for query, (rows, scores) in zip(queries, batched):
+        expected_rows, expected_scores = store.search_rows(query, top_k=4)
+        assert list(rows) == list(expected_rows)
+        assert np.allclose(scores, expected_scores)
+
+
+def test_encyclopedia_search_batch(populated_store):
+    """Test that the batch tool embeds each distinct query once and keeps query order."""
+    dimension = vector_search.EMBEDDING_DIMENSION
+    embeddings = {"New Terra": _unit(dimension, 1), "Chronos": _unit(dimension, 0)}
+    with patch.object(vector_search, '_get_embedding', side_effect=lambda text, client=None: embeddings[text]) as mock_embedding:
+        result = vector_search.encyclopedia_search_batch(
+            messages=["New Terra", "Chronos", "new terra"], top_k=1, mode="vector"
+        )
+
+    assert result.success
+    assert [results[0]["chunk_id"] for results in result.data] == [1, 0, 1]
+    assert mock_embedding.call_count == 2
+
+
+def test_encyclopedia_search_batch_invalid_input():
+    assert not vector_search.encyclopedia_search_batch(messages=[]).success
+    assert not vector_search.encyclopedia_search_batch(messages=["ok", ""]).success
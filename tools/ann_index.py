@@ -0,0 +1,147 @@
+from typing import Optional, List
+import numpy as np
+
+# Rows are assigned to centroids in blocks to bound the size of the score matrix
+_ASSIGN_BLOCK_ROWS = 16384
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over L2-normalised rows.
+    Rows are clustered with spherical k-means into `n_lists` inverted lists;
+    a query scores only the rows in its `n_probe` closest lists. Raising
+    `n_probe` trades latency for recall, and `n_probe == n_lists` is exact.
+
+    The index is only trained once there are `min_rows_per_list` rows for
+    every list; until then it stays untrained and stores search exhaustively.
+    With `n_lists` left to the default of sqrt(N), the index is retrained
+    whenever the row count has grown `retrain_growth` times since training.
+    """
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        n_iter: int = 20,
+        max_training_rows: int = 65536,
+        seed: int = 0,
+        min_rows_per_list: int = 16,
+        retrain_growth: float = 4.0
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.max_training_rows = max_training_rows
+        self.seed = seed
+        self.min_rows_per_list = min_rows_per_list
+        self.retrain_growth = retrain_growth
+        self.trained_rows = 0
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _target_lists(self, n_rows: int) -> int:
+        return self.n_lists or max(1, int(np.sqrt(n_rows)))
+
+    def can_train(self, n_rows: int) -> bool:
+        """True once `n_rows` rows are enough to give every list `min_rows_per_list` of them."""
+        return n_rows > 0 and n_rows >= self._target_lists(n_rows) * self.min_rows_per_list
+
+    def needs_rebuild(self, n_rows: int) -> bool:
+        """True if the index should be (re)built now that the store holds `n_rows` rows."""
+        if not self.is_trained:
+            return self.can_train(n_rows)
+        return self.n_lists is None and n_rows >= self.trained_rows * self.retrain_growth
+
+    def _assign(self, rows: np.ndarray) -> np.ndarray:
+        """Index of the most similar centroid for each row."""
+        assignments = np.empty(rows.shape[0], dtype=np.int64)
+        for start in range(0, rows.shape[0], _ASSIGN_BLOCK_ROWS):
+            block = rows[start:start + _ASSIGN_BLOCK_ROWS]
+            assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def _train(self, matrix: np.ndarray) -> None:
+        """Spherical k-means on a sample of the rows."""
+        rng = np.random.default_rng(self.seed)
+        n_rows = matrix.shape[0]
+        n_lists = min(self._target_lists(n_rows), n_rows)
+
+        if n_rows > self.max_training_rows:
+            sample = np.asarray(matrix[np.sort(rng.choice(n_rows, self.max_training_rows, replace=False))])
+        else:
+            sample = np.asarray(matrix)
+
+        self.centroids = sample[rng.choice(sample.shape[0], n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assignments = self._assign(sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            # Sum each cluster's rows with one segmented reduction over the sorted sample
+            order = np.argsort(assignments, kind="stable")
+            starts = np.searchsorted(assignments[order], np.arange(n_lists))
+            sums = np.zeros_like(self.centroids)
+            non_empty = counts > 0
+            sums[non_empty] = np.add.reduceat(sample[order], starts[non_empty], axis=0)
+            # Re-seed empty lists from random rows so every list stays in use
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                sums[empty] = sample[rng.choice(sample.shape[0], len(empty), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+            if np.allclose(centroids, self.centroids, atol=1e-6):
+                break
+            self.centroids = centroids
+
+    def build(self, matrix: np.ndarray) -> None:
+        """
+        Trains the coarse quantizer on `matrix` and assigns every row to a
+        list, or leaves the index untrained if `matrix` has too few rows.
+        """
+        self.centroids = None
+        self._lists = []
+        self.trained_rows = 0
+        if not self.can_train(matrix.shape[0]):
+            return
+        self._train(matrix)
+        self.trained_rows = matrix.shape[0]
+        self._lists = [np.empty(0, dtype=np.int64) for _ in range(self.centroids.shape[0])]
+        self.add(matrix, 0)
+
+    def add(self, rows: np.ndarray, start_row: int) -> None:
+        """Assigns rows numbered from `start_row` to the lists of a trained index."""
+        if rows.shape[0] == 0:
+            return
+        if not self.is_trained:
+            raise RuntimeError("IVFIndex must be built before rows can be added")
+        assignments = self._assign(rows)
+        order = np.argsort(assignments, kind="stable")
+        boundaries = np.searchsorted(assignments[order], np.arange(len(self._lists) + 1))
+        for list_id in range(len(self._lists)):
+            members = order[boundaries[list_id]:boundaries[list_id + 1]]
+            if len(members):
+                self._lists[list_id] = np.concatenate([self._lists[list_id], members + start_row])
+
+    def candidates(self, query: np.ndarray, n_probe: Optional[int] = None) -> np.ndarray:
+        """Row ids in the `n_probe` lists whose centroids are closest to `query`."""
+        if not self.is_trained:
+            return np.empty(0, dtype=np.int64)
+        n_probe = min(n_probe or self.n_probe, len(self._lists))
+        centroid_scores = self.centroids @ query
+        if n_probe < len(self._lists):
+            probed = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        else:
+            probed = np.arange(len(self._lists))
+        return np.concatenate([self._lists[list_id] for list_id in probed])
+
+
+def make_index(kind: str, **params) -> Optional[IVFIndex]:
+    """Builds an index by name: 'exact' (no index, brute-force scoring) or 'ivf'."""
+    if kind == "exact":
+        return None
+    if kind == "ivf":
+        return IVFIndex(**params)
+    raise ValueError(f"Unknown vector index type: {kind}. Must be 'exact' or 'ivf'.")
@@ -0,0 +1,319 @@
+import csv
+import json
+import os
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Free-text fields of a catalogue object, stored as string columns
+TEXT_COLUMNS = ("id", "name", "class", "description", "status")
+# Fixed-width columns of the binary format, each stored as a .npy file
+_ARRAY_COLUMNS = ("x", "y", "z", "sector_codes", "quadrant_codes", "type_codes", "hidden")
+_BINARY_FORMAT_VERSION = 1
+
+
+class _TextColumn(Sequence):
+    """Strings stored as one UTF-8 buffer plus row offsets; rows are decoded on access."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> "_TextColumn":
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.array([len(value) for value in encoded], dtype=np.int64))
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return bytes(self._data[self._offsets[row]:self._offsets[row + 1]]).decode('utf-8')
+
+
+def _coordinate(value: float) -> Any:
+    """Integral coordinates are reported as ints, as in CELESTIAL_OBJECTS."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class CelestialCatalogue:
+    """
+    Struct-of-arrays view of the celestial catalogue. Coordinates are float
+    arrays, sector, quadrant and type are integer codes into category lists,
+    and `hidden` is a boolean mask, so filters over the catalogue run as
+    vectorized masks. Rows are catalogue positions; `record(row)` returns the
+    object dict the tools format their output from.
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        z: np.ndarray,
+        sector_codes: np.ndarray,
+        sectors: List[str],
+        quadrant_codes: np.ndarray,
+        quadrants: List[str],
+        type_codes: np.ndarray,
+        types: List[str],
+        hidden: np.ndarray,
+        text: Dict[str, Sequence[str]],
+        records: Optional[Sequence[Dict[str, Any]]] = None
+    ):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.sector_codes = sector_codes
+        self.sectors = sectors
+        self.quadrant_codes = quadrant_codes
+        self.quadrants = quadrants
+        self.type_codes = type_codes
+        self.types = types
+        self.hidden = hidden
+        self.text = text
+        self.names = text["name"]
+        # Source dicts, when the catalogue was built from them; otherwise records are built from the columns
+        self._records = records
+        self._sector_lookup = {sector: code for code, sector in enumerate(sectors)}
+        self._quadrant_lookup = {quadrant: code for code, quadrant in enumerate(quadrants)}
+        self._type_lookup = {object_type: code for code, object_type in enumerate(types)}
+        # Lowercase id or name -> first visible row, built on the first `find`
+        self._identifiers: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def _encode(values: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Integer codes for `values` and the categories they index, in first-seen order."""
+        categories: Dict[str, int] = {}
+        codes = np.fromiter((categories.setdefault(value, len(categories)) for value in values), dtype=np.int32, count=len(values))
+        return codes, list(categories)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]], records: Optional[Sequence[Dict[str, Any]]] = None) -> "CelestialCatalogue":
+        """
+        Builds a catalogue from flat column lists: the TEXT_COLUMNS, "type",
+        "sector", "quadrant", "x", "y", "z" and "hidden".
+        """
+        sector_codes, sectors = cls._encode(columns["sector"])
+        quadrant_codes, quadrants = cls._encode(columns["quadrant"])
+        type_codes, types = cls._encode(columns["type"])
+        return cls(
+            x=np.array(columns["x"], dtype=np.float64),
+            y=np.array(columns["y"], dtype=np.float64),
+            z=np.array(columns["z"], dtype=np.float64),
+            sector_codes=sector_codes,
+            sectors=sectors,
+            quadrant_codes=quadrant_codes,
+            quadrants=quadrants,
+            type_codes=type_codes,
+            types=types,
+            hidden=np.array(columns["hidden"], dtype=bool),
+            text={name: columns[name] for name in TEXT_COLUMNS},
+            records=records
+        )
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, List[Any]]:
+        return {name: [] for name in TEXT_COLUMNS + ("type", "sector", "quadrant", "x", "y", "z", "hidden")}
+
+    @staticmethod
+    def _append_record(columns: Dict[str, List[Any]], obj: Dict[str, Any]) -> None:
+        coordinates = obj["coordinates"]
+        for name in TEXT_COLUMNS:
+            columns[name].append(str(obj.get(name, "")))
+        columns["type"].append(obj["type"])
+        for name in ("sector", "quadrant", "x", "y", "z"):
+            columns[name].append(coordinates[name])
+        columns["hidden"].append(bool(obj.get("hidden", False)))
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "CelestialCatalogue":
+        """Builds the columns from a list of object dicts shaped like CELESTIAL_OBJECTS."""
+        columns = cls._empty_columns()
+        for obj in records:
+            cls._append_record(columns, obj)
+        return cls.from_columns(columns, records=records)
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "CelestialCatalogue":
+        """Reads one object per line, shaped like the CELESTIAL_OBJECTS dicts, straight into columns."""
+        columns = cls._empty_columns()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    cls._append_record(columns, json.loads(line))
+        return cls.from_columns(columns)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "CelestialCatalogue":
+        """
+        Reads a CSV with a header row naming the TEXT_COLUMNS, "type",
+        "sector", "quadrant", "x", "y", "z" and "hidden" columns.
+        """
+        columns = cls._empty_columns()
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                for name in TEXT_COLUMNS + ("type", "sector", "quadrant"):
+                    columns[name].append(row.get(name) or "")
+                for name in ("x", "y", "z"):
+                    columns[name].append(float(row[name]))
+                columns["hidden"].append(str(row.get("hidden", "")).strip().lower() in ("1", "true", "yes"))
+        return cls.from_columns(columns)
+
+    def save(self, directory: str) -> None:
+        """
+        Writes the binary columnar format: one .npy file per fixed-width
+        column, a UTF-8 buffer and offsets per text column, and a meta.json
+        with the row count and category lists. meta.json is written last, so
+        a directory without it is an incomplete write.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        def write(filename: str, array: np.ndarray) -> None:
+            tmp_path = os.path.join(directory, f"{filename}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, os.path.join(directory, filename))
+
+        for name in _ARRAY_COLUMNS:
+            write(f"{name}.npy", getattr(self, name))
+        for name in TEXT_COLUMNS:
+            column = self.text[name]
+            if not isinstance(column, _TextColumn):
+                column = _TextColumn.from_strings(column)
+            write(f"{name}.data.npy", column._data)
+            write(f"{name}.offsets.npy", column._offsets)
+
+        meta = {
+            "version": _BINARY_FORMAT_VERSION,
+            "count": len(self),
+            "sectors": self.sectors,
+            "quadrants": self.quadrants,
+            "types": self.types
+        }
+        tmp_meta_path = os.path.join(directory, "meta.json.tmp")
+        with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta_path, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "CelestialCatalogue":
+        """
+        Opens a catalogue written by `save`. With `mmap=True` every column is
+        memory-mapped read-only, so opening is independent of catalogue size
+        and text fields are only decoded for the rows a tool reports.
+        """
+        with open(os.path.join(directory, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != _BINARY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalogue format version: {meta.get('version')}")
+
+        def read(filename: str, size: int) -> np.ndarray:
+            # An empty .npy has no data pages to map
+            return np.load(os.path.join(directory, filename), mmap_mode='r' if mmap and size > 0 else None)
+
+        arrays = {name: read(f"{name}.npy", meta["count"]) for name in _ARRAY_COLUMNS}
+        for name, array in arrays.items():
+            if len(array) != meta["count"]:
+                raise ValueError(f"Column '{name}' has {len(array)} rows, expected {meta['count']}")
+        text = {}
+        for name in TEXT_COLUMNS:
+            offsets = read(f"{name}.offsets.npy", meta["count"])
+            text[name] = _TextColumn(read(f"{name}.data.npy", int(offsets[-1])), offsets)
+        return cls(
+            sectors=list(meta["sectors"]),
+            quadrants=list(meta["quadrants"]),
+            types=list(meta["types"]),
+            text=text,
+            **arrays
+        )
+
+    def __len__(self) -> int:
+        return len(self.hidden)
+
+    def sector_code(self, sector: str) -> Optional[int]:
+        return self._sector_lookup.get(sector)
+
+    def quadrant_code(self, quadrant: str) -> Optional[int]:
+        return self._quadrant_lookup.get(quadrant)
+
+    def type_code(self, object_type: str) -> Optional[int]:
+        return self._type_lookup.get(object_type)
+
+    def mask(
+        self,
+        sector: Optional[str] = None,
+        quadrant: Optional[str] = None,
+        object_type: Optional[str] = None,
+        hidden: Optional[bool] = None
+    ) -> np.ndarray:
+        """Boolean mask of the rows matching every given filter; None leaves a column unfiltered."""
+        mask = np.ones(len(self), dtype=bool)
+        for value, codes, lookup in (
+            (sector, self.sector_codes, self._sector_lookup),
+            (quadrant, self.quadrant_codes, self._quadrant_lookup),
+            (object_type, self.type_codes, self._type_lookup),
+        ):
+            if value is None:
+                continue
+            code = lookup.get(value)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= codes == code
+        if hidden is not None:
+            mask &= self.hidden == hidden
+        return mask
+
+    def find(self, identifier: str) -> Optional[int]:
+        """
+        Row of the visible object whose id or name equals `identifier`,
+        ignoring case. Ids take precedence over names, and earlier rows over later ones.
+        """
+        if self._identifiers is None:
+            identifiers: Dict[str, int] = {}
+            visible = np.flatnonzero(~self.hidden).tolist()
+            for column in ("name", "id"):
+                values = self.text[column]
+                identifiers.update({values[row].lower(): row for row in reversed(visible)})
+            self._identifiers = identifiers
+        return self._identifiers.get(str(identifier).lower())
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """The object dict at catalogue position `row`."""
+        row = int(row)
+        if self._records is not None:
+            return self._records[row]
+        return {
+            "id": self.text["id"][row],
+            "name": self.text["name"][row],
+            "type": self.types[self.type_codes[row]],
+            "class": self.text["class"][row],
+            "coordinates": {
+                "sector": self.sectors[self.sector_codes[row]],
+                "quadrant": self.quadrants[self.quadrant_codes[row]],
+                "x": _coordinate(self.x[row]),
+                "y": _coordinate(self.y[row]),
+                "z": _coordinate(self.z[row])
+            },
+            "description": self.text["description"][row],
+            "status": self.text["status"][row],
+            "hidden": bool(self.hidden[row])
+        }
+
+
+def load_catalogue(path: str, mmap: bool = True) -> CelestialCatalogue:
+    """
+    Loads a catalogue by file type: a directory written by
+    `CelestialCatalogue.save` (memory-mapped), a .jsonl file or a .csv file.
+    """
+    if os.path.isdir(path):
+        return CelestialCatalogue.load(path, mmap=mmap)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        return CelestialCatalogue.from_jsonl(path)
+    if extension == ".csv":
+        return CelestialCatalogue.from_csv(path)
+    raise ValueError(f"Unsupported catalogue file: {path}. Expected a catalogue directory, .jsonl or .csv")
@@ -5,6 +5,7 @@ from tools.return_type import ToolResult
 CONTENT_CONVERTER_TOOLS = {
     "html_to_markdown": {
         "type": "function",
+        "cache": {"ttl": 86400},
         "function": {
             "name": "content_converters-html_to_markdown",
             "description": """Converts HTML content to Markdown format.  Best used for:
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Callable, Optional
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Case-folds, collapses whitespace and drops trailing punctuation so near-identical queries share a key."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return text.rstrip("?!. ")
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache for query embeddings keyed by (model id, dimension,
+    normalised query). The first tier is a bounded in-memory LRU; the optional
+    second tier is a SQLite file that survives restarts and can be shared
+    between processes.
+    """
+
+    def __init__(self, max_entries: int = 1024, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(disk_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, dimension INTEGER NOT NULL, embedding BLOB NOT NULL)"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def make_key(text: str, model_id: str, dimension: int) -> str:
+        return hashlib.sha256(f"{model_id}|{dimension}|{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str, model_id: str, dimension: int) -> Optional[np.ndarray]:
+        """Returns the cached embedding, promoting disk hits into the memory tier."""
+        key = self.make_key(text, model_id, dimension)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return embedding
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT dimension, embedding FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] == dimension:
+                    embedding = np.frombuffer(row[1], dtype=np.float32)
+                    self._remember(key, embedding)
+                    self.disk_hits += 1
+                    return embedding
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, model_id: str, dimension: int, embedding: np.ndarray) -> np.ndarray:
+        """Stores an embedding in both tiers and returns the read-only cached copy."""
+        key = self.make_key(text, model_id, dimension)
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._lock:
+            self._remember(key, embedding)
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, dimension, embedding) VALUES (?, ?, ?)",
+                    (key, dimension, embedding.tobytes())
+                )
+                self._connection.commit()
+        return embedding
+
+    def get_or_compute(
+        self,
+        text: str,
+        model_id: str,
+        dimension: int,
+        compute: Callable[[str], np.ndarray]
+    ) -> np.ndarray:
+        """Returns the cached embedding for `text`, calling `compute` only on a miss."""
+        embedding = self.get(text, model_id, dimension)
+        if embedding is not None:
+            return embedding
+        return self.put(text, model_id, dimension, compute(text))
+
+    def _remember(self, key: str, embedding: np.ndarray) -> None:
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Empties the memory tier and resets the counters; the disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._entries)
+            }
@@ -0,0 +1,187 @@
+import concurrent.futures
+import random
+import threading
+import time
+from typing import Dict, Any, List, Tuple, Callable, Optional
+from botocore.exceptions import ClientError
+
+# Bedrock error codes worth retrying; everything else fails the chunk immediately
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+}
+TRANSIENT_ERROR_CODES = {
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "InternalServerException",
+    "ModelTimeoutException",
+}
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for calls to a rate-limited endpoint.
+    The limit grows by one after a full window of fast successes, shrinks by
+    one when the smoothed latency exceeds the target, and halves on throttling.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 16,
+        target_latency: float = 1.0,
+        smoothing: float = 0.2
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = max(minimum, min(initial, maximum))
+        self.target_latency = target_latency
+        self.smoothing = smoothing
+        self.latency: Optional[float] = None
+        self.peak_limit = self.limit
+        self.throttle_count = 0
+        self._in_flight = 0
+        self._successes_at_limit = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        with self._condition:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency = self.smoothing * latency + (1 - self.smoothing) * self.latency
+
+            if self.latency > self.target_latency:
+                self._set_limit(self.limit - 1)
+                return
+
+            self._successes_at_limit += 1
+            if self._successes_at_limit >= self.limit:
+                self._set_limit(self.limit + 1)
+
+    def on_throttle(self) -> None:
+        with self._condition:
+            self.throttle_count += 1
+            self._set_limit(self.limit // 2)
+
+    def _set_limit(self, limit: int) -> None:
+        self.limit = max(self.minimum, min(limit, self.maximum))
+        self.peak_limit = max(self.peak_limit, self.limit)
+        self._successes_at_limit = 0
+        self._condition.notify_all()
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code')
+    return None
+
+
+class EmbeddingPipeline:
+    """
+    Embeds many texts through a single-text embedding function, keeping as
+    many requests in flight as the limiter allows and retrying throttled or
+    transient failures with full-jitter exponential backoff. Chunks that
+    still fail are returned with their error instead of being dropped.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], Any],
+        initial_concurrency: int = 4,
+        max_concurrency: int = 16,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        target_latency: float = 1.0
+    ):
+        self.embed_fn = embed_fn
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=initial_concurrency,
+            maximum=max_concurrency,
+            target_latency=target_latency
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _embed_with_retries(self, text: str) -> Any:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                started = time.perf_counter()
+                embedding = self.embed_fn(text)
+                self.limiter.on_success(time.perf_counter() - started)
+                return embedding
+            except Exception as e:
+                code = _error_code(e)
+                if code in THROTTLING_ERROR_CODES:
+                    self.limiter.on_throttle()
+                elif code not in TRANSIENT_ERROR_CODES:
+                    raise
+                if attempt >= self.max_retries:
+                    raise
+            finally:
+                self.limiter.release()
+            # Sleep outside the limiter so waiting retries don't hold a slot
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def run(
+        self,
+        items: List[Tuple[int, str]],
+        on_result: Optional[Callable[[int, str, Any], None]] = None
+    ) -> Tuple[Dict[int, Any], List[Dict[str, Any]]]:
+        """
+        Embeds every (chunk_id, text) pair.
+        Returns the embeddings by chunk id and a list of failed chunks as
+        {chunk_id, text, error} dicts. `on_result` is called from the calling
+        thread as each embedding completes.
+        """
+        embeddings: Dict[int, Any] = {}
+        failures: List[Dict[str, Any]] = []
+        if not items:
+            return embeddings, failures
+
+        workers = min(self.limiter.maximum, len(items))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_item = {
+                executor.submit(self._embed_with_retries, text): (chunk_id, text)
+                for chunk_id, text in items
+            }
+            for future in concurrent.futures.as_completed(future_to_item):
+                chunk_id, text = future_to_item[future]
+                try:
+                    embeddings[chunk_id] = future.result()
+                except Exception as e:
+                    failures.append({"chunk_id": chunk_id, "text": text, "error": str(e)})
+                    continue
+                if on_result is not None:
+                    on_result(chunk_id, text, embeddings[chunk_id])
+
+        failures.sort(key=lambda failure: failure["chunk_id"])
+        return embeddings, failures
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "final_concurrency": self.limiter.limit,
+            "peak_concurrency": self.limiter.peak_limit,
+            "throttled_requests": self.limiter.throttle_count
+        }
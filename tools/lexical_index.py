@@ -0,0 +1,86 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple, Optional
+import numpy as np
+
+_TERM = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded word tokens; entity names like "B3" or "Chronos" survive as single terms."""
+    return _TERM.findall(text.casefold())
+
+
+class BM25Index:
+    """
+    In-process inverted index scoring rows with Okapi BM25. Rows are numbered
+    like the vector store's matrix rows, so lexical and vector results can be
+    fused row for row. Rows are only appended; callers mask out deleted rows.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def clear(self) -> None:
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._lengths: List[int] = []
+        self._total_length = 0
+        # Numpy copies of the postings and row lengths, built on first use after each add
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._length_array: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, texts: List[str]) -> None:
+        """Indexes `texts` as the next rows."""
+        for text in texts:
+            row = len(self._lengths)
+            terms = tokenize(text)
+            for term, frequency in Counter(terms).items():
+                rows, frequencies = self._postings.setdefault(term, ([], []))
+                rows.append(row)
+                frequencies.append(frequency)
+            self._lengths.append(len(terms))
+            self._total_length += len(terms)
+        self._arrays = {}
+        self._length_array = None
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            rows, frequencies = self._postings[term]
+            arrays = (np.asarray(rows, dtype=np.int64), np.asarray(frequencies, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every row for `query`; rows sharing no term with it score 0."""
+        n_rows = len(self._lengths)
+        scores = np.zeros(n_rows, dtype=np.float32)
+        if n_rows == 0:
+            return scores
+        if self._length_array is None:
+            self._length_array = np.asarray(self._lengths, dtype=np.float32)
+        lengths = self._length_array
+        average_length = max(self._total_length / n_rows, 1.0)
+        for term in set(tokenize(query)):
+            if term not in self._postings:
+                continue
+            rows, frequencies = self._term_arrays(term)
+            idf = math.log(1 + (n_rows - len(rows) + 0.5) / (len(rows) + 0.5))
+            norms = self.k1 * (1 - self.b + self.b * lengths[rows] / average_length)
+            scores[rows] += idf * frequencies * (self.k1 + 1) / (frequencies + norms)
+        return scores
+
+
+def reciprocal_rank_fusion(rankings: List[np.ndarray], k: int = 60) -> Dict[int, float]:
+    """Fuses ranked row lists (best first) by summing 1 / (k + rank) per row."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            fused[int(row)] = fused.get(int(row), 0.0) + 1.0 / (k + rank)
+    return fused
@@ -0,0 +1,128 @@
+import re
+from typing import Dict, Any, List, Tuple
+
+_ATX_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+# A list item or line that is nothing but bold text, e.g. "- **Chapter 1: Galactic Structure**"
+_BOLD_HEADING = re.compile(r"^(?:[-*+]\s+)?\*\*(.+?)\*\*:?\s*$")
+_LIST_ITEM = re.compile(r"^(?:[-*+]|\d+[.)])\s+")
+
+# ATX headings rank above bold-line headings, which nest by indentation
+_BOLD_HEADING_BASE_LEVEL = 7
+# Longer bold-only lines are emphasised paragraphs rather than titles
+_MAX_HEADING_WORDS = 24
+
+
+def _indent(line: str) -> int:
+    expanded = line.expandtabs(4)
+    return len(expanded) - len(expanded.lstrip(" "))
+
+
+def _parse_blocks(content: str) -> List[Tuple[List[str], str]]:
+    """
+    Splits markdown into (section_path, block) pairs, where a block is a
+    paragraph or a list item with its continuation lines. Headings are not
+    blocks themselves; they update the section path of the blocks after them.
+    """
+    blocks: List[Tuple[List[str], str]] = []
+    sections: List[Tuple[int, str]] = []
+    current: List[str] = []
+
+    def flush() -> None:
+        if current:
+            blocks.append(([title for _, title in sections], " ".join(current)))
+            current.clear()
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            flush()
+            continue
+
+        atx = _ATX_HEADING.match(stripped)
+        bold = _BOLD_HEADING.match(stripped)
+        if bold and len(bold.group(1).split()) > _MAX_HEADING_WORDS:
+            bold = None
+        if atx or bold:
+            flush()
+            if atx:
+                level, title = len(atx.group(1)), atx.group(2)
+            else:
+                level, title = _BOLD_HEADING_BASE_LEVEL + _indent(line), bold.group(1).rstrip(":")
+            while sections and sections[-1][0] >= level:
+                sections.pop()
+            sections.append((level, title.strip()))
+            continue
+
+        if _LIST_ITEM.match(stripped):
+            flush()
+        current.append(stripped)
+    flush()
+    return blocks
+
+
+def _split_words(words: List[str], max_tokens: int, overlap_tokens: int) -> List[List[str]]:
+    """Cuts an over-long block into windows of `max_tokens` words that overlap by `overlap_tokens`."""
+    step = max(max_tokens - overlap_tokens, 1)
+    windows = []
+    for start in range(0, len(words), step):
+        windows.append(words[start:start + max_tokens])
+        if start + max_tokens >= len(words):
+            break
+    return windows
+
+
+def chunk_markdown(content: str, max_tokens: int = 256, overlap_tokens: int = 32) -> List[Dict[str, Any]]:
+    """
+    Splits markdown into retrieval chunks of at most `max_tokens` tokens,
+    counting whitespace-separated words as tokens.
+    Consecutive paragraphs and list items of the same section are packed into
+    one chunk, and chunks never span two sections. Each chunk after the first
+    in a section starts with the last `overlap_tokens` tokens of the one
+    before it, so a fact cut at a boundary is still whole in one chunk.
+    Returns {text, section_path} dicts in document order.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be between 0 and max_tokens - 1")
+
+    chunks: List[Dict[str, Any]] = []
+    section_path: List[str] = []
+    words: List[str] = []
+    # Leading words of `words` that were already emitted as the previous chunk's tail
+    carried = 0
+
+    def emit() -> None:
+        if len(words) > carried:
+            chunks.append({"text": " ".join(words), "section_path": section_path})
+
+    for path, block in _parse_blocks(content):
+        if path != section_path:
+            emit()
+            section_path, words, carried = path, [], 0
+
+        block_words = block.split()
+        if len(words) + len(block_words) > max_tokens and len(words) > carried:
+            emit()
+            words = words[-overlap_tokens:] if overlap_tokens else []
+            carried = len(words)
+
+        if len(words) + len(block_words) <= max_tokens:
+            words = words + block_words
+            continue
+
+        # The block alone overflows a chunk: window it, carrying the overlap in front
+        windows = _split_words(words + block_words, max_tokens, overlap_tokens)
+        for window in windows[:-1]:
+            chunks.append({"text": " ".join(window), "section_path": section_path})
+        words = windows[-1]
+        carried = min(overlap_tokens, len(words))
+    emit()
+    return chunks
+
+
+def embedding_text(chunk: Dict[str, Any]) -> str:
+    """The text sent to the embedding model: the chunk prefixed with its section path."""
+    if not chunk["section_path"]:
+        return chunk["text"]
+    return " > ".join(chunk["section_path"]) + "\n" + chunk["text"]
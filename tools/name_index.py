@@ -0,0 +1,70 @@
+import bisect
+from typing import Dict, List, Set
+import numpy as np
+
+from tools.catalogue import CelestialCatalogue
+
+
+class NameIndex:
+    """
+    Lookup structures over the lowercase names of the visible catalogue
+    rows: a sorted name array for exact lookups by bisection, an n-gram
+    inverted index for substring lookups, and a posting set per object type.
+    Lookups return catalogue rows in catalogue order.
+    """
+
+    def __init__(self, catalogue: CelestialCatalogue, ngram: int = 3):
+        self.ngram = ngram
+        self._names = catalogue.names
+        self._grams: Dict[str, Set[int]] = {}
+        # Names too short to hold an n-gram, matched directly
+        self._short: Dict[int, str] = {}
+        entries = []
+        for row in np.flatnonzero(~catalogue.hidden).tolist():
+            lower_name = self._names[row].lower()
+            entries.append((lower_name, row))
+            if len(lower_name) < ngram:
+                self._short[row] = lower_name
+            for start in range(len(lower_name) - ngram + 1):
+                self._grams.setdefault(lower_name[start:start + ngram], set()).add(row)
+        entries.sort()
+        self._sorted_names = [lower_name for lower_name, _ in entries]
+        self._sorted_rows = [row for _, row in entries]
+        self._types: Dict[str, Set[int]] = {
+            object_type: set(np.flatnonzero((catalogue.type_codes == code) & ~catalogue.hidden).tolist())
+            for code, object_type in enumerate(catalogue.types)
+        }
+
+    def _of_type(self, rows: Set[int], object_type: str) -> Set[int]:
+        if object_type == "any":
+            return rows
+        return rows & self._types.get(object_type, set())
+
+    def exact(self, name: str, object_type: str = "any") -> List[int]:
+        """Visible rows whose lowercase name is `name`."""
+        start = bisect.bisect_left(self._sorted_names, name)
+        end = bisect.bisect_right(self._sorted_names, name, lo=start)
+        return sorted(self._of_type(set(self._sorted_rows[start:end]), object_type))
+
+    def _containing(self, query: str) -> Set[int]:
+        """Candidate rows whose name may contain `query`."""
+        if len(query) >= self.ngram:
+            postings = [self._grams.get(query[start:start + self.ngram]) for start in range(len(query) - self.ngram + 1)]
+            if any(posting is None for posting in postings):
+                return set()
+            postings.sort(key=len)
+            return set.intersection(*postings)
+        # A short query is inside a name exactly when it is inside one of the name's n-grams
+        candidates = {row for row, short_name in self._short.items() if query in short_name}
+        for gram, posting in self._grams.items():
+            if query in gram:
+                candidates |= posting
+        return candidates
+
+    def search(self, query: str, object_type: str = "any") -> List[int]:
+        """
+        Visible rows whose lowercase name contains the lowercase `query`,
+        restricted to `object_type` unless it is "any".
+        """
+        candidates = self._of_type(self._containing(query), object_type)
+        return [row for row in sorted(candidates) if query in self._names[row].lower()]
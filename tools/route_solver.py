@@ -0,0 +1,103 @@
+from typing import List, Tuple
+import numpy as np
+
+# Routes with at most this many stops are solved exactly with Held-Karp
+EXACT_ROUTE_MAX_STOPS = 10
+_MAX_TWO_OPT_PASSES = 100
+
+
+def route_length(distances: np.ndarray, route: List[int], closed: bool = False) -> float:
+    """Total length of visiting `route` in order, returning to its first stop if `closed`."""
+    length = float(sum(distances[a, b] for a, b in zip(route, route[1:])))
+    if closed and len(route) > 1:
+        length += float(distances[route[-1], route[0]])
+    return length
+
+
+def _held_karp(distances: np.ndarray, closed: bool) -> List[int]:
+    """Exact shortest route starting at stop 0, by dynamic programming over subsets of the other stops."""
+    n = len(distances)
+    m = n - 1
+    # best[mask, j]: shortest path from stop 0 through the stops in `mask` ending at stop j + 1
+    best = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int64)
+    between = distances[1:, 1:]
+    for j in range(m):
+        best[1 << j, j] = distances[0, j + 1]
+    for mask in range(1, 1 << m):
+        for j in range(m):
+            bit = 1 << j
+            if not mask & bit or mask == bit:
+                continue
+            previous = best[mask ^ bit] + between[:, j]
+            i = int(np.argmin(previous))
+            best[mask, j] = previous[i]
+            parent[mask, j] = i
+
+    full = (1 << m) - 1
+    final = best[full] + (distances[1:, 0] if closed else 0.0)
+    j = int(np.argmin(final))
+    route = []
+    mask = full
+    while j >= 0:
+        route.append(j + 1)
+        mask, j = mask ^ (1 << j), int(parent[mask, j])
+    return [0] + route[::-1]
+
+
+def _nearest_neighbour(distances: np.ndarray) -> List[int]:
+    """Greedy route from stop 0, always moving to the closest unvisited stop."""
+    n = len(distances)
+    visited = np.zeros(n, dtype=bool)
+    route = [0]
+    visited[0] = True
+    for _ in range(n - 1):
+        candidates = np.where(visited, np.inf, distances[route[-1]])
+        nearest = int(np.argmin(candidates))
+        route.append(nearest)
+        visited[nearest] = True
+    return route
+
+
+def _two_opt(distances: np.ndarray, route: List[int], closed: bool) -> List[int]:
+    """
+    Improves a route starting at stop 0 by reversing segments while that
+    shortens it. Each pass scores every reversal end for a start as one vector.
+    """
+    route = np.array(route)
+    n = len(route)
+    for _ in range(_MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(1, n - 1):
+            ends = np.arange(i + 1, n)
+            a, b, c = route[i - 1], route[i], route[ends]
+            # Reversing route[i..j] replaces edges (a, b) and (c, after) with (a, c) and (b, after)
+            delta = distances[a, c] - distances[a, b]
+            after = np.append(route[ends[:-1] + 1], route[0])
+            has_after = np.ones(len(ends), dtype=bool)
+            if not closed:
+                has_after[-1] = False
+            delta = delta + np.where(has_after, distances[b, after] - distances[c, after], 0.0)
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = ends[best]
+                route[i:j + 1] = route[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return route.tolist()
+
+
+def solve_route(distances: np.ndarray, closed: bool = False) -> Tuple[List[int], str]:
+    """
+    Visiting order over an (n, n) distance matrix that starts at stop 0 and
+    visits every stop once, returning to stop 0 if `closed`. Solved exactly
+    for up to EXACT_ROUTE_MAX_STOPS stops, otherwise by nearest neighbour
+    followed by 2-opt. Returns the order and the method used.
+    """
+    n = len(distances)
+    if n <= 2:
+        return list(range(n)), "exact"
+    if n <= EXACT_ROUTE_MAX_STOPS:
+        return _held_karp(distances, closed), "exact"
+    return _two_opt(distances, _nearest_neighbour(distances), closed), "nearest_neighbour_2opt"
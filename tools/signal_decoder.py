@@ -6,6 +6,7 @@ from typing import Dict, Any
 SIGNAL_DECODER_TOOLS = {
     "decode_signal": {
         "type": "function",
+        "cache": {"ttl": 86400},
         "function": {
             "name": "signal_decoder-decode_signal",
             "description": """Decodes alien or satellite signals into human-readable messages.  Best used for:
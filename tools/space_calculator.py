@@ -27,13 +27,16 @@ Phase 3 - Gravity Calculations (TODOs #9-#11):
 
 import weave
 import math
+import numpy as np
 from typing import Dict, Any, Union, List
 from tools.return_type import ToolResult
+from tools.route_solver import solve_route, route_length
 
 """Phase 1 - Winston's Instructions"""
 SPACE_CALCULATOR_TOOLS = {
     "calculate_distance": {
         "type": "function",
+        "cache": {"ttl": 86400},
         "function": {
             "name": "space_calculator-calculate_distance",
             "description": """Calculates the distance between the spacecraft and a celestial object.
@@ -79,6 +82,7 @@ SPACE_CALCULATOR_TOOLS = {
     
     "calculate_gravity": {
         "type": "function",
+        "cache": {"ttl": 86400},
         "function": {
             "name": "space_calculator-calculate_gravity",
             "description": """Calculates the gravitational force between the spacecraft and a celestial object.
@@ -111,6 +115,7 @@ SPACE_CALCULATOR_TOOLS = {
     
     "calculate_travel_time": {
         "type": "function",
+        "cache": {"ttl": 86400},
         "function": {
             "name": "space_calculator-calculate_travel_time",
             "description": """Calculates the time required to travel from the current position to a destination.
@@ -135,6 +140,191 @@ SPACE_CALCULATOR_TOOLS = {
                 "required": ["distance", "speed"]
             }
         }
+    },
+
+    "calculate_distance_batch": {
+        "type": "function",
+        "cache": {"ttl": 86400},
+        "function": {
+            "name": "space_calculator-calculate_distance_batch",
+            "description": """Calculates many distances in one call, pairing each current coordinate with the object coordinate at the same position.
+            Use this tool for:
+            - Measuring the distance from the spacecraft to several celestial objects at once (pass a single current coordinate)
+            - Comparing distances for a list of origin/destination pairs
+            - Replacing repeated calculate_distance steps with a single step
+            """,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "current_coordinates": {
+                        "type": "array",
+                        "description": "Coordinates to measure from (x,y,z); a single entry is paired with every object coordinate",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "x": {"type": "number"},
+                                "y": {"type": "number"},
+                                "z": {"type": "number"}
+                            },
+                            "required": ["x", "y", "z"]
+                        }
+                    },
+                    "object_coordinates": {
+                        "type": "array",
+                        "description": "Coordinates of the celestial objects to measure to (x,y,z)",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "x": {"type": "number"},
+                                "y": {"type": "number"},
+                                "z": {"type": "number"}
+                            },
+                            "required": ["x", "y", "z"]
+                        }
+                    },
+                    "unit": {
+                        "type": "string",
+                        "description": "The unit of measurement for the results (km, au, ly)",
+                        "enum": ["km", "au", "ly"]
+                    }
+                },
+                "required": ["current_coordinates", "object_coordinates", "unit"]
+            }
+        }
+    },
+
+    "calculate_distance_matrix": {
+        "type": "function",
+        "cache": {"ttl": 86400},
+        "function": {
+            "name": "space_calculator-calculate_distance_matrix",
+            "description": """Calculates the distance between every pair of points in a list, returned as a matrix.
+            Use this tool for:
+            - Comparing distances between several planets, stations or waypoints at once
+            - Finding which objects in a list are closest to each other
+            - Preparing multi-stop route plans
+            """,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "coordinates": {
+                        "type": "array",
+                        "description": "Coordinates of the points in 3D space (x,y,z); row and column i of the matrix refer to entry i",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "x": {"type": "number"},
+                                "y": {"type": "number"},
+                                "z": {"type": "number"}
+                            },
+                            "required": ["x", "y", "z"]
+                        }
+                    },
+                    "unit": {
+                        "type": "string",
+                        "description": "The unit of measurement for the results (km, au, ly)",
+                        "enum": ["km", "au", "ly"]
+                    }
+                },
+                "required": ["coordinates", "unit"]
+            }
+        }
+    },
+
+    "calculate_gravity_batch": {
+        "type": "function",
+        "cache": {"ttl": 86400},
+        "function": {
+            "name": "space_calculator-calculate_gravity_batch",
+            "description": """Calculates the gravitational force on the spacecraft from several celestial objects in one call.
+            Use this tool for:
+            - Comparing the gravitational influence of all nearby bodies at once
+            - Assessing gravity-related dangers along a route
+            """,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "spacecraft_mass": {
+                        "type": "number",
+                        "description": "The mass of the spacecraft in kilograms"
+                    },
+                    "object_masses": {
+                        "type": "array",
+                        "description": "The masses of the celestial objects in kilograms",
+                        "items": {"type": "number"}
+                    },
+                    "distances": {
+                        "type": "array",
+                        "description": "The distance to each celestial object in meters, in the same order as object_masses",
+                        "items": {"type": "number"}
+                    }
+                },
+                "required": ["spacecraft_mass", "object_masses", "distances"]
+            }
+        }
+    },
+
+    "calculate_travel_time_batch": {
+        "type": "function",
+        "cache": {"ttl": 86400},
+        "function": {
+            "name": "space_calculator-calculate_travel_time_batch",
+            "description": """Calculates the travel time for several distances at the same speed in one call.
+            Use this tool for:
+            - Estimating arrival times for each leg of a route
+            - Comparing how long it takes to reach several destinations
+            """,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "distances": {
+                        "type": "array",
+                        "description": "The distances to travel in kilometers",
+                        "items": {"type": "number"}
+                    },
+                    "speed": {
+                        "type": "number",
+                        "description": "The spacecraft's speed in kilometers per second"
+                    }
+                },
+                "required": ["distances", "speed"]
+            }
+        }
+    },
+
+    "plan_route": {
+        "type": "function",
+        "cache": {"ttl": 3600},
+        "function": {
+            "name": "space_calculator-plan_route",
+            "description": """Plans the shortest order to visit several celestial objects and the travel time of the whole route.
+            Use this tool for:
+            - Planning multi-stop missions through known planets, stations, moons or probes
+            - Finding the best visiting order instead of chaining calculate_distance and calculate_travel_time steps
+            - Estimating the total distance and duration of a tour, optionally returning to the start
+            Distances use the objects' catalogue coordinates in kilometers, which are local to a sector and quadrant,
+            so every stop must be in the same sector and quadrant.
+            """,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "stops": {
+                        "type": "array",
+                        "description": "Names or ids of the celestial objects to visit; the route starts at the first one",
+                        "items": {"type": "string"}
+                    },
+                    "speed": {
+                        "type": "number",
+                        "description": "The spacecraft's speed in kilometers per second"
+                    },
+                    "return_to_start": {
+                        "type": "boolean",
+                        "description": "Whether the route ends back at the first stop (default: false)"
+                    }
+                },
+                "required": ["stops", "speed"]
+            }
+        }
     }
 }
 
@@ -231,4 +421,164 @@ def calculate_travel_time(*, distance: float, speed: float) -> ToolResult[Dict[s
         
         return ToolResult.ok(result)
     except Exception as e:
-        return ToolResult.err(str(e))
\ No newline at end of file
+        return ToolResult.err(str(e))
+
+"""Batch Calculations"""
+# Kilometres per unit of distance
+KM_PER_UNIT = {"km": 1.0, "au": 149597870.7, "ly": 9460730472580.8}
+G = 6.67430e-11  # Gravitational constant in m³/kg/s²
+
+def _coordinate_array(coordinates: List[Dict[str, float]], name: str) -> np.ndarray:
+    """(n, 3) float array of x/y/z coordinates."""
+    if not isinstance(coordinates, list) or not coordinates:
+        raise ValueError(f"{name} must be a non-empty list of coordinates")
+    return np.array([[c["x"], c["y"], c["z"]] for c in coordinates], dtype=np.float64)
+
+def _number_array(values: List[float], name: str) -> np.ndarray:
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"{name} must be a non-empty list of numbers")
+    return np.array(values, dtype=np.float64)
+
+def _time_breakdown(time_seconds: float) -> Dict[str, float]:
+    """A duration in the units calculate_travel_time reports."""
+    time_days = time_seconds / 60 / 60 / 24
+    return {
+        "seconds": round(float(time_seconds), 2),
+        "minutes": round(float(time_seconds / 60), 2),
+        "hours": round(float(time_seconds / 60 / 60), 2),
+        "days": round(float(time_days), 2),
+        "years": round(float(time_days / 365.25), 4)
+    }
+
+def pairwise_distances(points: np.ndarray) -> np.ndarray:
+    """(n, n) Euclidean distances between the rows of an (n, 3) array."""
+    differences = points[:, None, :] - points[None, :, :]
+    return np.sqrt(np.einsum('ijk,ijk->ij', differences, differences))
+
+@weave.op(name="space_calculator-calculate_distance_batch")
+def calculate_distance_batch(*, current_coordinates: List[Dict[str, float]],
+                             object_coordinates: List[Dict[str, float]],
+                             unit: str) -> ToolResult[Dict[str, Any]]:
+    """Calculate the distances between pairs of coordinates in one vectorized pass."""
+    try:
+        if unit not in KM_PER_UNIT:
+            return ToolResult.err(f"Unsupported unit: {unit}")
+        origins = _coordinate_array(current_coordinates, "current_coordinates")
+        targets = _coordinate_array(object_coordinates, "object_coordinates")
+        if len(origins) not in (1, len(targets)):
+            return ToolResult.err("current_coordinates must have one entry or as many entries as object_coordinates")
+
+        vectors = targets - origins
+        distances = np.sqrt(np.einsum('ij,ij->i', vectors, vectors)) / KM_PER_UNIT[unit]
+        return ToolResult.ok({
+            "unit": unit,
+            "count": len(targets),
+            "distances": [round(float(d), 4) for d in distances],
+            "vectors": [{"x": float(v[0]), "y": float(v[1]), "z": float(v[2])} for v in vectors]
+        })
+    except Exception as e:
+        return ToolResult.err(str(e))
+
+@weave.op(name="space_calculator-calculate_distance_matrix")
+def calculate_distance_matrix(*, coordinates: List[Dict[str, float]], unit: str) -> ToolResult[Dict[str, Any]]:
+    """Calculate the distance between every pair of coordinates."""
+    try:
+        if unit not in KM_PER_UNIT:
+            return ToolResult.err(f"Unsupported unit: {unit}")
+        points = _coordinate_array(coordinates, "coordinates")
+        matrix = pairwise_distances(points) / KM_PER_UNIT[unit]
+        return ToolResult.ok({
+            "unit": unit,
+            "count": len(points),
+            "distances": [[round(float(d), 4) for d in row] for row in matrix]
+        })
+    except Exception as e:
+        return ToolResult.err(str(e))
+
+@weave.op(name="space_calculator-calculate_gravity_batch")
+def calculate_gravity_batch(*, spacecraft_mass: float, object_masses: List[float], distances: List[float]) -> ToolResult[Dict[str, Any]]:
+    """Calculate the gravitational force from several celestial objects at once."""
+    try:
+        masses = _number_array(object_masses, "object_masses")
+        distances_m = _number_array(distances, "distances")
+        if len(masses) != len(distances_m):
+            return ToolResult.err("object_masses and distances must have the same length")
+        if np.any(distances_m == 0):
+            return ToolResult.err("Distances must be non-zero")
+
+        forces = G * spacecraft_mass * masses / (distances_m * distances_m)
+        return ToolResult.ok({
+            "spacecraft_mass_kg": spacecraft_mass,
+            "count": len(masses),
+            "forces_newtons": [round(float(f), 4) for f in forces],
+            "object_masses_kg": object_masses,
+            "distances_m": distances
+        })
+    except Exception as e:
+        return ToolResult.err(str(e))
+
+@weave.op(name="space_calculator-calculate_travel_time_batch")
+def calculate_travel_time_batch(*, distances: List[float], speed: float) -> ToolResult[Dict[str, Any]]:
+    """Calculate the travel time for several distances at one speed."""
+    try:
+        if speed <= 0:
+            return ToolResult.err("Speed must be greater than zero")
+        seconds = _number_array(distances, "distances") / speed
+        return ToolResult.ok({
+            "count": len(seconds),
+            "times": [_time_breakdown(s) for s in seconds],
+            "total": _time_breakdown(seconds.sum())
+        })
+    except Exception as e:
+        return ToolResult.err(str(e))
+
+@weave.op(name="space_calculator-plan_route")
+def plan_route(*, stops: List[str], speed: float, return_to_start: bool = False) -> ToolResult[Dict[str, Any]]:
+    """Plan the visiting order of several celestial objects and its travel time."""
+    try:
+        # Imported here so the catalogue is only loaded when a route is planned
+        from tools.stellar_locator import get_catalogue
+
+        if speed <= 0:
+            return ToolResult.err("Speed must be greater than zero")
+        if not isinstance(stops, list) or len(stops) < 2:
+            return ToolResult.err("stops must list at least two celestial objects")
+
+        catalogue = get_catalogue()
+        rows = []
+        for stop in stops:
+            row = catalogue.find(stop)
+            if row is None:
+                return ToolResult.err(f"Unknown celestial object: {stop}")
+            rows.append(row)
+        records = [catalogue.record(row) for row in rows]
+        # Coordinates are local to a sector and quadrant, so they are only comparable within one
+        regions = sorted({(record["coordinates"]["sector"], record["coordinates"]["quadrant"]) for record in records})
+        if len(regions) > 1:
+            spanned = ", ".join(f"{sector} {quadrant}" for sector, quadrant in regions)
+            return ToolResult.err(f"Stops span several sectors or quadrants ({spanned}); routes can only be planned within one")
+        points = np.stack([catalogue.x[rows], catalogue.y[rows], catalogue.z[rows]], axis=1)
+
+        distances = pairwise_distances(points)
+        order, method = solve_route(distances, closed=return_to_start)
+        path = order + [order[0]] if return_to_start else order
+
+        legs = []
+        for a, b in zip(path, path[1:]):
+            legs.append({
+                "from": records[a]["name"],
+                "to": records[b]["name"],
+                "distance_km": round(float(distances[a, b]), 4),
+                "travel_time": _time_breakdown(distances[a, b] / speed)
+            })
+        total_km = route_length(distances, order, closed=return_to_start)
+
+        return ToolResult.ok({
+            "order": [records[i]["name"] for i in path],
+            "legs": legs,
+            "total_distance_km": round(total_km, 4),
+            "total_travel_time": _time_breakdown(total_km / speed),
+            "method": method
+        })
+    except Exception as e:
+        return ToolResult.err(str(e))
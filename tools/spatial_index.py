@@ -0,0 +1,142 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from tools.catalogue import CelestialCatalogue
+
+# Cell coordinates are packed into one int64 key, 21 bits per axis
+_CELL_BITS = 21
+_CELL_OFFSET = 1 << (_CELL_BITS - 1)
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    """Packs (n, 3) integer cell coordinates into int64 keys."""
+    shifted = cells.astype(np.int64) + _CELL_OFFSET
+    return (shifted[:, 0] << (2 * _CELL_BITS)) | (shifted[:, 1] << _CELL_BITS) | shifted[:, 2]
+
+
+def _group_rows(keys: np.ndarray, rows: np.ndarray) -> Iterable[Tuple[int, np.ndarray]]:
+    """Splits `rows` by their int64 key, keeping row order within each group."""
+    order = np.argsort(keys, kind="stable")
+    unique, starts = np.unique(keys[order], return_index=True)
+    return zip(unique.tolist(), np.split(rows[order], starts[1:]))
+
+
+class GridIndex:
+    """
+    Uniform grid hash over catalogue rows by their x/y/z coordinates. Rows are
+    bucketed into cubes of `cell_size` and stored grouped by cell, with a
+    sorted array of occupied cell keys, so a box query reads only the cells it
+    overlaps and a k-nearest query reads cells in rings outwards from the
+    query until no unread cell can hold a closer row. Distances within the
+    cells read are computed as one vectorized pass over the coordinate columns.
+    """
+
+    def __init__(self, catalogue: CelestialCatalogue, rows: np.ndarray, cell_size: float = 32.0):
+        self.cell_size = cell_size
+        self._x, self._y, self._z = catalogue.x, catalogue.y, catalogue.z
+        cells = np.floor(np.stack([self._x[rows], self._y[rows], self._z[rows]], axis=1) / cell_size).astype(np.int64)
+        keys = _cell_keys(cells)
+        order = np.argsort(keys, kind="stable")
+        # Rows grouped by cell in catalogue order within each cell; cell i holds _rows[_starts[i]:_starts[i + 1]]
+        self._rows = np.asarray(rows, dtype=np.int64)[order]
+        self._keys, starts = np.unique(keys[order], return_index=True)
+        self._starts = np.append(starts, len(rows))
+        self._cells = cells[order][starts]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _cell(self, x: float, y: float, z: float) -> np.ndarray:
+        return np.floor(np.array([x, y, z], dtype=np.float64) / self.cell_size).astype(np.int64)
+
+    def _gather(self, cell_indexes: np.ndarray) -> np.ndarray:
+        """Rows of the occupied cells at `cell_indexes`."""
+        if len(cell_indexes) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._rows[self._starts[i]:self._starts[i + 1]] for i in cell_indexes.tolist()])
+
+    def within(self, x: float, y: float, z: float, tolerance: float) -> np.ndarray:
+        """Rows within `tolerance` of (x, y, z) on every axis, in catalogue order."""
+        low = self._cell(x - tolerance, y - tolerance, z - tolerance)
+        high = self._cell(x + tolerance, y + tolerance, z + tolerance)
+        box = np.stack(np.meshgrid(*(np.arange(l, h + 1) for l, h in zip(low, high)), indexing="ij"), axis=-1).reshape(-1, 3)
+        keys = _cell_keys(box)
+        indexes = np.minimum(np.searchsorted(self._keys, keys), max(len(self._keys) - 1, 0))
+        occupied = indexes[self._keys[indexes] == keys] if len(self._keys) else indexes[:0]
+        rows = self._gather(occupied)
+        inside = ((np.abs(self._x[rows] - x) <= tolerance) &
+                  (np.abs(self._y[rows] - y) <= tolerance) &
+                  (np.abs(self._z[rows] - z) <= tolerance))
+        return np.sort(rows[inside])
+
+    def nearest(self, x: float, y: float, z: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The `k` rows closest to (x, y, z) and their distances, nearest first
+        with ties in catalogue order.
+        """
+        if k <= 0 or len(self._rows) == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        # Ring of every occupied cell: its Chebyshev distance in cells from the query's cell
+        rings = np.abs(self._cells - self._cell(x, y, z)).max(axis=1)
+        order = np.argsort(rings, kind="stable")
+        radii, ring_starts = np.unique(rings[order], return_index=True)
+        ring_starts = np.append(ring_starts, len(order))
+
+        found: List[np.ndarray] = []
+        found_count = 0
+        for i in range(len(radii)):
+            rows = self._gather(order[ring_starts[i]:ring_starts[i + 1]])
+            found.append(rows)
+            found_count += len(rows)
+            # Every unread row lies more than (next radius - 1) * cell_size away
+            if found_count >= k and i + 1 < len(radii):
+                distances = self._distances(np.concatenate(found), x, y, z)
+                if np.partition(distances, k - 1)[k - 1] <= (radii[i + 1] - 1) * self.cell_size:
+                    break
+
+        rows = np.concatenate(found)
+        distances = self._distances(rows, x, y, z)
+        order = np.lexsort((rows, distances))[:k]
+        return distances[order], rows[order]
+
+    def _distances(self, rows: np.ndarray, x: float, y: float, z: float) -> np.ndarray:
+        return np.sqrt((self._x[rows] - x)**2 + (self._y[rows] - y)**2 + (self._z[rows] - z)**2)
+
+
+class CatalogueSpatialIndex:
+    """
+    Grid indexes over the visible (non-hidden) rows of a catalogue: one per
+    (sector, quadrant) for coordinate lookups, and one per sector for nearest
+    neighbour queries, which span every quadrant of a sector.
+    """
+
+    def __init__(self, catalogue: CelestialCatalogue, cell_size: float = 32.0):
+        self.cell_size = cell_size
+        self._catalogue = catalogue
+        visible = np.flatnonzero(~catalogue.hidden)
+        sector_codes = catalogue.sector_codes[visible].astype(np.int64)
+        quadrant_keys = (sector_codes << 32) | catalogue.quadrant_codes[visible].astype(np.int64)
+        self._quadrants: Dict[Tuple[int, int], GridIndex] = {
+            (key >> 32, key & 0xFFFFFFFF): GridIndex(catalogue, rows, cell_size)
+            for key, rows in _group_rows(quadrant_keys, visible)
+        }
+        self._sectors: Dict[int, GridIndex] = {
+            sector: GridIndex(catalogue, rows, cell_size)
+            for sector, rows in _group_rows(sector_codes, visible)
+        }
+
+    def find_at(self, sector: str, quadrant: str, x: float, y: float, z: float, tolerance: float) -> Optional[int]:
+        """First row in catalogue order within `tolerance` of the coordinates on every axis."""
+        grid = self._quadrants.get((self._catalogue.sector_code(sector), self._catalogue.quadrant_code(quadrant)))
+        if grid is None:
+            return None
+        rows = grid.within(x, y, z, tolerance)
+        return int(rows[0]) if len(rows) else None
+
+    def nearest(self, sector: str, x: float, y: float, z: float, k: int) -> List[Tuple[float, int]]:
+        """The `k` rows of `sector` nearest to the coordinates as (distance, row) pairs."""
+        grid = self._sectors.get(self._catalogue.sector_code(sector))
+        if grid is None:
+            return []
+        distances, rows = grid.nearest(x, y, z, k)
+        return [(float(distance), int(row)) for distance, row in zip(distances, rows)]
@@ -1,13 +1,21 @@
 import weave
 import math
+import os
 import random
+import threading
+import numpy as np
 from typing import Dict, Any, List, Optional, Union
 from tools.return_type import ToolResult
+from utils.tool_cache import clear_tool_cache
 from .celestrial_objects import CELESTIAL_OBJECTS
+from .catalogue import CelestialCatalogue, load_catalogue
+from .spatial_index import CatalogueSpatialIndex
+from .name_index import NameIndex
 
 STELLAR_LOCATOR_TOOLS = {
     "locate_celestial_object": {
         "type": "function",
+        "cache": {"ttl": 3600},
         "function": {
             "name": "stellar_locator-locate_celestial_object",
             "description": """Locates planets, space stations, or other celestial objects in the galaxy.
@@ -40,6 +48,7 @@ STELLAR_LOCATOR_TOOLS = {
     
     "search_by_name": {
         "type": "function",
+        "cache": {"ttl": 3600},
         "function": {
             "name": "stellar_locator-search_by_name",
             "description": """Searches for celestial objects by name or partial name.
@@ -72,6 +81,8 @@ STELLAR_LOCATOR_TOOLS = {
     
     "scan_region": {
         "type": "function",
+        # Deep scans detect hidden objects at random, so their results are never reused
+        "cache": {"ttl": 3600, "bypass": {"scan_depth": ["deep"]}},
         "function": {
             "name": "stellar_locator-scan_region",
             "description": """Scans a region of space to identify all celestial objects within it.
@@ -108,6 +119,45 @@ STELLAR_LOCATOR_TOOLS = {
 # Database of celestial objects
 # In a real implementation, this would be stored in a database
 
+# A catalogue directory (see CelestialCatalogue.save), .jsonl or .csv file to use instead of CELESTIAL_OBJECTS
+STELLAR_CATALOGUE_PATH = os.getenv("STELLAR_CATALOGUE_PATH")
+
+# The columnar catalogue and its grid and name indexes, each built on first use
+_LAZY: Dict[str, Any] = {}
+_LAZY_LOCK = threading.RLock()
+
+def _lazy(name: str, build) -> Any:
+    value = _LAZY.get(name)
+    if value is None:
+        with _LAZY_LOCK:
+            value = _LAZY.get(name)
+            if value is None:
+                value = _LAZY[name] = build()
+    return value
+
+def get_catalogue() -> CelestialCatalogue:
+    """The catalogue the stellar_locator tools serve, loaded on first use."""
+    if STELLAR_CATALOGUE_PATH:
+        return _lazy("catalogue", lambda: load_catalogue(STELLAR_CATALOGUE_PATH))
+    return _lazy("catalogue", lambda: CelestialCatalogue.from_records(CELESTIAL_OBJECTS))
+
+def _spatial_index() -> CatalogueSpatialIndex:
+    return _lazy("spatial_index", lambda: CatalogueSpatialIndex(get_catalogue()))
+
+def _name_index() -> NameIndex:
+    return _lazy("name_index", lambda: NameIndex(get_catalogue()))
+
+def use_catalogue(catalogue: CelestialCatalogue) -> None:
+    """
+    Serves the stellar_locator tools from `catalogue`; its indexes are rebuilt
+    on first use. Memoized tool results were computed from the old catalogue,
+    so the tool cache is cleared.
+    """
+    with _LAZY_LOCK:
+        _LAZY.clear()
+        _LAZY["catalogue"] = catalogue
+    clear_tool_cache()
+
 @weave.op(name="stellar_locator-locate_celestial_object")
 def locate_celestial_object(*, coordinates: Dict[str, Any]) -> ToolResult[Dict[str, Any]]:
     """Locate a celestial object at the given coordinates."""
@@ -127,23 +177,15 @@ def locate_celestial_object(*, coordinates: Dict[str, Any]) -> ToolResult[Dict[s
             if not isinstance(coordinates[coord], (int, float)) or coordinates[coord] < 0 or coordinates[coord] > 999:
                 return ToolResult.err(f"Invalid {coord} coordinate: {coordinates[coord]}. Must be a number between 0-999.")
         
-        # Look for exact matches
-        exact_match = None
-        for obj in CELESTIAL_OBJECTS:
-            if (obj["coordinates"]["sector"] == coordinates["sector"] and
-                obj["coordinates"]["quadrant"] == coordinates["quadrant"] and
-                abs(obj["coordinates"]["x"] - coordinates["x"]) <= 2 and
-                abs(obj["coordinates"]["y"] - coordinates["y"]) <= 2 and
-                abs(obj["coordinates"]["z"] - coordinates["z"]) <= 2):
-                
-                # Skip hidden objects in normal searches
-                if obj["hidden"]:
-                    continue
-                    
-                exact_match = obj
-                break
+        # Look for exact matches (hidden objects are not indexed, so normal searches skip them)
+        exact_row = _spatial_index().find_at(
+            coordinates["sector"], coordinates["quadrant"],
+            coordinates["x"], coordinates["y"], coordinates["z"],
+            tolerance=2
+        )
         
-        if exact_match:
+        if exact_row is not None:
+            exact_match = get_catalogue().record(exact_row)
             return ToolResult.ok({
                 "found": True,
                 "object": {
@@ -156,28 +198,18 @@ def locate_celestial_object(*, coordinates: Dict[str, Any]) -> ToolResult[Dict[s
                 }
             })
         
-        # If no exact match, find nearest objects
+        # If no exact match, find the 3 nearest objects in the same sector
         nearest_objects = []
-        for obj in CELESTIAL_OBJECTS:
-            if obj["hidden"]:
-                continue
-                
-            if obj["coordinates"]["sector"] == coordinates["sector"]:
-                # Only consider objects in the same sector
-                distance = calculate_distance_3d(
-                    coordinates["x"], coordinates["y"], coordinates["z"],
-                    obj["coordinates"]["x"], obj["coordinates"]["y"], obj["coordinates"]["z"]
-                )
-                
-                nearest_objects.append({
-                    "name": obj["name"],
-                    "type": obj["type"],
-                    "distance": distance,
-                    "coordinates": obj["coordinates"]
-                })
-        
-        nearest_objects.sort(key=lambda x: x["distance"])
-        nearest_objects = nearest_objects[:3]  # Only return the 3 nearest
+        for distance, row in _spatial_index().nearest(
+            coordinates["sector"], coordinates["x"], coordinates["y"], coordinates["z"], k=3
+        ):
+            obj = get_catalogue().record(row)
+            nearest_objects.append({
+                "name": obj["name"],
+                "type": obj["type"],
+                "distance": distance,
+                "coordinates": obj["coordinates"]
+            })
         
         if nearest_objects:
             return ToolResult.ok({
@@ -203,50 +235,21 @@ def search_by_name(*, name: str, object_type: str = "any", max_results: int = 5)
             return ToolResult.err("Name parameter cannot be empty")
             
         name = name.lower()
-        results = []
         
-        for obj in CELESTIAL_OBJECTS:
-            # Skip hidden objects in normal searches
-            if obj["hidden"]:
-                continue
-                
-            # Apply type filter if specified
-            if object_type != "any" and obj["type"] != object_type:
-                continue
-                
-            # For exact matches
-            obj_name_lower = obj["name"].lower()
-            
-            # Handle exact name search case
-            if name == obj_name_lower:
-                results.append({
-                    "name": obj["name"],
-                    "type": obj["type"],
-                    "class": obj["class"],
-                    "coordinates": obj["coordinates"],
-                    "status": obj["status"],
-                    "description": obj["description"]
-                })
-                # If we find an exact match for an exact name search, only return that one
-                if name == obj_name_lower and len(name.split()) > 1:
-                    return ToolResult.ok({
-                        "found": True,
-                        "count": 1,
-                        "results": [results[-1]]
-                    })
-                continue
-                
-            # For partial matches
-            if name in obj_name_lower:
-                results.append({
-                    "name": obj["name"],
-                    "type": obj["type"],
-                    "class": obj["class"],
-                    "coordinates": obj["coordinates"],
-                    "status": obj["status"],
-                    "description": obj["description"]
+        # If we find an exact match for a multi-word name search, only return that one
+        if len(name.split()) > 1:
+            exact_rows = _name_index().exact(name, object_type)
+            if exact_rows:
+                return ToolResult.ok({
+                    "found": True,
+                    "count": 1,
+                    "results": [_search_result(get_catalogue().record(exact_rows[0]))]
                 })
         
+        # Hidden objects are not indexed, so normal searches skip them
+        catalogue = get_catalogue()
+        results = [_search_result(catalogue.record(row)) for row in _name_index().search(name, object_type)]
+        
         # Sort results by exact match first, then alphabetically
         results.sort(key=lambda x: (0 if x["name"].lower() == name else 1, x["name"]))
         
@@ -289,21 +292,14 @@ def scan_region(*, sector: str, quadrant: str, scan_depth: str) -> ToolResult[Di
         elif scan_depth == "ultra":
             reveal_hidden = True  # Always detect hidden objects
         
+        # Filter by sector, quadrant (if not "all") and hidden objects based on scan depth
+        catalogue = get_catalogue()
+        region = catalogue.mask(sector=sector, quadrant=None if quadrant == "all" else quadrant)
+        visible = region if reveal_hidden else region & ~catalogue.hidden
+        
         results = []
-        for obj in CELESTIAL_OBJECTS:
-            # Filter by sector
-            if obj["coordinates"]["sector"] != sector:
-                continue
-                
-            # Filter by quadrant (if not "all")
-            if quadrant != "all" and obj["coordinates"]["quadrant"] != quadrant:
-                continue
-                
-            # Filter hidden objects based on scan depth
-            if obj["hidden"] and not reveal_hidden:
-                continue
-            
-            # Add object to results
+        for row in np.flatnonzero(visible):
+            obj = catalogue.record(row)
             results.append({
                 "name": obj["name"],
                 "type": obj["type"],
@@ -324,10 +320,8 @@ def scan_region(*, sector: str, quadrant: str, scan_depth: str) -> ToolResult[Di
             unknown_count = 0
             if scan_depth != "ultra":
                 # Add a hint about possible hidden objects
-                hidden_in_region = sum(1 for obj in CELESTIAL_OBJECTS 
-                                    if obj["hidden"] and obj["coordinates"]["sector"] == sector and
-                                    (quadrant == "all" or obj["coordinates"]["quadrant"] == quadrant))
-                                    
+                hidden_in_region = int(np.count_nonzero(region & catalogue.hidden))
+                
                 if hidden_in_region > 0 and not reveal_hidden:
                     unknown_count = hidden_in_region
         
@@ -350,6 +344,17 @@ def scan_region(*, sector: str, quadrant: str, scan_depth: str) -> ToolResult[Di
         return ToolResult.err(f"Scan error: {str(e)}")
 
 # Helper functions
+def _search_result(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields search_by_name reports for an object."""
+    return {
+        "name": obj["name"],
+        "type": obj["type"],
+        "class": obj["class"],
+        "coordinates": obj["coordinates"],
+        "status": obj["status"],
+        "description": obj["description"]
+    }
+
 def calculate_distance_3d(x1: float, y1: float, z1: float, x2: float, y2: float, z2: float) -> float:
     """Calculate the Euclidean distance between two 3D points."""
     return math.sqrt((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2)
\ No newline at end of file
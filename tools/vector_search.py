@@ -2,19 +2,67 @@ import json
 from typing import Dict, Any, List, Optional
 import weave
 from tools.return_type import ToolResult
-import concurrent.futures
 import boto3
 import os
+import hashlib
 import numpy as np
 from botocore.exceptions import ClientError  # Added for error handling
+from tools.vector_store import VectorStore
+from tools.ann_index import make_index
+from tools.embedding_pipeline import EmbeddingPipeline
+from tools.embedding_cache import QueryEmbeddingCache
+from tools.markdown_chunker import chunk_markdown, embedding_text
+from utils.bedrock import get_bedrock_client
 
-_BEDROCK_CLIENT: boto3.client = boto3.client('bedrock-runtime', region_name="us-east-1")
+_BEDROCK_CLIENT: boto3.client = get_bedrock_client("us-east-1")
+# EmbeddingPipeline retries throttled calls itself and halves its concurrency
+# on each one, so its calls must not be retried inside botocore as well
+_PIPELINE_BEDROCK_CLIENT: boto3.client = get_bedrock_client("us-east-1", max_attempts=1)
 EMBEDDING_MODEL = "amazon.titan-embed-text-v2:0"  # Updated to Titan V2
-EMBEDDING_DIMENSION = 1024  # Titan V2 default dimension (supports 1024, 512, 256)
+# Titan V2 supports 1024 (default), 512 and 256 dimensions; smaller vectors
+# are cheaper to store and scan at a small cost in retrieval quality
+SUPPORTED_EMBEDDING_DIMENSIONS = (256, 512, 1024)
+EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "1024"))
+if EMBEDDING_DIMENSION not in SUPPORTED_EMBEDDING_DIMENSIONS:
+    raise ValueError(f"EMBEDDING_DIMENSION must be one of {SUPPORTED_EMBEDDING_DIMENSIONS}, got {EMBEDDING_DIMENSION}")
     
+# Search index: "exact" scores every row, "ivf" only scores the rows in the
+# VECTOR_INDEX_N_PROBE inverted lists closest to the query (higher = better recall, slower)
+VECTOR_INDEX = os.getenv("VECTOR_INDEX", "exact")
+VECTOR_INDEX_N_PROBE = int(os.getenv("VECTOR_INDEX_N_PROBE", "8"))
+VECTOR_INDEX_N_LISTS = int(os.getenv("VECTOR_INDEX_N_LISTS", "0")) or None  # default: sqrt(N)
+
+# Scan matrix: "float32", "float16" (half the memory) or "int8" (a quarter);
+# compact modes rescore the best top_k * VECTOR_RESCORE_FACTOR rows in float32.
+# They trade query time for memory, float16 the most (see VectorStore)
+VECTOR_STORAGE = os.getenv("VECTOR_STORAGE", "float32")
+VECTOR_RESCORE_FACTOR = int(os.getenv("VECTOR_RESCORE_FACTOR", "4"))
+
+# Knowledge base chunks hold up to CHUNK_MAX_TOKENS words of one markdown section,
+# repeating the last CHUNK_OVERLAP_TOKENS words of the previous chunk
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "256"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "32"))
+
 # In-memory store for the vector database
-# Each entry will be a dict: {"text": str, "chunk_id": int, "embedding": np.ndarray}
-_VECTOR_DATABASE_STORE: List[Dict[str, Any]] = []
+# All embeddings live in one contiguous (N, EMBEDDING_DIMENSION) float32 matrix
+_VECTOR_DATABASE_STORE: VectorStore = VectorStore(
+    EMBEDDING_DIMENSION,
+    index=make_index(VECTOR_INDEX, n_lists=VECTOR_INDEX_N_LISTS, n_probe=VECTOR_INDEX_N_PROBE),
+    storage=VECTOR_STORAGE,
+    rescore_factor=VECTOR_RESCORE_FACTOR
+)
+
+# encyclopedia_search ranking: "vector" (embeddings only), "lexical" (BM25 only,
+# no Bedrock call) or "hybrid" (both, fused with reciprocal rank fusion). Only
+# "vector" scores are cosine similarities, so the other modes are opt-in.
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+ENCYCLOPEDIA_SEARCH_MODE = os.getenv("ENCYCLOPEDIA_SEARCH_MODE", "vector")
+
+# Query embeddings are cached in memory, and on disk when QUERY_EMBEDDING_CACHE_PATH is set
+_QUERY_EMBEDDING_CACHE: QueryEmbeddingCache = QueryEmbeddingCache(
+    max_entries=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024")),
+    disk_path=os.getenv("QUERY_EMBEDDING_CACHE_PATH")
+)
 
 VECTOR_SEARCH_TOOLS = {
     "encyclopedia_search": {
@@ -43,70 +91,181 @@ VECTOR_SEARCH_TOOLS = {
                         "description": "The number of top matching results to return.",
                         "default": 5,
                         "max": 5
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": list(SEARCH_MODES),
+                        "description": "Ranking to use: 'lexical' for exact names such as 'Chronos' or 'Sector B3', 'vector' for paraphrased questions (default), 'hybrid' for both."
                     }
                 },
                 "required": ["message"]
             }
         }
+    },
+    "encyclopedia_search_batch": {
+        "type": "function",
+        "function": {
+            "name": "vector_search-encyclopedia_search_batch",
+            "description": """Runs encyclopedia_search for several independent queries in one step.
+            Use this tool instead of several encyclopedia_search steps when a plan needs
+            context on more than one topic; results come back as one list per query, in order.
+            """,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "messages": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The search queries, one per topic."
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "The number of top matching results to return per query.",
+                        "default": 5,
+                        "max": 5
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": list(SEARCH_MODES),
+                        "description": "Ranking to use, as for encyclopedia_search."
+                    }
+                },
+                "required": ["messages"]
+            }
+        }
     }
 }
 
-# Vector database cache filepath
+# Vector database cache filepaths
+# The binary cache is a raw float32 .npy matrix (memory-mapped on load) plus a JSON
+# sidecar holding texts and chunk ids. The JSON cache is the legacy format and is
+# only read to migrate existing caches.
 VECTOR_DB_CACHE_FILE = "objects/datasets/embeddings.json"
+VECTOR_DB_MATRIX_FILE = "objects/datasets/embeddings.npy"
+VECTOR_DB_METADATA_FILE = "objects/datasets/embeddings.meta.json"
 
 def _save_embeddings():
-    """Save embeddings to JSON file."""
-    os.makedirs("vector_cache", exist_ok=True)
-    # Convert numpy arrays to lists for JSON serialization
-    data = []
-    for entry in _VECTOR_DATABASE_STORE:
-        data.append({
-            "text": entry["text"],
-            "chunk_id": entry["chunk_id"], 
-            "embedding": entry["embedding"].tolist()
-        })
-    
-    with open(VECTOR_DB_CACHE_FILE, 'w') as f:
-        json.dump(data, f)
-    print(f"Saved {len(data)} embeddings to {VECTOR_DB_CACHE_FILE}")
+    """Save embeddings to the binary cache."""
+    _VECTOR_DATABASE_STORE.save(
+        VECTOR_DB_MATRIX_FILE,
+        VECTOR_DB_METADATA_FILE,
+        metadata={"model": EMBEDDING_MODEL}
+    )
+    print(f"Saved {len(_VECTOR_DATABASE_STORE)} embeddings to {VECTOR_DB_MATRIX_FILE}")
 
-def _load_embeddings():
-    """Load embeddings from JSON file."""
-    global _VECTOR_DATABASE_STORE
+def _load_legacy_json_embeddings() -> bool:
+    """Load embeddings from the legacy JSON cache."""
     if not os.path.exists(VECTOR_DB_CACHE_FILE):
         return False
     
     with open(VECTOR_DB_CACHE_FILE, 'r') as f:
         data = json.load(f)
+
+    # Vectors from another embedding dimension cannot be reused; re-embed instead
+    dimensions = sorted({len(entry["embedding"]) for entry in data})
+    if data and dimensions != [EMBEDDING_DIMENSION]:
+        print(f"Ignoring {VECTOR_DB_CACHE_FILE}: embedding dimension {dimensions} does not match {EMBEDDING_DIMENSION}")
+        return False
     
-    # Convert lists back to numpy arrays
-    _VECTOR_DATABASE_STORE = []
-    for entry in data:
-        _VECTOR_DATABASE_STORE.append({
-            "text": entry["text"],
-            "chunk_id": entry["chunk_id"],
-            "embedding": np.array(entry["embedding"], dtype=np.float32)
-        })
+    # Stack the lists into a single contiguous matrix
+    _VECTOR_DATABASE_STORE.clear()
+    if data:
+        _VECTOR_DATABASE_STORE.add_batch(
+            [entry["text"] for entry in data],
+            [entry["chunk_id"] for entry in data],
+            np.array([entry["embedding"] for entry in data], dtype=np.float32),
+            [_content_hash(entry["text"]) for entry in data]
+        )
     
     print(f"Loaded {len(_VECTOR_DATABASE_STORE)} embeddings from {VECTOR_DB_CACHE_FILE}")
     return True
 
-def initialize_or_load_vector_db(markdown_filepath: str, max_workers: int = 4, force_regenerate: bool = False) -> Dict[str, Any]:
-    """Load from cache or generate new embeddings."""
-    if not force_regenerate and _load_embeddings():
+def _load_embeddings(mmap: bool = True) -> bool:
+    """
+    Load embeddings from the binary cache, memory-mapping the matrix by default.
+    Falls back to the legacy JSON cache and migrates it to the binary format.
+    """
+    metadata = _VECTOR_DATABASE_STORE.load(VECTOR_DB_MATRIX_FILE, VECTOR_DB_METADATA_FILE, mmap=mmap)
+    if metadata is not None and metadata.get("model") == EMBEDDING_MODEL:
+        # Caches written before chunks were content-keyed get their keys backfilled
+        _VECTOR_DATABASE_STORE.assign_missing_keys(_content_hash)
+        print(f"Loaded {len(_VECTOR_DATABASE_STORE)} embeddings from {VECTOR_DB_MATRIX_FILE}")
+        return True
+
+    if _load_legacy_json_embeddings():
+        _save_embeddings()
+        return True
+
+    _VECTOR_DATABASE_STORE.clear()
+    return False
+
+def _content_hash(text: str) -> str:
+    """
+    Key for a chunk's embedding: a hash of the chunk text together with the
+    embedding model id and dimension, so a model or dimension change never
+    reuses a stale vector.
+    """
+    return hashlib.sha256(f"{EMBEDDING_MODEL}|{EMBEDDING_DIMENSION}|{text}".encode('utf-8')).hexdigest()
+
+def _occurrence_keys(hashes: List[str]) -> List[str]:
+    """
+    Store keys for chunks in file order: a chunk's content hash, suffixed with
+    its occurrence number when the same text appeared earlier in the file, so
+    identical chunks each keep their own row.
+    """
+    seen: Dict[str, int] = {}
+    keys = []
+    for content_hash in hashes:
+        occurrence = seen.get(content_hash, 0)
+        seen[content_hash] = occurrence + 1
+        keys.append(content_hash if occurrence == 0 else f"{content_hash}#{occurrence}")
+    return keys
+
+def initialize_or_load_vector_db(
+    markdown_filepath: str,
+    max_workers: int = 4,
+    force_regenerate: bool = False,
+    max_concurrency: int = 16
+) -> Dict[str, Any]:
+    """
+    Load the cache and bring it in sync with the markdown file.
+    Only chunks whose content hash is not already cached are embedded; cached
+    chunks that no longer appear in the file are tombstoned. With
+    `force_regenerate` every chunk is embedded again.
+    """
+    loaded = not force_regenerate and _load_embeddings()
+    if loaded and not os.path.exists(markdown_filepath):
         return {"status": "loaded_from_cache", "total_entries": len(_VECTOR_DATABASE_STORE)}
     
-    # Generate new embeddings
-    result = initialize_vector_db_from_markdown(markdown_filepath, max_workers)
-    if result["status"] == "success":
-        _save_embeddings()
+    # Embed new or changed chunks
+    result = initialize_vector_db_from_markdown(
+        markdown_filepath,
+        max_workers,
+        incremental=loaded,
+        max_concurrency=max_concurrency
+    )
+    if result["status"] != "success":
+        return result
+    # Renumbered chunk ids must be saved too, or a reload brings back stale positions
+    if loaded and result["chunks_added"] == 0 and result["chunks_tombstoned"] == 0 and result["chunks_renumbered"] == 0:
+        return {"status": "loaded_from_cache", "total_entries": len(_VECTOR_DATABASE_STORE)}
+
+    # Rewrite the matrix once tombstones make up a quarter of it
+    if _VECTOR_DATABASE_STORE.tombstone_count * 4 > _VECTOR_DATABASE_STORE.row_count:
+        _VECTOR_DATABASE_STORE.compact()
+    _save_embeddings()
+    if _VECTOR_DATABASE_STORE.storage != "float32":
+        # Reopen the saved matrix memory-mapped so only the compact copy stays resident
+        _load_embeddings()
     return result
 
-def _get_embedding(text: str) -> np.ndarray:
+def _get_embedding(text: str, client: Optional[boto3.client] = None) -> np.ndarray:
     """
     Get the embedding for a given text using Amazon Bedrock Titan Text Embeddings V2.
+    `client` defaults to the shared client, which retries throttled calls.
     """
-    if _BEDROCK_CLIENT is None:
+    client = client if client is not None else _BEDROCK_CLIENT
+    if client is None:
         raise RuntimeError("AWS Bedrock client not initialized. Please configure AWS credentials.")
     
     try:
@@ -114,11 +273,13 @@ def _get_embedding(text: str) -> np.ndarray:
         # Hint: Use inputText, dimensions, normalize, and embeddingTypes fields
         request_body = json.dumps({
             "inputText": text.strip(),
-            # TODO Add required fields for embedding request
+            "dimensions": EMBEDDING_DIMENSION,
+            "normalize": True,
+            "embeddingTypes": ["float"]
         })
         
         # Invoke the Bedrock model
-        response = _BEDROCK_CLIENT.invoke_model(
+        response = client.invoke_model(
             body=request_body,
             modelId=EMBEDDING_MODEL,
             accept="application/json",
@@ -130,14 +291,14 @@ def _get_embedding(text: str) -> np.ndarray:
         
         # TODO #5: Extract embedding vector from the response
         # Hint: Check for 'embeddingsByType' with 'float' key, or fallback to 'embedding'
-        embedding_vector = None  # Replace with proper extraction logic
+        embedding_vector = response_body.get('embeddingsByType', {}).get('float') or response_body.get('embedding')
         
         if embedding_vector is None:
             raise ValueError("No embedding found in Bedrock response")
         
         # TODO #6: Convert to numpy array and validate dimension
         # Hint: Use np.array with dtype=np.float32
-        final_embedding = None  # Replace with numpy conversion
+        final_embedding = np.array(embedding_vector, dtype=np.float32)
         
         if final_embedding.shape[0] != EMBEDDING_DIMENSION:
             raise ValueError(f"Embedding dimension {final_embedding.shape[0]} does not match expected dimension {EMBEDDING_DIMENSION}")
@@ -153,68 +314,155 @@ def _get_embedding(text: str) -> np.ndarray:
         print(f"Error getting embedding for text '{text[:50]}...': {e}")
         raise
 
+def _get_query_embedding(text: str) -> np.ndarray:
+    """Embedding for a search query, served from the query cache when possible."""
+    return _QUERY_EMBEDDING_CACHE.get_or_compute(text, EMBEDDING_MODEL, EMBEDDING_DIMENSION, _get_embedding)
+
+def _get_query_embeddings(texts: List[str], max_concurrency: int = 8) -> np.ndarray:
+    """
+    Embeddings for several search queries as a (len(texts), EMBEDDING_DIMENSION)
+    matrix. Cached queries are served from the query cache; the misses are
+    embedded concurrently, each distinct query once.
+    """
+    embeddings: Dict[str, np.ndarray] = {}
+    misses: Dict[str, str] = {}
+    for text in texts:
+        key = _QUERY_EMBEDDING_CACHE.make_key(text, EMBEDDING_MODEL, EMBEDDING_DIMENSION)
+        if key in embeddings or key in misses:
+            continue
+        cached = _QUERY_EMBEDDING_CACHE.get(text, EMBEDDING_MODEL, EMBEDDING_DIMENSION)
+        if cached is not None:
+            embeddings[key] = cached
+        else:
+            misses[key] = text
+
+    if misses:
+        pending = list(misses.items())
+        pipeline = EmbeddingPipeline(
+            lambda text: _get_embedding(text, _PIPELINE_BEDROCK_CLIENT),
+            initial_concurrency=min(len(pending), max_concurrency),
+            max_concurrency=max_concurrency
+        )
+        computed, failures = pipeline.run([(i, text) for i, (_, text) in enumerate(pending)])
+        if failures:
+            raise RuntimeError(f"Could not embed query '{failures[0]['text']}': {failures[0]['error']}")
+        for i, (key, text) in enumerate(pending):
+            embeddings[key] = _QUERY_EMBEDDING_CACHE.put(text, EMBEDDING_MODEL, EMBEDDING_DIMENSION, computed[i])
+
+    return np.stack([
+        embeddings[_QUERY_EMBEDDING_CACHE.make_key(text, EMBEDDING_MODEL, EMBEDDING_DIMENSION)]
+        for text in texts
+    ])
+
 def _clear_vector_database() -> None:
     """Clears all entries from the in-memory vector database."""
-    global _VECTOR_DATABASE_STORE
-    _VECTOR_DATABASE_STORE = []
+    _VECTOR_DATABASE_STORE.clear()
     print("In-memory vector database cleared.")
 
 def _save_entry_to_vector_database(entry: Dict[str, Any]) -> None:
     """Saves a new entry to the in-memory vector database."""
-    _VECTOR_DATABASE_STORE.append(entry)
-
-def _process_chunk_for_embedding(chunk_text: str, markdown_filepath: str, chunk_id: int) -> Dict[str, Any]:
-    """
-    Processes a single chunk: generates an embedding and prepares data for storage.
-    This function is designed to be called in parallel.
-    """
-    embedding_vector = _get_embedding(chunk_text)
-    return {
-        "text": chunk_text,
-        "chunk_id": chunk_id,
-        "embedding": embedding_vector
-    }
+    _VECTOR_DATABASE_STORE.add(
+        entry["text"],
+        entry["chunk_id"],
+        entry["embedding"],
+        entry.get("content_hash"),
+        entry.get("section_path")
+    )
 
-def initialize_vector_db_from_markdown(markdown_filepath: str, max_workers: int = 4) -> Dict[str, Any]:
+def initialize_vector_db_from_markdown(
+    markdown_filepath: str,
+    max_workers: int = 4,
+    incremental: bool = False,
+    max_concurrency: int = 16
+) -> Dict[str, Any]:
     """
     Initializes the vector database by reading a markdown file,
-    chunking its content, generating embeddings in parallel,
-    and storing them in-memory.
+    chunking its content by section (see `chunk_markdown`), generating
+    embeddings in parallel, and storing them in-memory. Each chunk is
+    embedded together with its section path.
+    With `incremental`, entries already in the store are kept: chunks whose
+    content hash is cached are reused, and cached chunks missing from the
+    file are tombstoned.
+    Embedding starts at `max_workers` concurrent requests and adapts between
+    1 and `max_concurrency`; chunks that fail after retries are listed under
+    `failed_chunks` in the result.
     """
-    _clear_vector_database()
+    if not incremental:
+        _clear_vector_database()
     try:
         with open(markdown_filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # User changed to split by '\n'
-        chunks = [chunk.strip() for chunk in content.split('\n') if chunk.strip()]
-        
+        chunks = chunk_markdown(content, CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS)
+
         if not chunks:
             return {"status": "error", "message": "No content chunks found in the file."}
 
-        total_chunks = len(chunks)
-        print(f"Starting processing of {total_chunks} chunks from {markdown_filepath} using {EMBEDDING_MODEL}...")
+        # Reuse cached embeddings for unchanged chunks, renumbering them to their new position
+        texts_to_embed = [embedding_text(chunk) for chunk in chunks]
+        content_hashes = [_content_hash(text) for text in texts_to_embed]
+        hashes = _occurrence_keys(content_hashes)
+        tombstoned_count = _VECTOR_DATABASE_STORE.tombstone_missing_keys(hashes)
+        pending_chunks = []
+        # Chunks whose text repeats an earlier pending chunk share its embedding request
+        first_pending: Dict[str, int] = {}
+        duplicates: Dict[int, List[int]] = {}
+        reused_count = 0
+        renumbered_count = 0
+        for i, (text, content_hash, key) in enumerate(zip(texts_to_embed, content_hashes, hashes)):
+            row = _VECTOR_DATABASE_STORE.row_for_key(key)
+            if row is not None:
+                if _VECTOR_DATABASE_STORE.chunk_ids[row] != i:
+                    _VECTOR_DATABASE_STORE.chunk_ids[row] = i
+                    renumbered_count += 1
+                reused_count += 1
+            elif content_hash in first_pending:
+                duplicates[first_pending[content_hash]].append(i)
+            else:
+                first_pending[content_hash] = i
+                duplicates[i] = []
+                pending_chunks.append((i, text))
+
+        total_chunks = len(pending_chunks) + sum(len(copies) for copies in duplicates.values())
+        print(f"Starting processing of {total_chunks} chunks from {markdown_filepath} using {EMBEDDING_MODEL} "
+              f"({reused_count} unchanged, {tombstoned_count} removed)...")
         processed_count = 0
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_chunk_data = {
-                executor.submit(_process_chunk_for_embedding, chunk, markdown_filepath, i): i
-                for i, chunk in enumerate(chunks)
-            }
-            
-            for i, future in enumerate(concurrent.futures.as_completed(future_to_chunk_data)):
-                chunk_index_in_original_list = future_to_chunk_data[future]
-                try:
-                    entry_data = future.result()
-                    _save_entry_to_vector_database(entry_data)
-                    processed_count += 1
-                    if (i + 1) % 1 == 0 or (i + 1) == total_chunks:
-                        print(f"Processed and embedded chunk {i + 1}/{total_chunks} (Original index: {chunk_index_in_original_list}) from {markdown_filepath}")
-                except Exception as exc:
-                    print(f'Chunk {chunk_index_in_original_list} from {markdown_filepath} generated an exception during processing/embedding: {exc}')
+        def _on_embedded(embedded_id: int, text: str, embedding: np.ndarray) -> None:
+            nonlocal processed_count
+            for chunk_id in [embedded_id] + duplicates[embedded_id]:
+                _save_entry_to_vector_database({
+                    "text": chunks[chunk_id]["text"],
+                    "chunk_id": chunk_id,
+                    "section_path": chunks[chunk_id]["section_path"],
+                    "embedding": embedding,
+                    "content_hash": hashes[chunk_id]
+                })
+                processed_count += 1
+                print(f"Processed and embedded chunk {processed_count}/{total_chunks} (Original index: {chunk_id}) from {markdown_filepath}")
+
+        # Concurrency adapts to latency and throttling, starting from max_workers
+        pipeline = EmbeddingPipeline(
+            lambda text: _get_embedding(text, _PIPELINE_BEDROCK_CLIENT),
+            initial_concurrency=max_workers,
+            max_concurrency=max(max_concurrency, max_workers)
+        )
+        _, failed_chunks = pipeline.run(pending_chunks, on_result=_on_embedded)
+        for failure in failed_chunks:
+            print(f"Chunk {failure['chunk_id']} from {markdown_filepath} could not be embedded: {failure['error']}")
         
         print(f"Finished processing. Added {processed_count}/{total_chunks} chunks to the in-memory database.")
-        return {"status": "success", "chunks_added": processed_count, "total_chunks_in_db": len(_VECTOR_DATABASE_STORE)}
+        return {
+            "status": "success",
+            "chunks_added": processed_count,
+            "chunks_reused": reused_count,
+            "chunks_tombstoned": tombstoned_count,
+            "chunks_renumbered": renumbered_count,
+            "chunks_failed": len(failed_chunks),
+            "failed_chunks": failed_chunks,
+            "total_chunks_in_db": len(_VECTOR_DATABASE_STORE),
+            **pipeline.stats()
+        }
 
     except FileNotFoundError:
         return {"status": "error", "message": f"File not found: {markdown_filepath}"}
@@ -225,19 +473,30 @@ def _cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     """Calculates cosine similarity between two numpy vectors."""
     # Titan V2 embeddings are L2 normalized, so dot product is cosine similarity
     # For robustness if somehow not normalized, or for general use:
-    # TODO #7: Implement cosine similarity calculation
-    # Handle edge case: if either vector has zero norm, return 0.0
-    # For normalized vectors, dot product = cosine similarity
-    return 0.0  # Replace with actual calculation
+    norm1 = np.linalg.norm(vec1)
+    norm2 = np.linalg.norm(vec2)
+    if norm1 == 0 or norm2 == 0:
+        return 0.0
+    return float(np.dot(vec1, vec2) / (norm1 * norm2))
 
 @weave.op(name="vector_search-encyclopedia_search")
-def encyclopedia_search(*, message: str, top_k: int = 5) -> ToolResult[List[Dict[str, Any]]]:
+def encyclopedia_search(
+    *,
+    message: str,
+    top_k: int = 5,
+    mode: Optional[str] = None
+) -> ToolResult[List[Dict[str, Any]]]:
     """
-    Performs a lookup in the in-memory vector database using embeddings.
+    Performs a lookup in the in-memory vector database using embeddings,
+    BM25 keyword scoring, or both fused (see ENCYCLOPEDIA_SEARCH_MODE).
     """
     if not message or not isinstance(message, str):
         return ToolResult.err("Input message must be a non-empty string.")
 
+    mode = mode or ENCYCLOPEDIA_SEARCH_MODE
+    if mode not in SEARCH_MODES:
+        return ToolResult.err(f"Unknown search mode: {mode}. Must be one of {list(SEARCH_MODES)}.")
+
     if top_k > 25:
         return ToolResult.err("No more than 25 results may be returned for a single query.")
 
@@ -245,36 +504,57 @@ def encyclopedia_search(*, message: str, top_k: int = 5) -> ToolResult[List[Dict
         return ToolResult.ok("Vector database is empty. Initialize it first.")
 
     try:
-        # TODO #8: Get embedding for the search query
-        query_embedding = None  # Replace with actual embedding generation
-        
-        results_with_scores = []
-        for entry in _VECTOR_DATABASE_STORE:
-            stored_embedding = entry.get("embedding")
-            if isinstance(stored_embedding, np.ndarray):
-                # TODO #9: Calculate similarity between query and stored embeddings
-                similarity = 0.0  # Replace with similarity calculation
-                
-                # TODO #10: Create result entry with text, chunk_id, and similarity score
-                result_entry = {
-                    "text": entry["text"],
-                    # TODO: Add chunk_id field
-                    # TODO: Add score field
-                }
-                results_with_scores.append(result_entry)
-            else:
-                print(f"Warning: Skipping entry due to missing or invalid embedding: {entry.get('chunk_id')}")
-
-        # TODO #11: Sort results by similarity score in descending order
-        # Hint: Use sort() with key=lambda and reverse=True
-        
-        top_results = results_with_scores[:top_k]
+        if mode == "lexical":
+            top_results = _VECTOR_DATABASE_STORE.lexical_search(message, top_k)
+        elif mode == "vector":
+            # One matrix-vector product scores the whole store; argpartition picks the top_k
+            top_results = _VECTOR_DATABASE_STORE.search(_get_query_embedding(message), top_k)
+        else:
+            top_results = _VECTOR_DATABASE_STORE.hybrid_search(_get_query_embedding(message), message, top_k)
         
         if not top_results:
-            return ToolResult.ok_empty(f"No relevant information found for: '{message}'")
+            return ToolResult.ok(f"No relevant information found for: '{message}'")
             
-        # TODO #12: Return results using ToolResult.ok() instead of throwing error
-        raise Exception("Vector search not properly implemented - check return statement")
+        return ToolResult.ok(top_results)
         
     except Exception as e:
         return ToolResult.err(f"An error occurred during vector search: {str(e)}")
+
+@weave.op(name="vector_search-encyclopedia_search_batch")
+def encyclopedia_search_batch(
+    *,
+    messages: List[str],
+    top_k: int = 5,
+    mode: Optional[str] = None
+) -> ToolResult[List[List[Dict[str, Any]]]]:
+    """
+    Runs `encyclopedia_search` for several messages at once. The queries are
+    embedded concurrently and scored against the store in one matrix-matrix
+    product. Returns one result list per message, in order.
+    """
+    if not messages or not isinstance(messages, list):
+        return ToolResult.err("Input messages must be a non-empty list of strings.")
+    if not all(message and isinstance(message, str) for message in messages):
+        return ToolResult.err("Every message must be a non-empty string.")
+
+    if top_k > 25:
+        return ToolResult.err("No more than 25 results may be returned for a single query.")
+
+    mode = mode or ENCYCLOPEDIA_SEARCH_MODE
+    if mode not in SEARCH_MODES:
+        return ToolResult.err(f"Unknown search mode: {mode}. Must be one of {list(SEARCH_MODES)}.")
+
+    if not _VECTOR_DATABASE_STORE:
+        return ToolResult.ok("Vector database is empty. Initialize it first.")
+
+    try:
+        if mode == "lexical":
+            return ToolResult.ok([_VECTOR_DATABASE_STORE.lexical_search(message, top_k) for message in messages])
+
+        query_embeddings = _get_query_embeddings(messages)
+        if mode == "vector":
+            return ToolResult.ok(_VECTOR_DATABASE_STORE.search_batch(query_embeddings, top_k))
+        return ToolResult.ok(_VECTOR_DATABASE_STORE.hybrid_search_batch(query_embeddings, messages, top_k))
+
+    except Exception as e:
+        return ToolResult.err(f"An error occurred during vector search: {str(e)}")
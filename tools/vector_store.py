@@ -0,0 +1,584 @@
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+import json
+import os
+import numpy as np
+from tools.ann_index import IVFIndex
+from tools.lexical_index import BM25Index, reciprocal_rank_fusion
+
+# Dtype of the matrix used for scoring in each storage mode
+STORAGE_MODES = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+
+# Quantized rows are widened to float32 in blocks to bound scratch memory per query
+_SCORE_BLOCK_ROWS = 4096
+
+
+class VectorStore:
+    """
+    In-memory vector store that keeps every embedding in one contiguous float32
+    (N, dimension) matrix, with texts, chunk ids, section paths and content
+    keys held in parallel arrays. Rows are L2-normalised on insert so that a single
+    matrix-vector product yields cosine similarities for the whole store.
+
+    Every entry is also indexed for BM25 keyword search over its text and
+    section path; `hybrid_search` fuses both rankings.
+
+    Removed rows are tombstoned rather than deleted: they stay in the matrix
+    but are masked out of search until the store is compacted.
+
+    Search is exact by default. With an `index` set, only the index's
+    candidate rows are scored, trading recall for latency on large stores.
+
+    The `storage` mode picks the matrix that search scans: "float32" scans the
+    full-precision rows, "float16" a half-precision copy (2x smaller) and
+    "int8" a scalar-quantized copy with one scale per row (4x smaller). In the
+    compact modes the best `top_k * rescore_factor` rows are rescored against
+    the full-precision matrix, which is only touched for those rows and stays
+    on disk when the store is memory-mapped.
+
+    The compact modes save memory, not time: rows are widened to float32 to
+    be scored, since numpy has no fast half-precision or int8 kernels. float16
+    rows are the slowest to widen (about 8x an exact float32 scan, against
+    about 2x for int8), so prefer int8 unless its rounding hurts recall. The
+    compact copy is only scanned while the float32 matrix is memory-mapped;
+    a resident float32 matrix is searched directly, exactly and faster.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        initial_capacity: int = 1024,
+        index: Optional[IVFIndex] = None,
+        storage: str = "float32",
+        rescore_factor: int = 4
+    ):
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {storage}. Must be one of {list(STORAGE_MODES)}.")
+        self.dimension = dimension
+        self.index = index
+        self.storage = storage
+        self.rescore_factor = rescore_factor
+        self._matrix = np.zeros((max(initial_capacity, 1), dimension), dtype=np.float32)
+        self._live = np.zeros(self._matrix.shape[0], dtype=bool)
+        self._quantized: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._size = 0
+        self._allocate_quantized(self._matrix.shape[0])
+        self.texts: List[str] = []
+        self.chunk_ids: List[int] = []
+        self.section_paths: List[List[str]] = []
+        self.keys: List[Optional[str]] = []
+        self._key_to_row: Dict[str, int] = {}
+        self.lexical_index = BM25Index()
+
+    def __len__(self) -> int:
+        """Number of live (non-tombstoned) entries."""
+        return self._size - self.tombstone_count
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows in the matrix, including tombstoned ones."""
+        return self._size
+
+    @property
+    def tombstone_count(self) -> int:
+        return int(self._size - np.count_nonzero(self._live[:self._size]))
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """View of the populated rows of the embedding matrix, including tombstoned rows."""
+        return self._matrix[:self._size]
+
+    @property
+    def live_mask(self) -> np.ndarray:
+        """Boolean mask over `embeddings` that is False for tombstoned rows."""
+        return self._live[:self._size]
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return isinstance(self._matrix, np.memmap)
+
+    @property
+    def _scans_compact(self) -> bool:
+        """Whether search scans the compact matrix rather than the float32 one."""
+        return self._quantized is not None and self.is_memory_mapped
+
+    @property
+    def scan_bytes(self) -> int:
+        """Bytes of the matrix (plus scales) that search scans for the populated rows."""
+        if not self._scans_compact:
+            return self.embeddings.nbytes
+        scale_bytes = self._scales[:self._size].nbytes if self._scales is not None else 0
+        return self._quantized[:self._size].nbytes + scale_bytes
+
+    def clear(self) -> None:
+        """Drops all entries while keeping the allocated matrix for reuse."""
+        if not self._matrix.flags.writeable:
+            self._matrix = np.zeros((1, self.dimension), dtype=np.float32)
+            self._live = np.zeros(1, dtype=bool)
+            self._allocate_quantized(1)
+        self._live[:] = False
+        self._size = 0
+        self.texts = []
+        self.chunk_ids = []
+        self.section_paths = []
+        self.keys = []
+        self._key_to_row = {}
+        self.lexical_index.clear()
+        self._rebuild_index()
+
+    def set_index(self, index: Optional[IVFIndex]) -> None:
+        """Switches to approximate search through `index`, or back to exact search with None."""
+        self.index = index
+        self._rebuild_index()
+
+    @staticmethod
+    def _lexical_text(text: str, section_path: List[str]) -> str:
+        return " ".join(section_path + [text])
+
+    def _rebuild_lexical_index(self) -> None:
+        self.lexical_index.clear()
+        self.lexical_index.add([
+            self._lexical_text(text, path) for text, path in zip(self.texts, self.section_paths)
+        ])
+
+    def _rebuild_index(self) -> None:
+        if self.index is not None:
+            self.index.build(self.embeddings)
+
+    def _allocate_quantized(self, capacity: int) -> None:
+        """(Re)allocates the compact scan matrix, keeping the populated rows."""
+        if self.storage == "float32":
+            return
+        quantized = np.zeros((capacity, self.dimension), dtype=STORAGE_MODES[self.storage])
+        keep = min(self._size, capacity)
+        if self._quantized is not None:
+            quantized[:keep] = self._quantized[:keep]
+        self._quantized = quantized
+        if self.storage == "int8":
+            scales = np.zeros(capacity, dtype=np.float32)
+            if self._scales is not None:
+                scales[:keep] = self._scales[:keep]
+            self._scales = scales
+
+    def _encode(self, start: int, end: int) -> None:
+        """Fills the compact scan matrix for rows [start, end) from the full-precision rows."""
+        if self._quantized is None:
+            return
+        for block_start in range(start, end, _SCORE_BLOCK_ROWS):
+            block_end = min(block_start + _SCORE_BLOCK_ROWS, end)
+            rows = np.asarray(self._matrix[block_start:block_end], dtype=np.float32)
+            if self.storage == "float16":
+                self._quantized[block_start:block_end] = rows.astype(np.float16)
+                continue
+            # Symmetric int8 quantization with one scale per row
+            scales = np.abs(rows).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._quantized[block_start:block_end] = np.round(rows / scales[:, np.newaxis]).astype(np.int8)
+            self._scales[block_start:block_end] = scales
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Grows the backing matrix geometrically so appends stay amortised O(1).
+        A read-only memory-mapped matrix is copied into private memory first.
+        """
+        if capacity <= self._matrix.shape[0] and self._matrix.flags.writeable:
+            return
+        new_capacity = max(capacity, self._matrix.shape[0] * 2)
+        grown = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        live = np.zeros(new_capacity, dtype=bool)
+        live[:self._size] = self._live[:self._size]
+        self._live = live
+        if self._quantized is not None and self._quantized.shape[0] < new_capacity:
+            self._allocate_quantized(new_capacity)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalises rows, leaving zero vectors untouched."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add(
+        self,
+        text: str,
+        chunk_id: int,
+        embedding: np.ndarray,
+        key: Optional[str] = None,
+        section_path: Optional[List[str]] = None
+    ) -> None:
+        """Appends a single entry to the store."""
+        self.add_batch(
+            [text],
+            [chunk_id],
+            np.asarray(embedding, dtype=np.float32)[np.newaxis, :],
+            [key],
+            [section_path or []]
+        )
+
+    def add_batch(
+        self,
+        texts: List[str],
+        chunk_ids: List[int],
+        embeddings: np.ndarray,
+        keys: Optional[List[Optional[str]]] = None,
+        section_paths: Optional[List[List[str]]] = None
+    ) -> None:
+        """
+        Appends several entries at once; `embeddings` must be shaped (len(texts), dimension).
+        Adding an entry whose key is already present tombstones the older row.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[1] != self.dimension:
+            raise ValueError(f"Expected embeddings of shape (n, {self.dimension}), got {embeddings.shape}")
+        if keys is None:
+            keys = [None] * len(texts)
+        if section_paths is None:
+            section_paths = [[] for _ in texts]
+        if not (len(texts) == len(chunk_ids) == len(keys) == len(section_paths) == embeddings.shape[0]):
+            raise ValueError("texts, chunk_ids, keys, section_paths and embeddings must have the same length")
+
+        count = embeddings.shape[0]
+        self._reserve(self._size + count)
+        self._matrix[self._size:self._size + count] = self._normalize(embeddings)
+        self._encode(self._size, self._size + count)
+        if self.index is not None:
+            # Incremental ingestion trains the index only once there are enough rows
+            if self.index.needs_rebuild(self._size + count):
+                self.index.build(self._matrix[:self._size + count])
+            elif self.index.is_trained:
+                self.index.add(self._matrix[self._size:self._size + count], self._size)
+        self._live[self._size:self._size + count] = True
+        for offset, key in enumerate(keys):
+            if key is None:
+                continue
+            if key in self._key_to_row:
+                self._live[self._key_to_row[key]] = False
+            self._key_to_row[key] = self._size + offset
+        self._size += count
+        self.texts.extend(texts)
+        self.chunk_ids.extend(int(chunk_id) for chunk_id in chunk_ids)
+        self.section_paths.extend(list(path) for path in section_paths)
+        self.keys.extend(keys)
+        self.lexical_index.add([self._lexical_text(text, list(path)) for text, path in zip(texts, section_paths)])
+
+    def row_for_key(self, key: str) -> Optional[int]:
+        """Row index of the live entry stored under `key`, if any."""
+        return self._key_to_row.get(key)
+
+    def assign_missing_keys(self, key_fn: Callable[[str], str]) -> None:
+        """Computes keys from the text of every live entry that has none."""
+        for row, key in enumerate(self.keys):
+            if key is None and self._live[row]:
+                self.keys[row] = key_fn(self.texts[row])
+                self._key_to_row[self.keys[row]] = row
+
+    def tombstone(self, rows: Iterable[int]) -> int:
+        """Masks the given rows out of search. Returns how many were live."""
+        removed = 0
+        for row in rows:
+            if not self._live[row]:
+                continue
+            self._live[row] = False
+            key = self.keys[row]
+            if key is not None and self._key_to_row.get(key) == row:
+                del self._key_to_row[key]
+            removed += 1
+        return removed
+
+    def tombstone_missing_keys(self, keep: Iterable[str]) -> int:
+        """Tombstones every keyed entry whose key is not in `keep`."""
+        keep = set(keep)
+        return self.tombstone([row for key, row in self._key_to_row.items() if key not in keep])
+
+    def compact(self) -> None:
+        """Rewrites the matrix without tombstoned rows."""
+        rows = np.flatnonzero(self.live_mask)
+        matrix = np.zeros((max(len(rows), 1), self.dimension), dtype=np.float32)
+        matrix[:len(rows)] = self._matrix[rows]
+        texts = [self.texts[i] for i in rows]
+        chunk_ids = [self.chunk_ids[i] for i in rows]
+        section_paths = [self.section_paths[i] for i in rows]
+        keys = [self.keys[i] for i in rows]
+
+        self._matrix = matrix
+        self._live = np.zeros(matrix.shape[0], dtype=bool)
+        self._live[:len(rows)] = True
+        self._size = len(rows)
+        self.texts = texts
+        self.chunk_ids = chunk_ids
+        self.section_paths = section_paths
+        self.keys = keys
+        self._key_to_row = {key: row for row, key in enumerate(keys) if key is not None}
+        self._quantized = None
+        self._scales = None
+        self._allocate_quantized(matrix.shape[0])
+        self._encode(0, self._size)
+        self._rebuild_index()
+        self._rebuild_lexical_index()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Returns the live entries as a list of {text, chunk_id, section_path, embedding} dicts."""
+        return [
+            {
+                "text": self.texts[i],
+                "chunk_id": self.chunk_ids[i],
+                "section_path": self.section_paths[i],
+                "embedding": self._matrix[i]
+            }
+            for i in np.flatnonzero(self.live_mask)
+        ]
+
+    def _prepare_query(self, query_embedding: np.ndarray) -> np.ndarray:
+        query = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+        if query.shape != (self.dimension,):
+            raise ValueError(f"Query embedding dimension {query.shape} does not match store dimension {self.dimension}")
+        return query
+
+    def _mask_tombstones(self, scores: np.ndarray) -> np.ndarray:
+        """Sets the scores of tombstoned rows to -inf; `scores` must cover every row."""
+        if self.tombstone_count:
+            scores[~self.live_mask] = -np.inf
+        return scores
+
+    def scores(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query against every row; tombstoned rows score -inf."""
+        query = self._prepare_query(query_embedding)
+        return self._mask_tombstones(self.embeddings @ query)
+
+    def _approximate_scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Scores from the compact scan matrix for `rows`, or for every row if None.
+        `query` is one (dimension,) query or a (dimension, q) batch of them.
+        """
+        if rows is not None:
+            scores = self._quantized[rows].astype(np.float32) @ query
+            return scores * self._scales[rows] if self._scales is not None else scores
+
+        scores = np.empty((self._size,) + query.shape[1:], dtype=np.float32)
+        for start in range(0, self._size, _SCORE_BLOCK_ROWS):
+            end = min(start + _SCORE_BLOCK_ROWS, self._size)
+            scores[start:end] = self._quantized[start:end].astype(np.float32) @ query
+        if self._scales is not None:
+            scores *= self._scales[:self._size].reshape((-1,) + (1,) * (query.ndim - 1))
+        return self._mask_tombstones(scores)
+
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the `top_k` highest scores, best first, without a full sort."""
+        top_k = min(top_k, scores.shape[0])
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if top_k < scores.shape[0]:
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(scores.shape[0])
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def search_rows(self, query_embedding: np.ndarray, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices and scores of the `top_k` best live matches, best first."""
+        if not self:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top_k = min(top_k, len(self))
+        query = self._prepare_query(query_embedding)
+
+        # Candidate rows: the index's probed lists, or every row until an index is trained
+        rows = None
+        if self.index is not None and self.index.is_trained:
+            rows = self.index.candidates(query)
+            rows = rows[self._live[rows]]
+
+        if self._scans_compact:
+            # Shortlist with the compact matrix, then rescore the shortlist exactly below
+            approximate = self._approximate_scores(query, rows)
+            shortlist = self._top_k_indices(approximate, top_k * self.rescore_factor)
+            shortlist = shortlist[np.isfinite(approximate[shortlist])]
+            rows = shortlist if rows is None else rows[shortlist]
+
+        if rows is None:
+            scores = self._mask_tombstones(self.embeddings @ query)
+            order = self._top_k_indices(scores, top_k)
+            return order, scores[order]
+
+        return self._rescore(query, rows, top_k)
+
+    def _rescore(self, query: np.ndarray, rows: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact float32 scores for the candidate `rows`, reduced to the `top_k` best."""
+        scores = self._matrix[rows] @ query
+        order = self._top_k_indices(scores, top_k)
+        return rows[order], scores[order]
+
+    def search_rows_batch(self, query_embeddings: np.ndarray, top_k: int = 5) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        `search_rows` for a (q, dimension) batch of queries. Without an index the
+        whole batch is scored in one matrix-matrix product instead of q scans.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2 or queries.shape[1] != self.dimension:
+            raise ValueError(f"Expected query embeddings of shape (q, {self.dimension}), got {queries.shape}")
+        if not self or (self.index is not None and self.index.is_trained):
+            # IVF candidate lists differ per query
+            return [self.search_rows(query, top_k) for query in queries]
+        top_k = min(top_k, len(self))
+        queries = self._normalize(queries)
+
+        if not self._scans_compact:
+            scores = self._mask_tombstones(self.embeddings @ queries.T)
+            results = []
+            for column in scores.T:
+                order = self._top_k_indices(column, top_k)
+                results.append((order, column[order]))
+            return results
+
+        approximate = self._approximate_scores(np.ascontiguousarray(queries.T))
+        results = []
+        for query, column in zip(queries, approximate.T):
+            shortlist = self._top_k_indices(column, top_k * self.rescore_factor)
+            results.append(self._rescore(query, shortlist[np.isfinite(column[shortlist])], top_k))
+        return results
+
+    def _results(self, rows: Iterable[int], scores: Iterable[float]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "text": self.texts[row],
+                "chunk_id": self.chunk_ids[row],
+                "section_path": self.section_paths[row],
+                "score": float(score)
+            }
+            for row, score in zip(rows, scores)
+        ]
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Returns the `top_k` most similar live entries as {text, chunk_id, section_path, score} dicts."""
+        return self._results(*self.search_rows(query_embedding, top_k))
+
+    def lexical_search_rows(self, query_text: str, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices and BM25 scores of the `top_k` best live keyword matches, best first."""
+        scores = self._mask_tombstones(self.lexical_index.scores(query_text))
+        order = self._top_k_indices(scores, min(top_k, len(self)))
+        # Rows sharing no term with the query are not matches
+        order = order[scores[order] > 0]
+        return order, scores[order]
+
+    def lexical_search(self, query_text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Keyword-only search; needs no query embedding."""
+        return self._results(*self.lexical_search_rows(query_text, top_k))
+
+    def search_batch(self, query_embeddings: np.ndarray, top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """`search` for a (q, dimension) batch of queries; one result list per query."""
+        return [self._results(rows, scores) for rows, scores in self.search_rows_batch(query_embeddings, top_k)]
+
+    def hybrid_search(
+        self,
+        query_embedding: np.ndarray,
+        query_text: str,
+        top_k: int = 5,
+        candidates: int = 50,
+        rrf_k: int = 60
+    ) -> List[Dict[str, Any]]:
+        """
+        Fuses the `candidates` best vector and keyword matches with reciprocal
+        rank fusion and returns the `top_k` best; `score` is the fused score.
+        """
+        query_embeddings = np.asarray(query_embedding, dtype=np.float32)[np.newaxis, :]
+        return self.hybrid_search_batch(query_embeddings, [query_text], top_k, candidates, rrf_k)[0]
+
+    def hybrid_search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        query_texts: List[str],
+        top_k: int = 5,
+        candidates: int = 50,
+        rrf_k: int = 60
+    ) -> List[List[Dict[str, Any]]]:
+        """`hybrid_search` for a batch of queries, scoring the vector side in one pass."""
+        if len(query_texts) != len(query_embeddings):
+            raise ValueError("query_embeddings and query_texts must have the same length")
+        vector_results = self.search_rows_batch(query_embeddings, max(candidates, top_k))
+        results = []
+        for (vector_rows, _), query_text in zip(vector_results, query_texts):
+            lexical_rows, _ = self.lexical_search_rows(query_text, max(candidates, top_k))
+            fused = reciprocal_rank_fusion([vector_rows, lexical_rows], k=rrf_k)
+            best = sorted(fused.items(), key=lambda item: -item[1])[:top_k]
+            results.append(self._results([row for row, _ in best], [score for _, score in best]))
+        return results
+
+    def save(self, matrix_path: str, metadata_path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Writes the embedding matrix as a raw .npy file and the texts, chunk ids
+        and section paths as a JSON sidecar. Both files are written to a temporary name first and
+        then renamed, so readers never observe a half-written cache.
+        """
+        os.makedirs(os.path.dirname(matrix_path) or ".", exist_ok=True)
+        os.makedirs(os.path.dirname(metadata_path) or ".", exist_ok=True)
+
+        tmp_matrix_path = f"{matrix_path}.tmp"
+        with open(tmp_matrix_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.embeddings))
+
+        sidecar = dict(metadata or {})
+        sidecar.update({
+            "dimension": self.dimension,
+            "count": self._size,
+            "texts": self.texts,
+            "chunk_ids": self.chunk_ids,
+            "section_paths": self.section_paths,
+            "keys": self.keys,
+            "tombstones": np.flatnonzero(~self.live_mask).tolist()
+        })
+        tmp_metadata_path = f"{metadata_path}.tmp"
+        with open(tmp_metadata_path, 'w', encoding='utf-8') as f:
+            json.dump(sidecar, f, ensure_ascii=False, separators=(',', ':'))
+
+        os.replace(tmp_matrix_path, matrix_path)
+        os.replace(tmp_metadata_path, metadata_path)
+
+    def load(self, matrix_path: str, metadata_path: str, mmap: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Replaces the contents of the store with a cache written by `save`.
+        With `mmap=True` the matrix is opened read-only via np.memmap, so load
+        time is independent of the store size and processes opening the same
+        file share its pages through the OS page cache.
+        Returns the sidecar metadata, or None if the cache is missing or does
+        not match this store's dimension.
+        """
+        if not (os.path.exists(matrix_path) and os.path.exists(metadata_path)):
+            return None
+
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+
+        # An empty .npy has no data pages to map
+        mmap = mmap and metadata["count"] > 0
+        matrix = np.load(matrix_path, mmap_mode='r' if mmap else None)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension or matrix.shape[0] != metadata["count"]:
+            return None
+
+        self._matrix = matrix if mmap else np.ascontiguousarray(matrix, dtype=np.float32)
+        self._size = matrix.shape[0]
+        self._quantized = None
+        self._scales = None
+        self._allocate_quantized(max(self._size, 1))
+        self._encode(0, self._size)
+        self._live = np.ones(max(self._size, 1), dtype=bool)
+        self._live[self._size:] = False
+        self._live[metadata.get("tombstones", [])] = False
+        self.texts = list(metadata["texts"])
+        self.chunk_ids = [int(chunk_id) for chunk_id in metadata["chunk_ids"]]
+        self.section_paths = list(metadata.get("section_paths") or [[] for _ in range(self._size)])
+        self.keys = list(metadata.get("keys") or [None] * self._size)
+        self._key_to_row = {
+            key: row for row, key in enumerate(self.keys)
+            if key is not None and self._live[row]
+        }
+        self._rebuild_index()
+        self._rebuild_lexical_index()
+        return metadata
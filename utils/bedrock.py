@@ -0,0 +1,65 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+import boto3
+from botocore.config import Config
+from weave.integrations.bedrock.bedrock_sdk import patch_client
+
+# Connection pool, retry and timeout settings shared by every Bedrock client.
+# The pool should cover the concurrent calls of all evaluations in the process.
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "64"))
+BEDROCK_RETRY_MODE = os.getenv("BEDROCK_RETRY_MODE", "adaptive")
+BEDROCK_MAX_ATTEMPTS = int(os.getenv("BEDROCK_MAX_ATTEMPTS", "5"))
+BEDROCK_CONNECT_TIMEOUT = float(os.getenv("BEDROCK_CONNECT_TIMEOUT", "10"))
+# Long generations and response streams can take minutes to finish
+BEDROCK_READ_TIMEOUT = float(os.getenv("BEDROCK_READ_TIMEOUT", "300"))
+
+_CLIENTS: Dict[Tuple[str, Optional[str], bool, int], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def bedrock_config(max_attempts: Optional[int] = None) -> Config:
+    attempts = BEDROCK_MAX_ATTEMPTS if max_attempts is None else max_attempts
+    return Config(
+        max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+        retries={"mode": BEDROCK_RETRY_MODE, "total_max_attempts": attempts},
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=BEDROCK_READ_TIMEOUT,
+        tcp_keepalive=True
+    )
+
+
+def get_bedrock_client(
+    region_name: Optional[str] = None,
+    traced: bool = False,
+    service_name: str = "bedrock-runtime",
+    max_attempts: Optional[int] = None
+) -> Any:
+    """
+    Process-wide Bedrock client for a service and region, created on first use
+    with `bedrock_config`, so every caller reuses the same keep-alive
+    connection pool. `traced` clients are patched once to log their calls to
+    weave; they get a pool of their own so untraced callers stay untraced.
+    `max_attempts` overrides BEDROCK_MAX_ATTEMPTS for callers that handle
+    throttling themselves; max_attempts=1 turns botocore's retries off.
+    """
+    attempts = BEDROCK_MAX_ATTEMPTS if max_attempts is None else max_attempts
+    key = (service_name, region_name, traced, attempts)
+    client = _CLIENTS.get(key)
+    if client is not None:
+        return client
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            # Client creation on the default boto3 session is not thread-safe
+            client = boto3.client(service_name, region_name=region_name, config=bedrock_config(attempts))
+            if traced:
+                patch_client(client)
+            _CLIENTS[key] = client
+        return client
+
+
+def clear_bedrock_clients() -> None:
+    """Drops the shared clients, so the next call creates them with the current settings."""
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
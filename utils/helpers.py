@@ -1,6 +1,18 @@
 import os
+import asyncio
+import functools
 import importlib
-from typing import List
+from typing import List, Any, Callable
+import weave
+
+# Shared pool that async code paths use to run blocking work (sync tools, boto3 calls).
+# weave's executor carries the current trace context into the worker threads.
+_BLOCKING_EXECUTOR = weave.ThreadPoolExecutor(max_workers=int(os.getenv("BLOCKING_EXECUTOR_WORKERS", "32")))
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs a blocking callable on the shared executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BLOCKING_EXECUTOR, functools.partial(fn, *args, **kwargs))
 
 def load_tools() -> List:
     """
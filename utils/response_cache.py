@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+
+class ResponseCache:
+    """
+    Two-tier cache for parsed model responses keyed by (model id, temperature,
+    system prompt, messages). The first tier is a bounded in-memory LRU; the
+    optional second tier is a SQLite file that survives restarts, so repeated
+    evaluation runs can share responses. Responses are stored as JSON and
+    every hit returns a fresh copy, since callers add keys to them.
+    """
+
+    def __init__(self, max_entries: int = 1024, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(disk_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS model_responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+            )
+            self._connection.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self._connection is not None
+
+    @staticmethod
+    def make_key(model_id: str, temperature: float, messages: List[Dict[str, Any]]) -> str:
+        """Hashes the model id, temperature, system prompt and remaining messages canonically."""
+        system = [str(msg['content']) for msg in messages if msg['role'] == 'system']
+        conversation = [[msg['role'], str(msg['content'])] for msg in messages if msg['role'] != 'system']
+        canonical = json.dumps([model_id, float(temperature), system, conversation], separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns a copy of the cached response, promoting disk hits into the memory tier."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(response)
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT response FROM model_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        serialised = json.dumps(response, default=str)
+        with self._lock:
+            self._remember(key, serialised)
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO model_responses (key, response) VALUES (?, ?)", (key, serialised)
+                )
+                self._connection.commit()
+
+    def _remember(self, key: str, response: str) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Empties the memory tier and resets the counters; the disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._entries)
+            }
@@ -0,0 +1,95 @@
+import json
+from typing import Dict, Any, List, Optional
+
+
+class PlanStepParser:
+    """
+    Incremental scanner over streamed model text that returns each object of
+    the first JSON "steps" array as soon as its closing brace arrives, so a
+    plan can start executing before the model has finished writing it. Text
+    is scanned once, tracking string and nesting state across chunks; objects
+    that are not valid JSON on their own are skipped.
+    """
+
+    def __init__(self, key: str = "steps"):
+        self._key = json.dumps(key)
+        self._text = ""
+        self._position = 0
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._after_key = False
+        self._awaiting_array = False
+        self._depth = 0
+        # Nesting depth of the steps array while inside it
+        self._array_depth: Optional[int] = None
+        self._step_start: Optional[int] = None
+        self.done = False
+        self.steps: List[Dict[str, Any]] = []
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Adds streamed text and returns the steps it completed."""
+        self._text += chunk
+        completed = []
+        text = self._text
+        for position in range(self._position, len(text)):
+            if self.done:
+                break
+            char = text[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._after_key = self._array_depth is None and text[self._string_start:position + 1] == self._key
+                continue
+            if not self._started:
+                # Skip any prose or code fence before the JSON object
+                self._started = char == '{'
+                if not self._started:
+                    continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+                self._awaiting_array = False
+            elif char == ':':
+                self._awaiting_array = self._after_key
+                self._after_key = False
+            elif char in '[{':
+                self._depth += 1
+                if char == '[' and self._awaiting_array:
+                    self._array_depth = self._depth
+                elif char == '{' and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._step_start = position
+                self._after_key = self._awaiting_array = False
+            elif char in ']}':
+                if char == '}' and self._step_start is not None and self._depth == self._array_depth + 1:
+                    step = self._parse(text[self._step_start:position + 1])
+                    if step is not None:
+                        self.steps.append(step)
+                        completed.append(step)
+                    self._step_start = None
+                elif char == ']' and self._depth == self._array_depth:
+                    self.done = True
+                self._depth -= 1
+                self._after_key = self._awaiting_array = False
+            elif not char.isspace():
+                self._after_key = self._awaiting_array = False
+        self._position = len(text)
+        return completed
+
+    @staticmethod
+    def _parse(candidate: str) -> Optional[Dict[str, Any]]:
+        try:
+            step = json.loads(candidate)
+        except ValueError:
+            return None
+        return step if isinstance(step, dict) else None
@@ -0,0 +1,94 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+def tool_cache_ttl(tool: Dict[str, Any]) -> Optional[float]:
+    """
+    TTL in seconds declared by a `*_TOOLS` entry, or None if its results must
+    not be cached. Entries opt in with a "cache" key:
+
+        "cache": {"ttl": 3600, "bypass": {"scan_depth": ["deep"]}}
+
+    where "bypass" lists argument values whose calls are never cached, for
+    tools that are only non-deterministic for some arguments.
+    """
+    cache = tool.get('cache')
+    if not cache:
+        return None
+    return float(cache.get('ttl', 0)) or None
+
+
+def tool_cache_bypassed(tool: Dict[str, Any], arguments: Any) -> bool:
+    """True if `arguments` match one of the entry's "bypass" values."""
+    bypass = (tool.get('cache') or {}).get('bypass') or {}
+    if not bypass or not isinstance(arguments, dict):
+        return False
+    return any(arguments.get(name) in values for name, values in bypass.items())
+
+
+class ToolResultCache:
+    """
+    Bounded LRU cache of successful tool results with a per-entry TTL. Keys
+    hash the tool name together with its arguments serialised canonically,
+    so argument order and dict ordering do not matter. Results are stored and
+    returned as copies, so callers may modify what they get back.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tool_name: str, arguments: Any) -> str:
+        canonical = json.dumps([tool_name, arguments], sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached result, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(result)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+# Successful results of tools that declare a "cache" TTL, shared by every Vincent.
+# TOOL_CACHE_SIZE=0 disables memoization.
+TOOL_RESULT_CACHE = ToolResultCache(max_entries=int(os.getenv("TOOL_CACHE_SIZE", "1024")))
+
+
+def clear_tool_cache() -> None:
+    """Drops every memoized tool result, for when the data tools read from changes."""
+    TOOL_RESULT_CACHE.clear()